@@ -0,0 +1,98 @@
+"""Benchmarks ``aggregate_company_data`` against the previous implementation,
+which aggregated with a Python ``lambda`` and the builtin ``max`` / ``any``.
+
+Synthetic company tables are generated at each requested size with a varying
+number of distinct company ids, so the output shows how both approaches scale
+with the number of groups as well as the number of rows.
+
+Run from the project root with:
+::
+
+    python src/benchmarks/bench_company_aggregation.py --rows 1e5 1e6 1e7
+"""
+import argparse
+import time
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+from modular_spaceflights.pipelines.data_ingestion.nodes import aggregate_company_data
+
+
+def _legacy_aggregate_company_data(typed_companies: pd.DataFrame) -> pd.DataFrame:
+    working_companies = typed_companies.groupby(["id"]).agg(
+        {
+            "company_rating": np.mean,
+            "company_location": lambda x: list(set(x))[0],
+            "total_fleet_count": max,
+            "iata_approved": any,
+        }
+    )
+    return working_companies.reset_index().rename(columns={"id": "company_id"})
+
+
+def make_companies(rows: int, groups: int, seed: int = 0) -> pd.DataFrame:
+    """Creates a typed companies table with ``rows`` records spread across
+    ``groups`` distinct company ids."""
+    rng = np.random.default_rng(seed)
+    locations = np.array([f"location_{i}" for i in range(250)], dtype=object)
+    return pd.DataFrame(
+        {
+            "id": rng.integers(0, groups, size=rows),
+            "company_rating": rng.random(rows),
+            "company_location": locations[rng.integers(0, len(locations), rows)],
+            "total_fleet_count": rng.integers(1, 20, size=rows).astype(float),
+            "iata_approved": rng.random(rows) > 0.5,
+        }
+    )
+
+
+def _best_of(func: Callable, data: pd.DataFrame, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(
+    rows: List[int], group_ratios: List[float], repeat: int, legacy_max_rows: int
+) -> None:
+    """Prints one line of timings per (rows, groups) combination."""
+    print(f"{'rows':>10} {'groups':>10} {'legacy (s)':>12} {'current (s)':>12}")
+    for n_rows in rows:
+        for ratio in group_ratios:
+            n_groups = max(1, int(n_rows * ratio))
+            companies = make_companies(n_rows, n_groups)
+            current = _best_of(aggregate_company_data, companies, repeat)
+            legacy = "skipped"
+            if n_rows <= legacy_max_rows:
+                legacy_seconds = _best_of(
+                    _legacy_aggregate_company_data, companies, repeat
+                )
+                legacy = f"{legacy_seconds:.3f}"
+            print(f"{n_rows:>10} {n_groups:>10} {legacy:>12} {current:12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=float, nargs="+", default=[1e5, 1e6, 1e7])
+    parser.add_argument(
+        "--group-ratios", type=float, nargs="+", default=[0.001, 0.1, 0.5]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--legacy-max-rows",
+        type=float,
+        default=1e6,
+        help="The legacy implementation is skipped above this many rows",
+    )
+    args = parser.parse_args()
+    run(
+        rows=[int(n) for n in args.rows],
+        group_ratios=args.group_ratios,
+        repeat=args.repeat,
+        legacy_max_rows=int(args.legacy_max_rows),
+    )
@@ -0,0 +1,159 @@
+"""Benchmarks ``DrawTable`` against the previous implementation, which measured
+every cell with ``font.getsize`` and drew one grid line per cell on a fixed
+500x200 canvas.
+
+Synthetic tables of float columns are rendered by both implementations, and
+the size of the image each one produced is reported alongside the timings, as
+the previous implementation does not grow the canvas to fit the table.
+
+Run from the project root with:
+::
+
+    python src/benchmarks/bench_draw_table.py --rows 10 100 1000 --columns 10
+"""
+import argparse
+import time
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageDraw, ImageFont
+
+from modular_spaceflights.pipelines.reporting.image_utils import DrawTable
+
+
+class LegacyDrawTable:
+    """This class accepts a Pandas DataFrame and writes out a Pillow image
+    this snippet was taken from here https://stackoverflow.com/a/35722080/2010808
+    """
+
+    def __init__(self, _df: pd.DataFrame, x: int = 500, y: int = 200):
+        self.rows, self.cols = _df.shape
+        img_size = (x, y)
+        self.border = 50
+        self.bg_col = (255, 255, 255)
+        self.div_w = 1
+        self.div_col = (128, 128, 128)
+        self.head_w = 2
+        self.head_col = (0, 0, 0)
+        self.image = Image.new("RGBA", img_size, self.bg_col)
+        self.draw = ImageDraw.Draw(self.image)
+        self._draw_grid()
+        self._populate(_df)
+
+    def _draw_grid(self):
+
+        width, height = self.image.size
+        row_step = (height - self.border * 2) / (self.rows)
+        col_step = (width - self.border * 2) / (self.cols)
+        for row in range(1, self.rows + 1):
+            self.draw.line(
+                (
+                    self.border - row_step // 2,
+                    self.border + row_step * row,
+                    width - self.border,
+                    self.border + row_step * row,
+                ),
+                fill=self.div_col,
+                width=self.div_w,
+            )
+            for col in range(1, self.cols + 1):
+                self.draw.line(
+                    (
+                        self.border + col_step * col,
+                        self.border - col_step // 2,
+                        self.border + col_step * col,
+                        height - self.border,
+                    ),
+                    fill=self.div_col,
+                    width=self.div_w,
+                )
+        self.draw.line(
+            (
+                self.border - row_step // 2,
+                self.border,
+                width - self.border,
+                self.border,
+            ),
+            fill=self.head_col,
+            width=self.head_w,
+        )
+        self.draw.line(
+            (
+                self.border,
+                self.border - col_step // 2,
+                self.border,
+                height - self.border,
+            ),
+            fill=self.head_col,
+            width=self.head_w,
+        )
+        self.row_step = row_step
+        self.col_step = col_step
+
+    def _populate(self, _df2: pd.DataFrame):
+        font = ImageFont.load_default().font
+        for row in range(self.rows):
+            self.draw.text(
+                (self.border - self.row_step // 2, self.border + self.row_step * row),
+                str(_df2.index[row]),
+                font=font,
+                fill=(0, 0, 128),
+            )
+            for col in range(self.cols):
+                text = str(_df2.iloc[row, col])
+                text_w, text_h = font.getsize(text)
+                x_pos = self.border + self.col_step * (col + 1) - text_w
+                y_pos = self.border + self.row_step * row
+                self.draw.text((x_pos, y_pos), text, font=font, fill=(0, 0, 128))
+        for col in range(self.cols):
+            text = str(_df2.columns[col])
+            text_w, _ = font.getsize(text)
+            x_pos = self.border + self.col_step * (col + 1) - text_w
+            y_pos = self.border - self.row_step // 2
+            self.draw.text((x_pos, y_pos), text, font=font, fill=(0, 0, 128))
+
+
+def make_table(rows: int, columns: int, seed: int = 0) -> pd.DataFrame:
+    """Creates a table of ``rows`` by ``columns`` random floats."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        rng.random((rows, columns)) * 1000,
+        columns=[f"column_{column}" for column in range(columns)],
+    )
+
+
+def _best_of(func: Callable, data: pd.DataFrame, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(rows: List[int], columns: List[int], repeat: int) -> None:
+    """Prints one line of timings per (rows, columns) combination."""
+    print(
+        f"{'rows':>8} {'columns':>8} {'legacy (s)':>12} {'current (s)':>12}"
+        f" {'current image size':>20}"
+    )
+    for n_rows in rows:
+        for n_columns in columns:
+            data = make_table(n_rows, n_columns)
+            legacy = _best_of(LegacyDrawTable, data, repeat)
+            current = _best_of(DrawTable, data, repeat)
+            width, height = DrawTable(data).image.size
+            print(
+                f"{n_rows:>8} {n_columns:>8} {legacy:12.3f} {current:12.3f}"
+                f" {f'{width}x{height}':>20}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--columns", type=int, nargs="+", default=[5, 20])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(rows=args.rows, columns=args.columns, repeat=args.repeat)
@@ -0,0 +1,99 @@
+"""Benchmarks ``joiner`` against the previous implementation, which reduced the
+feature tables onto the spine with one ``DataFrame.merge`` per table.
+
+Synthetic feature tables share the identifiers of a spine table. Half of them
+are shuffled, so that both the already-aligned and the re-indexing paths of
+``joiner`` are exercised, and the two implementations are checked to produce
+the same table before they are timed.
+
+Run from the project root with:
+::
+
+    python src/benchmarks/bench_feature_joiner.py --tables 10 50 100
+"""
+import argparse
+import time
+from functools import reduce
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+from modular_spaceflights.pipelines.feature_engineering.nodes import (
+    _get_id_columns,
+    joiner,
+)
+
+
+def _legacy_joiner(spine_df: pd.DataFrame, *dfs: pd.DataFrame) -> pd.DataFrame:
+    id_columns = _get_id_columns(data=spine_df)
+    merged_dfs = reduce(
+        lambda df, df2: df.merge(df2, on=id_columns, how="left"), dfs, spine_df
+    )
+    assert spine_df.shape[0] == merged_dfs.shape[0]
+    return merged_dfs
+
+
+def make_tables(
+    rows: int, tables: int, columns: int, seed: int = 0
+) -> List[pd.DataFrame]:
+    """Creates a spine of ``rows`` unique shuttle, company and review ids
+    followed by ``tables`` feature tables of ``columns`` float columns each."""
+    rng = np.random.default_rng(seed)
+    spine = pd.DataFrame(
+        {
+            "shuttle_id": np.arange(rows),
+            "company_id": rng.integers(0, max(1, rows // 10), size=rows),
+            "review_id": rng.permutation(rows),
+        }
+    )
+    feature_tables = []
+    for table in range(tables):
+        feature_df = spine.assign(
+            **{
+                f"feature_{table}_{column}": rng.random(rows)
+                for column in range(columns)
+            }
+        )
+        if table % 2:
+            feature_df = feature_df.sample(frac=1.0, random_state=table)
+        feature_tables.append(feature_df)
+    return [spine, *feature_tables]
+
+
+def _best_of(func: Callable, data: List[pd.DataFrame], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*data)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(rows: List[int], tables: List[int], columns: int, repeat: int) -> None:
+    """Prints one line of timings per (rows, tables) combination."""
+    print(f"{'rows':>10} {'tables':>8} {'legacy (s)':>12} {'current (s)':>12}")
+    for n_rows in rows:
+        for n_tables in tables:
+            data = make_tables(n_rows, n_tables, columns)
+            pd.testing.assert_frame_equal(_legacy_joiner(*data), joiner(*data))
+            legacy = _best_of(_legacy_joiner, data, repeat)
+            current = _best_of(joiner, data, repeat)
+            print(f"{n_rows:>10} {n_tables:>8} {legacy:12.3f} {current:12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=float, nargs="+", default=[1e4, 1e5])
+    parser.add_argument("--tables", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument(
+        "--columns", type=int, default=2, help="Feature columns per table"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(
+        rows=[int(n) for n in args.rows],
+        tables=args.tables,
+        columns=args.columns,
+        repeat=args.repeat,
+    )
@@ -0,0 +1,67 @@
+"""Benchmarks how long it takes to import the pipeline registry and construct
+each registered pipeline, as ``kedro run --pipeline <name>`` does on startup.
+
+Every measurement is taken in a fresh interpreter, so that nothing is already
+imported, and the heavy optional libraries which ended up being imported are
+listed alongside it.
+
+Run from the project root with:
+::
+
+    python src/benchmarks/bench_import_time.py --repeat 5
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List
+
+HEAVY_MODULES = ["sklearn", "plotly", "PIL", "matplotlib"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from modular_spaceflights.pipeline_registry import register_pipelines
+pipelines = register_pipelines()
+names = list(pipelines) if {name!r} is None else [{name!r}]
+for name in names:
+    pipelines[name]
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "names": names,
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def _probe(name: str = None) -> Dict:
+    code = _PROBE.format(name=name, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(names: List[str], repeat: int) -> None:
+    """Prints the best of ``repeat`` timings for each pipeline name."""
+    if not names:
+        names = _probe()["names"]
+    print(f"{'pipeline':<28} {'seconds':>8}  heavy modules imported")
+    for name in names:
+        results = [_probe(name) for _ in range(repeat)]
+        best = min(result["seconds"] for result in results)
+        heavy = ", ".join(results[0]["heavy"]) or "-"
+        print(f"{name:<28} {best:8.3f}  {heavy}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--pipelines",
+        nargs="+",
+        default=[],
+        help="The pipelines to construct, defaults to every registered one",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(names=args.pipelines, repeat=args.repeat)
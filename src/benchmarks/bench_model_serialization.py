@@ -0,0 +1,168 @@
+"""Benchmarks saving and loading a fitted random forest with ``JoblibDataSet``
+against ``pickle.PickleDataSet``, which the models were previously saved with.
+
+The forest is fitted on synthetic data and saved once per dataset
+configuration, timing the best of ``--repeat`` saves. Every load is then
+timed in a fresh interpreter, together with how much the resident set size
+(RSS) of the process grew while loading the model and predicting with it, so
+that neither the page cache of a previous load within the process nor memory
+freed back to the allocator skews the numbers.
+
+The trees of a scikit-learn forest copy their arrays when they are unpickled,
+so memory mapping speeds up the load but does not lower the RSS of a forest.
+
+Run from the project root with:
+::
+
+    python src/benchmarks/bench_model_serialization.py --trees 100 --compress 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+from kedro.io import AbstractDataSet
+from sklearn.ensemble import RandomForestRegressor
+
+JOBLIB_DATASET = "modular_spaceflights.extras.datasets.joblib_dataset.JoblibDataSet"
+
+_PROBE = """
+import json, resource, time
+import numpy as np
+from kedro.io import AbstractDataSet
+
+def rss():
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(l.split()[1]) for l in f if l.startswith("VmRSS:"))
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+dataset = AbstractDataSet.from_config("model", {config!r})
+X = np.random.default_rng(1).random((1000, {features}))
+before, peak_before = rss(), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+model = dataset.load()
+seconds = time.perf_counter() - start
+model.predict(X)
+print(json.dumps({{
+    "seconds": seconds,
+    "rss_mb": (rss() - before) / 1024,
+    "peak_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak_before)
+    / 1024,
+}}))
+"""
+
+
+def _best_of(repeat: int, func: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _probe(config: Dict[str, Any], features: int) -> Dict[str, float]:
+    code = _PROBE.format(config=config, features=features)
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def make_model(
+    rows: int, features: int, trees: int, seed: int = 0
+) -> RandomForestRegressor:
+    """Fits a forest of ``trees`` fully grown trees on ``rows`` random rows."""
+    rng = np.random.default_rng(seed)
+    X = rng.random((rows, features))
+    y = X @ rng.random(features) + rng.normal(scale=0.1, size=rows)
+    return RandomForestRegressor(n_estimators=trees, n_jobs=-1, random_state=seed).fit(
+        X, y
+    )
+
+
+def make_configs(directory: str, compress: List[int]) -> List[Tuple[str, Dict]]:
+    """The dataset configurations to compare, by label."""
+    configs = [
+        (
+            "pickle.PickleDataSet",
+            {"type": "pickle.PickleDataSet", "filepath": f"{directory}/model.pkl"},
+        ),
+        (
+            "JoblibDataSet (mmap)",
+            {"type": JOBLIB_DATASET, "filepath": f"{directory}/model.joblib"},
+        ),
+        (
+            "JoblibDataSet (in memory)",
+            {
+                "type": JOBLIB_DATASET,
+                "filepath": f"{directory}/model.joblib",
+                "load_args": {"mmap_mode": None},
+            },
+        ),
+    ]
+    for level in compress:
+        configs.append(
+            (
+                f"JoblibDataSet (compress={level})",
+                {
+                    "type": JOBLIB_DATASET,
+                    "filepath": f"{directory}/model_{level}.joblib",
+                    "save_args": {"compress": level},
+                },
+            )
+        )
+    return configs
+
+
+def run(rows: int, features: int, trees: int, compress: List[int], repeat: int):
+    """Prints the save and load timings, file size and RSS growth on load of
+    each dataset configuration."""
+    model = make_model(rows, features, trees)
+    print(
+        f"{'dataset':<28} {'save s':>8} {'load s':>8} {'size MB':>8} "
+        f"{'RSS MB':>8} {'peak MB':>8}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for label, config in make_configs(directory, compress):
+            dataset = AbstractDataSet.from_config("model", config)
+            save = _best_of(repeat, lambda: dataset.save(model))
+            size = os.path.getsize(config["filepath"]) / 2 ** 20
+            results = [_probe(config, features) for _ in range(repeat)]
+            load = min(result["seconds"] for result in results)
+            rss = min(result["rss_mb"] for result in results)
+            peak = min(result["peak_mb"] for result in results)
+            print(
+                f"{label:<28} {save:8.3f} {load:8.3f} {size:8.1f} "
+                f"{rss:8.1f} {peak:8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument(
+        "--compress",
+        type=int,
+        nargs="*",
+        default=[3],
+        help="The joblib compression levels to compare, from 1 to 9",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(
+        rows=args.rows,
+        features=args.features,
+        trees=args.trees,
+        compress=args.compress,
+        repeat=args.repeat,
+    )
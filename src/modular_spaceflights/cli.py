@@ -27,12 +27,20 @@ TO_NODES_HELP = """A list of node names which should be used as an end point."""
 NODE_ARG_HELP = """Run only nodes with specified names."""
 RUNNER_ARG_HELP = """Specify a runner that you want to run the pipeline with.
 Available runners: `SequentialRunner`, `ParallelRunner` and `ThreadRunner`.
+Use `modular_spaceflights.incremental.IncrementalRunner` to skip nodes whose
+inputs, parameters and code are unchanged since they were last run.
 This option cannot be used together with --parallel."""
 PARALLEL_ARG_HELP = """Run the pipeline using the `ParallelRunner`.
 If not specified, use the `SequentialRunner`. This flag cannot be used together
 with --runner."""
+MAX_MODEL_WORKERS_HELP = """Train the model branches of the modelling pipeline
+concurrently in up to this many processes, sharing the split data between them
+through shared memory. All other nodes run sequentially. This option cannot be
+used together with --parallel or --runner."""
 ASYNC_ARG_HELP = """Load and save node inputs and outputs asynchronously
-with threads. If not specified, load and save datasets synchronously."""
+with threads. If not specified, load and save datasets synchronously, except
+for the pipelines which save several outputs of one node, see
+`ASYNC_PIPELINES`."""
 TAG_ARG_HELP = """Construct the pipeline using only nodes which have this tag
 attached. Option can be used multiple times, what results in a
 pipeline constructed from nodes having any of those tags."""
@@ -48,6 +56,11 @@ example: param1:value1,param2:value2. Each parameter is split by the first comma
 so parameter values are allowed to contain colons, parameter keys are not."""
 
 
+# Run with `--async` unless `--no-async` is given, as their nodes return
+# several outputs which are then saved concurrently rather than in turn
+ASYNC_PIPELINES = ("Reporting stage",)
+
+
 def _get_values_as_tuple(values: Iterable[str]) -> Tuple[str, ...]:
     return tuple(chain.from_iterable(value.split(",") for value in values))
 
@@ -75,7 +88,10 @@ def cli():
     "--runner", "-r", type=str, default=None, multiple=False, help=RUNNER_ARG_HELP
 )
 @click.option("--parallel", "-p", is_flag=True, multiple=False, help=PARALLEL_ARG_HELP)
-@click.option("--async", "is_async", is_flag=True, multiple=False, help=ASYNC_ARG_HELP)
+@click.option(
+    "--max-model-workers", type=int, default=None, help=MAX_MODEL_WORKERS_HELP
+)
+@click.option("--async/--no-async", "is_async", default=None, help=ASYNC_ARG_HELP)
 @env_option
 @click.option("--tag", "-t", type=str, multiple=True, help=TAG_ARG_HELP)
 @click.option(
@@ -102,6 +118,7 @@ def run(
     env,
     parallel,
     runner,
+    max_model_workers,
     is_async,
     node_names,
     to_nodes,
@@ -119,10 +136,21 @@ def run(
             "Both --parallel and --runner options cannot be used together. "
             "Please use either --parallel or --runner."
         )
+    if max_model_workers and (parallel or runner):
+        raise KedroCliError(
+            "The --max-model-workers option cannot be used together with "
+            "--parallel or --runner."
+        )
     runner = runner or "SequentialRunner"
+    runner_kwargs = {}
     if parallel:
         runner = "ParallelRunner"
+    if max_model_workers:
+        runner = "modular_spaceflights.pipelines.modelling.executor.ModelFanOutRunner"
+        runner_kwargs["max_model_workers"] = max_model_workers
     runner_class = load_obj(runner, "kedro.runner")
+    if is_async is None:
+        is_async = pipeline in ASYNC_PIPELINES
 
     tag = _get_values_as_tuple(tag) if tag else tag
     node_names = _get_values_as_tuple(node_names) if node_names else node_names
@@ -131,7 +159,7 @@ def run(
     with KedroSession.create(package_name, env=env, extra_params=params) as session:
         session.run(
             tags=tag,
-            runner=runner_class(is_async=is_async),
+            runner=runner_class(is_async=is_async, **runner_kwargs),
             node_names=node_names,
             from_nodes=from_nodes,
             to_nodes=to_nodes,
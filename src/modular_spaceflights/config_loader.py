@@ -0,0 +1,165 @@
+"""A ``TemplatedConfigLoader`` which caches the configuration it renders.
+
+Loading the catalog and parameters means globbing, Jinja-rendering and parsing
+every YAML file under ``conf``, then resolving the ``${...}`` globals, on every
+``kedro run`` and every notebook start. The result only depends on the content
+of the matched files and on the globals, so ``CachedTemplatedConfigLoader``
+keeps it in memory for the lifetime of the process and pickles it to disk for
+the next one. Warm starts then only need to glob and ``stat`` the files.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+from copy import deepcopy
+from glob import iglob
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from kedro.config import TemplatedConfigLoader
+
+# Secrets are never written to the cache
+UNCACHED_PATTERN_PREFIXES = ("credentials",)
+
+
+def _hash(payload: Any) -> str:
+    serialised = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(serialised.encode("utf-8")).hexdigest()
+
+
+def _matching_files(conf_path: Path, patterns: Iterable[str]) -> List[Path]:
+    """Every file under ``conf_path`` matching the patterns, whatever its
+    extension, so that the files the parent class reads are always among them.
+    ``iglob`` is used as ``Path.glob`` skips files when a pattern ends in ``**``.
+    """
+    conf_path = conf_path.resolve()
+    return sorted(
+        {
+            Path(match).resolve()
+            for pattern in patterns
+            for match in iglob(str(conf_path / pattern), recursive=True)
+            if Path(match).is_file()
+        }
+    )
+
+
+class CachedTemplatedConfigLoader(TemplatedConfigLoader):
+    """``CachedTemplatedConfigLoader`` extends the ``TemplatedConfigLoader``
+    so that the configuration returned by ``get`` is cached, both in memory and
+    as a pickle in ``cache_dir``.
+
+    A cache entry is keyed on the path, modification time and size of every
+    file matching the requested patterns, together with the resolved globals,
+    so editing, adding or removing any of those files or changing
+    ``globals.yml`` invalidates it. Files pulled in by a Jinja ``include`` are
+    not tracked.
+
+    Example:
+    ::
+
+        >>> config_loader = CachedTemplatedConfigLoader(
+        >>>     ['conf/base', 'conf/local'], globals_pattern='*globals.yml'
+        >>> )
+        >>> conf_catalog = config_loader.get('catalog*', 'catalog*/**')
+    """
+
+    _memo = {}  # type: Dict[str, Tuple[str, Dict[str, Any]]]
+
+    def __init__(
+        self,
+        conf_paths: Union[str, Iterable[str]],
+        *,
+        globals_pattern: Optional[str] = None,
+        globals_dict: Optional[Dict[str, Any]] = None,
+        project_path: Optional[Union[str, Path]] = None,
+        cache_dir: Optional[str] = None,
+    ):
+        """Creates a new instance of CachedTemplatedConfigLoader.
+
+        Args:
+            conf_paths: Non-empty path or list of paths to configuration
+                directories.
+            globals_pattern: Optional glob pattern of the files to load as a
+                formatting dictionary.
+            globals_dict: Optional formatting dictionary, taking precedence
+                over the globals loaded through ``globals_pattern``.
+            project_path: The root of the project, the current working
+                directory if not given.
+            cache_dir: Where to store the cached configuration. Defaults to
+                ``.kedro_cache/config`` under ``project_path``.
+        """
+        super().__init__(
+            conf_paths, globals_pattern=globals_pattern, globals_dict=globals_dict
+        )
+        project_path = Path(project_path) if project_path else Path.cwd()
+        self._cache_dir = (
+            Path(cache_dir) if cache_dir else project_path / ".kedro_cache" / "config"
+        )
+
+    def _cache_key(self, patterns: Tuple[str, ...]) -> Optional[str]:
+        files = []
+        for conf_path in self.conf_paths:
+            if not Path(conf_path).is_dir():
+                return None  # let the parent class raise its usual error
+            for path in _matching_files(Path(conf_path), patterns):
+                stat = path.stat()
+                files.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return _hash(
+            {"class": type(self).__name__, "files": files, "globals": self._arg_dict}
+        )
+
+    def _read_cache(self, cache_file: Path, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(cache_file, "rb") as f:
+                cached_key, config = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self.logger.debug("Ignoring unreadable config cache '%s'", cache_file)
+            return None
+        return config if cached_key == key else None
+
+    def _write_cache(self, cache_file: Path, key: str, config: Dict[str, Any]) -> None:
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            temporary_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(temporary_file, "wb") as f:
+                pickle.dump((key, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_file, cache_file)
+        except OSError as exc:  # e.g. a read only project directory
+            self.logger.debug("Could not write config cache '%s': %s", cache_file, exc)
+
+    def get(self, *patterns: str) -> Dict[str, Any]:
+        """Returns the configuration matching the patterns, rendering it only
+        if the matched files or the globals changed since it was cached.
+
+        Args:
+            *patterns: Glob patterns to match. Files, which names match
+                any of the specified patterns, will be processed.
+
+        Returns:
+            A Python dictionary with the combined configuration from all
+            configuration files, with the template values resolved.
+        """
+        if any(p.startswith(UNCACHED_PATTERN_PREFIXES) for p in patterns):
+            return super().get(*patterns)
+        key = self._cache_key(patterns) if patterns else None
+        if key is None:
+            return super().get(*patterns)
+
+        entry = _hash({"conf_paths": self.conf_paths, "patterns": patterns})
+        memoised = self._memo.get(entry)
+        if memoised and memoised[0] == key:
+            return deepcopy(memoised[1])
+
+        cache_file = self._cache_dir / f"{entry}.pkl"
+        config = self._read_cache(cache_file, key)
+        if config is None:
+            logging.getLogger(__name__).debug(
+                "Rendering configuration for %s", list(patterns)
+            )
+            config = super().get(*patterns)
+            self._write_cache(cache_file, key, config)
+        self._memo[entry] = (key, config)
+        return deepcopy(config)
@@ -0,0 +1,197 @@
+import hashlib
+import json
+from copy import deepcopy
+from pathlib import PurePosixPath
+from typing import Any, Dict, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+from kedro.io.core import AbstractDataSet, DataSetError, get_protocol_and_path
+
+from modular_spaceflights.remote_io import get_filesystem
+
+
+class CachedRawDataSet(AbstractDataSet):
+    """``CachedRawDataSet`` loads a raw CSV or Excel file as a pandas DataFrame.
+    The first time a file is read it is parsed and converted into a columnar
+    parquet 'sidecar', every subsequent load reads the sidecar instead for as
+    long as the source file is unchanged.
+
+    CSV files are parsed with the multi-threaded ``pyarrow`` reader and Excel
+    files with pandas. In both cases the column types can be declared up front
+    via ``dtype`` so that the result does not depend on type inference.
+
+    The sidecar is keyed on the modification time and size of the source file,
+    which are cheap to check. Only when these change is the file content hashed,
+    so a file that has been touched or copied without being modified does not
+    trigger a re-parse.
+
+    Example:
+    ::
+
+        >>> CachedRawDataSet(
+        >>>     filepath='/data/01_raw/companies.csv',
+        >>>     dtype={'company_rating': 'string'},
+        >>> )
+    """
+
+    _CHUNK_SIZE = 2 ** 20
+
+    def __init__(
+        self,
+        filepath: str,
+        cache_dir: Optional[str] = None,
+        dtype: Optional[Dict[str, str]] = None,
+        load_args: Optional[Dict[str, Any]] = None,
+        credentials: Optional[Dict[str, Any]] = None,
+        fs_args: Optional[Dict[str, Any]] = None,
+    ):
+        """Creates a new instance of CachedRawDataSet.
+
+        Args:
+            filepath: The location of the ``.csv``, ``.xlsx`` or ``.xls`` file.
+            cache_dir: Where the parquet sidecar is stored, on the same file
+                system as ``filepath``. Defaults to a ``.cache`` directory
+                next to the source file.
+            dtype: A mapping of column name to ``pyarrow`` type alias such as
+                ``string``, ``int64``, ``float64`` or ``bool``.
+            load_args: Extra arguments for ``pandas.read_excel`` when reading
+                Excel files. Ignored for CSV files.
+            credentials: Credentials required to get access to the underlying
+                filesystem.
+            fs_args: Extra arguments to pass into the underlying filesystem
+                class constructor.
+        """
+        protocol, path = get_protocol_and_path(filepath)
+        self._protocol = protocol
+        self._filepath = PurePosixPath(path)
+        self._fs = get_filesystem(
+            self._protocol, deepcopy(credentials), deepcopy(fs_args)
+        )
+
+        suffix = self._filepath.suffix.lower()
+        if suffix == ".csv":
+            self._file_format = "csv"
+        elif suffix in (".xlsx", ".xls"):
+            self._file_format = "excel"
+        else:
+            raise DataSetError(
+                f"{self.__class__.__name__} only supports '.csv', '.xlsx' and "
+                f"'.xls' files, got '{self._filepath.name}'."
+            )
+
+        cache_path = (
+            PurePosixPath(get_protocol_and_path(cache_dir)[1])
+            if cache_dir
+            else self._filepath.parent / ".cache"
+        )
+        self._sidecar_path = cache_path / f"{self._filepath.name}.parquet"
+        self._metadata_path = cache_path / f"{self._filepath.name}.json"
+
+        self._dtype = {
+            column: pa.type_for_alias(alias) for column, alias in (dtype or {}).items()
+        }
+        self._load_args = {"engine": "openpyxl", **(load_args or {})}
+
+    def _describe(self) -> Dict[str, Any]:
+        """Returns a dict that describes the attributes of the dataset."""
+        return dict(
+            filepath=self._filepath,
+            protocol=self._protocol,
+            sidecar=self._sidecar_path,
+            dtype={column: str(t) for column, t in self._dtype.items()},
+        )
+
+    def _exists(self) -> bool:
+        return self._fs.exists(str(self._filepath))
+
+    def _load(self) -> pd.DataFrame:
+        """Loads the sidecar if it matches the source file, otherwise parses
+        the source and refreshes the sidecar.
+
+        Returns:
+            Data from the raw file as a pandas DataFrame
+        """
+        if self._is_sidecar_valid():
+            table = pq.read_table(str(self._sidecar_path), filesystem=self._fs)
+            return table.to_pandas()
+
+        table = self._parse()
+        self._fs.makedirs(str(self._sidecar_path.parent), exist_ok=True)
+        pq.write_table(table, where=str(self._sidecar_path), filesystem=self._fs)
+        self._write_metadata(self._source_stat(), self._hash_source())
+        return table.to_pandas()
+
+    def _save(self, data: pd.DataFrame) -> None:
+        raise DataSetError(f"{self.__class__.__name__} is a read only data set type")
+
+    def _source_stat(self) -> Dict[str, Any]:
+        info = self._fs.info(str(self._filepath))
+        modified = info.get("mtime") or info.get("LastModified") or info.get("updated")
+        return {"modified": str(modified), "size": info["size"]}
+
+    def _hash_source(self) -> str:
+        digest = hashlib.sha256()
+        with self._fs.open(str(self._filepath), mode="rb") as f:
+            for block in iter(lambda: f.read(self._CHUNK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _write_metadata(self, stat: Dict[str, Any], sha256: str) -> None:
+        metadata = {
+            **stat,
+            "sha256": sha256,
+            "dtype": {column: str(t) for column, t in self._dtype.items()},
+        }
+        with self._fs.open(str(self._metadata_path), mode="w") as f:
+            json.dump(metadata, f)
+
+    def _is_sidecar_valid(self) -> bool:
+        """Checks whether the sidecar was created from the current source file
+        with the current ``dtype`` declaration."""
+        if not (
+            self._fs.exists(str(self._metadata_path))
+            and self._fs.exists(str(self._sidecar_path))
+        ):
+            return False
+
+        with self._fs.open(str(self._metadata_path), mode="r") as f:
+            metadata = json.load(f)
+        if metadata.get("dtype") != {c: str(t) for c, t in self._dtype.items()}:
+            return False
+
+        stat = self._source_stat()
+        if stat == {k: metadata.get(k) for k in stat}:
+            return True
+
+        # The file was touched, only re-parse if the content actually changed
+        sha256 = self._hash_source()
+        if sha256 != metadata["sha256"]:
+            return False
+        self._write_metadata(stat, sha256)
+        return True
+
+    def _parse(self) -> pa.Table:
+        # Streamed from the file, so it is never held in memory as raw bytes
+        with self._fs.open(str(self._filepath), mode="rb") as content:
+            if self._file_format == "csv":
+                return pv.read_csv(
+                    content,
+                    read_options=pv.ReadOptions(use_threads=True),
+                    # Treat empty strings as nulls, the same as pandas does
+                    convert_options=pv.ConvertOptions(
+                        column_types=self._dtype, strings_can_be_null=True
+                    ),
+                )
+            data = pd.read_excel(content, **self._load_args)
+
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        schema = pa.schema(
+            [
+                field.with_type(self._dtype.get(field.name, field.type))
+                for field in table.schema
+            ]
+        )
+        return table.cast(schema)
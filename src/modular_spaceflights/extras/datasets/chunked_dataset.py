@@ -0,0 +1,275 @@
+import fnmatch
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fsspec.implementations.local import LocalFileSystem
+from kedro.extras.datasets.pandas import CSVDataSet, ParquetDataSet
+from kedro.io.core import DataSetError, get_filepath_str
+
+from modular_spaceflights.remote_io import MAX_WORKERS, write_bytes
+
+_SERIES_KEY = b"modular_spaceflights.series"
+
+
+class ChunkedCSVDataSet(CSVDataSet):
+    """``ChunkedCSVDataSet`` extends the out of the box ``CSVDataSet`` so that
+    loading returns an iterator of DataFrames, each holding at most
+    ``chunksize`` rows, rather than one DataFrame for the whole file.
+
+    The file handle is kept open for as long as the iterator is being consumed,
+    so only one chunk is ever held in memory by the dataset.
+
+    Example:
+    ::
+
+        >>> ChunkedCSVDataSet(filepath='/data/file.csv', chunksize=100_000)
+    """
+
+    DEFAULT_CHUNKSIZE = 100_000
+
+    def __init__(self, filepath: str, chunksize: int = DEFAULT_CHUNKSIZE, **kwargs):
+        """Creates a new instance of ChunkedCSVDataSet.
+
+        Args:
+            filepath: The location of the CSV file to stream.
+            chunksize: The maximum number of rows in each yielded DataFrame.
+            **kwargs: Any other arguments accepted by ``CSVDataSet``.
+        """
+        super().__init__(filepath=filepath, **kwargs)
+        self._chunksize = chunksize
+
+    def _describe(self) -> Dict[str, Any]:
+        return dict(super()._describe(), chunksize=self._chunksize)
+
+    def _load(self) -> Iterator[pd.DataFrame]:
+        return self._iter_chunks()
+
+    def _iter_chunks(self) -> Iterator[pd.DataFrame]:
+        load_path = get_filepath_str(self._get_load_path(), self._protocol)
+        with self._fs.open(load_path, **self._fs_open_args_load) as fs_file:
+            yield from pd.read_csv(
+                fs_file, chunksize=self._chunksize, **self._load_args
+            )
+
+    def _save(self, data: pd.DataFrame) -> None:
+        raise DataSetError(f"{self.__class__.__name__} is a read only data set type")
+
+
+class ChunkedParquetDataSet(ParquetDataSet):
+    """``ChunkedParquetDataSet`` extends the out of the box ``ParquetDataSet`` so
+    that it is saved as a directory of ``part-*.parquet`` files. It accepts either
+    a single DataFrame or any iterable of DataFrames, writing each one as its own
+    part as soon as it is produced. A Series, or an iterable of Series, is saved
+    as a single column and loaded back as a Series. Every part is written with
+    the schema of the first chunk, and a later chunk whose values do not fit
+    it, such as nulls in a column the first chunk holds as integers of a
+    narrower type, fails with an error naming the mismatched columns.
+
+    Loading reads the directory as a single ``pyarrow`` dataset, so downstream
+    nodes still receive one DataFrame. The ``columns`` and ``filters`` load
+    arguments are pushed down to the Parquet reader, so only the requested
+    column chunks are read, and row groups whose statistics rule out every
+    filter are skipped. ``columns`` may hold ``fnmatch`` patterns such as
+    ``*_id``, each expanding to the matching columns in file order.
+
+    With ``by_row_group`` set, loading instead returns an iterator over the
+    row groups of every file, one DataFrame at a time, which also works for a
+    single Parquet file written by another dataset.
+
+    On remote file systems each part is serialised in memory and uploaded in
+    the background while the next chunk is produced, with at most
+    ``MAX_WORKERS`` parts in flight.
+
+    Declaring several catalog entries for the same files under transcoded
+    names (``name@projection``) lets each node load only what it needs, while
+    Kedro still treats them as one dataset when resolving dependencies.
+
+    Example:
+    ::
+
+        >>> ChunkedParquetDataSet(filepath='/data/typed_reviews.pq')
+        >>> ChunkedParquetDataSet(
+        >>>     filepath='/data/typed_reviews.pq',
+        >>>     load_args={
+        >>>         'columns': ['*_id', 'review_scores_rating'],
+        >>>         'filters': [('review_scores_rating', '>=', 90)],
+        >>>     },
+        >>> )
+        >>> ChunkedParquetDataSet(filepath='/data/table.pq', by_row_group=True)
+    """
+
+    def __init__(self, filepath: str, by_row_group: bool = False, **kwargs):
+        """Creates a new instance of ChunkedParquetDataSet.
+
+        Args:
+            filepath: The location of the directory of parts, or of a single
+                Parquet file to load.
+            by_row_group: If True, loading returns an iterator of DataFrames,
+                one per row group, rather than a single DataFrame.
+            **kwargs: Any other arguments accepted by ``ParquetDataSet``.
+
+        Raises:
+            DataSetError: If ``filters`` are given along with ``by_row_group``.
+        """
+        super().__init__(filepath=filepath, **kwargs)
+        self._by_row_group = by_row_group
+        if by_row_group and "filters" in self._load_args:
+            raise DataSetError(
+                f"{self.__class__.__name__} does not support 'filters' when "
+                f"loading by row group"
+            )
+
+    def _describe(self) -> Dict[str, Any]:
+        return dict(super()._describe(), by_row_group=self._by_row_group)
+
+    def _resolve_columns(
+        self, schema: pa.Schema, columns: Optional[List[str]]
+    ) -> Optional[List[str]]:
+        if columns is None:
+            return None
+        resolved = []
+        for pattern in columns:
+            matches = fnmatch.filter(schema.names, pattern)
+            if not matches:
+                raise DataSetError(
+                    f"No column of '{self._filepath}' matches '{pattern}'"
+                )
+            resolved.extend(m for m in matches if m not in resolved)
+        return resolved
+
+    @staticmethod
+    def _to_pandas(table: pa.Table) -> Union[pd.DataFrame, pd.Series]:
+        data = table.to_pandas()
+        if (table.schema.metadata or {}).get(_SERIES_KEY):
+            return data.iloc[:, 0]
+        return data
+
+    def _load(self) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        load_path = get_filepath_str(self._get_load_path(), self._protocol)
+        load_args = dict(self._load_args)
+        columns = load_args.pop("columns", None)
+        if self._by_row_group:
+            return self._iter_row_groups(load_path, columns, load_args)
+
+        dataset = pq.ParquetDataset(
+            load_path,
+            filesystem=self._fs,
+            filters=load_args.pop("filters", None),
+            use_legacy_dataset=False,
+        )
+        table = dataset.read(
+            columns=self._resolve_columns(dataset.schema, columns),
+            use_pandas_metadata=True,
+            **load_args,
+        )
+        return self._to_pandas(table)
+
+    def _iter_row_groups(
+        self, load_path: str, columns: Optional[List[str]], load_args: Dict[str, Any]
+    ) -> Iterator[pd.DataFrame]:
+        dataset = pq.ParquetDataset(
+            load_path, filesystem=self._fs, use_legacy_dataset=False
+        )
+        resolved = self._resolve_columns(dataset.schema, columns)
+        for path in sorted(dataset.files):
+            with self._fs.open(path, mode="rb") as fs_file:
+                parquet_file = pq.ParquetFile(fs_file)
+                for index in range(parquet_file.num_row_groups):
+                    table = parquet_file.read_row_group(
+                        index, columns=resolved, use_pandas_metadata=True, **load_args
+                    )
+                    yield self._to_pandas(table)
+
+    @staticmethod
+    def _to_table(
+        chunk: Union[pd.DataFrame, pd.Series],
+        schema: Optional[pa.Schema],
+        from_pandas_args: Dict[str, Any],
+    ) -> pa.Table:
+        if isinstance(chunk, pd.DataFrame):
+            return pa.Table.from_pandas(chunk, schema=schema, **from_pandas_args)
+        table = pa.Table.from_pandas(
+            chunk.to_frame(), schema=schema, **from_pandas_args
+        )
+        return table.replace_schema_metadata(
+            {**table.schema.metadata, _SERIES_KEY: b"true"}
+        )
+
+    def _schema_error(
+        self,
+        save_path: str,
+        index: int,
+        chunk: Union[pd.DataFrame, pd.Series],
+        schema: pa.Schema,
+        from_pandas_args: Dict[str, Any],
+    ) -> DataSetError:
+        """Names the columns whose type in ``chunk`` differs from the first"""
+        try:
+            inferred = self._to_table(chunk, None, from_pandas_args).schema
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            inferred = pa.schema([])
+        mismatches = [
+            f"'{field.name}' ({schema.field(field.name).type} in the first chunk, "
+            f"{field.type} in this one)"
+            for field in inferred
+            if field.name in schema.names
+            and not field.type.equals(schema.field(field.name).type)
+        ]
+        missing = sorted(set(schema.names) - set(inferred.names))
+        if missing and inferred.names:
+            mismatches.append(f"missing columns {missing}")
+        return DataSetError(
+            f"Chunk {index} saved to '{save_path}' does not fit the schema of the "
+            f"first chunk, which every part shares: "
+            f"{', '.join(mismatches) or 'its values can not be converted'}. "
+            f"Cast the columns to a type which holds the values of every chunk, "
+            f"such as a float or nullable dtype, before they are saved."
+        )
+
+    def _save(
+        self,
+        data: Union[pd.DataFrame, pd.Series, Iterable[Union[pd.DataFrame, pd.Series]]],
+    ) -> None:
+        save_path = get_filepath_str(self._get_save_path(), self._protocol)
+        chunks = [data] if isinstance(data, (pd.DataFrame, pd.Series)) else data
+
+        if self._fs.exists(save_path):
+            self._fs.rm(save_path, recursive=True)
+        self._fs.makedirs(save_path, exist_ok=True)
+
+        # Every part must share a schema, so the first chunk sets it for the rest.
+        # Chunk indices are not stored as they would only be meaningful per part.
+        from_pandas_args = {"preserve_index": False, **self._from_pandas_args}
+        schema = None
+        uploads = deque()
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            for index, chunk in enumerate(chunks):
+                try:
+                    table = self._to_table(chunk, schema, from_pandas_args)
+                except (pa.ArrowInvalid, pa.ArrowTypeError) as exc:
+                    raise self._schema_error(
+                        save_path, index, chunk, schema, from_pandas_args
+                    ) from exc
+                schema = table.schema
+                part_path = f"{save_path}/part-{index:05d}.parquet"
+                if isinstance(self._fs, LocalFileSystem):
+                    pq.write_table(
+                        table, where=part_path, filesystem=self._fs, **self._save_args
+                    )
+                    continue
+
+                buffer = pa.BufferOutputStream()
+                pq.write_table(table, where=buffer, **self._save_args)
+                uploads.append(
+                    pool.submit(write_bytes, self._fs, part_path, buffer.getvalue())
+                )
+                if len(uploads) >= MAX_WORKERS:
+                    uploads.popleft().result()
+            for upload in uploads:
+                upload.result()
+
+        self._invalidate_cache()
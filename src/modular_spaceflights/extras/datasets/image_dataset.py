@@ -1,50 +1,198 @@
+import io
+import json
+import os
+import uuid
+from copy import deepcopy
 from pathlib import PurePosixPath
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Union
 
-import fsspec
 import numpy as np
 import PIL
-from kedro.io.core import AbstractDataSet, get_protocol_and_path
+from kedro.io.core import AbstractDataSet, DataSetError, get_protocol_and_path
 from PIL import Image
 
+from modular_spaceflights.remote_io import get_filesystem, read_bytes, write_bytes
+
 
 class ImageDataSet(AbstractDataSet):
     """``ImageDataSet`` loads / save image data from a given filepath as `numpy` array
     using Pillow.
 
+    By default the whole image is decoded and converted to RGBA. The load
+    arguments below change what is decoded, and when:
+
+    - ``lazy``: Return the ``PIL.Image`` without decoding it, so that its
+      size and mode can be read cheaply. The pixels are only decoded on first
+      access, from the compressed bytes held in memory.
+    - ``thumbnail``: A maximum ``[width, height]`` to downscale to, keeping the
+      aspect ratio. JPEG images are decoded at a reduced scale to begin with.
+    - ``mode``: The Pillow mode to convert to, ``RGBA`` by default, or None to
+      keep the mode of the file.
+    - ``mmap``: Store the decoded array in a ``.npy`` sidecar next to the
+      image, and return a read-only memory map of it. Repeated loads of an
+      unchanged file then neither decode the image nor copy the pixels onto
+      the heap. Only supported on the local file system.
+
+    Save arguments, such as ``compress_level`` or ``optimize`` for PNG files,
+    are passed to ``PIL.Image.save``.
+
+    The file is read and written whole, through the file system client shared
+    by every dataset with the same protocol and options, so large remote
+    images are transferred as concurrent ranged reads and multipart uploads.
+
     Example:
     ::
 
         >>> ImageDataSet(filepath='/img/file/path.png')
+        >>> ImageDataSet(
+        >>>     filepath='/img/file/path.png',
+        >>>     load_args={'thumbnail': [256, 256], 'mmap': True},
+        >>>     save_args={'compress_level': 9},
+        >>> )
     """
 
-    def __init__(self, filepath: str):
+    DEFAULT_LOAD_ARGS = {
+        "lazy": False,
+        "thumbnail": None,
+        "mode": "RGBA",
+        "mmap": False,
+    }  # type: Dict[str, Any]
+
+    def __init__(
+        self,
+        filepath: str,
+        load_args: Optional[Dict[str, Any]] = None,
+        save_args: Optional[Dict[str, Any]] = None,
+        credentials: Optional[Dict[str, Any]] = None,
+        fs_args: Optional[Dict[str, Any]] = None,
+    ):
         """Creates a new instance of ImageDataSet to load / save image data for given filepath.
 
         Args:
             filepath: The location of the image file to load / save data.
+            load_args: Options controlling the decoding, see above.
+            save_args: Extra arguments for ``PIL.Image.save``.
+            credentials: Credentials required to get access to the underlying
+                filesystem.
+            fs_args: Extra arguments to pass into the underlying filesystem
+                class constructor.
+
+        Raises:
+            DataSetError: If the options are not supported for the file.
         """
         # parse the path and protocol (e.g. file, http, s3, etc.)
         protocol, path = get_protocol_and_path(filepath)
         self._protocol = protocol
         self._filepath = PurePosixPath(path)
-        self._fs = fsspec.filesystem(self._protocol)
+        self._fs = get_filesystem(self._protocol, credentials, fs_args)
+
+        self._load_args = {**self.DEFAULT_LOAD_ARGS, **(load_args or {})}
+        self._save_args = deepcopy(save_args or {})
+        # Only registers every plugin once, the table of extensions is partial
+        # while the plugins imported so far are all that registered
+        Image.init()
+        self._format = Image.registered_extensions().get(self._filepath.suffix.lower())
+        if self._format is None:
+            raise DataSetError(
+                f"Pillow does not support '{self._filepath.suffix}' files"
+            )
+        if self._load_args["mmap"]:
+            if self._protocol != "file":
+                raise DataSetError(
+                    f"Memory mapping is only supported on the local file system, "
+                    f"got '{self._protocol}'"
+                )
+            if self._load_args["lazy"]:
+                raise DataSetError("An image can not be both lazy and memory mapped")
+
+        sidecar_dir = self._filepath.parent / ".cache"
+        self._sidecar_path = sidecar_dir / f"{self._filepath.name}.npy"
+        self._metadata_path = sidecar_dir / f"{self._filepath.name}.json"
 
-    def _load(self) -> np.ndarray:
+    def _open(self) -> PIL.Image.Image:
+        """Reads the compressed bytes and parses the image header only."""
+        return Image.open(io.BytesIO(read_bytes(self._fs, str(self._filepath))))
+
+    def _decode(self) -> PIL.Image.Image:
+        image = self._open()
+        thumbnail = self._load_args["thumbnail"]
+        mode = self._load_args["mode"]
+        if thumbnail:
+            # Lets the JPEG decoder skip straight to a smaller scale
+            image.draft(mode, tuple(thumbnail))
+            image.thumbnail(tuple(thumbnail))
+        if mode and image.mode != mode:
+            image = image.convert(mode)
+        return image
+
+    def _load(self) -> Union[np.ndarray, PIL.Image.Image]:
         """Loads data from the image file.
 
         Returns:
-            Data from the image file as a numpy array
+            Data from the image file as a numpy array, which is read-only if
+            memory mapped, or as an undecoded ``PIL.Image`` if ``lazy``
         """
-        with self._fs.open(self._filepath, mode="r") as f:
-            image = Image.open(f).convert("RGBA")
-            return np.asarray(image)
+        if self._load_args["lazy"]:
+            return self._open()
+        if not self._load_args["mmap"]:
+            return np.asarray(self._decode())
+
+        if not self._is_sidecar_valid():
+            self._write_sidecar()
+        return np.load(str(self._sidecar_path), mmap_mode="r")
+
+    def _write_sidecar(self) -> None:
+        """Replaces the sidecar, then its metadata, each as a whole. Maps of
+        the previous sidecar keep the file they were opened on, and other
+        processes never map a partly written one."""
+        key = self._sidecar_key()  # of the image as it is before decoding
+        data = np.asarray(self._decode())
+        self._fs.makedirs(str(self._sidecar_path.parent), exist_ok=True)
+
+        suffix = f".{uuid.uuid4().hex}.tmp"
+        temporary_path = f"{self._sidecar_path}{suffix}"
+        with open(temporary_path, "wb") as f:
+            np.save(f, data)
+        os.replace(temporary_path, str(self._sidecar_path))
 
-    def _save(self, data: PIL.Image) -> None:
+        temporary_path = f"{self._metadata_path}{suffix}"
+        with open(temporary_path, "w") as f:
+            json.dump(key, f)
+        os.replace(temporary_path, str(self._metadata_path))
+
+    def _sidecar_key(self) -> Dict[str, Any]:
+        info = self._fs.info(str(self._filepath))
+        return {
+            "modified": str(info.get("mtime") or info.get("created")),
+            "size": info["size"],
+            "load_args": self._load_args,
+        }
+
+    def _is_sidecar_valid(self) -> bool:
+        if not (
+            self._fs.exists(str(self._metadata_path))
+            and self._fs.exists(str(self._sidecar_path))
+        ):
+            return False
+        with self._fs.open(str(self._metadata_path), mode="r") as f:
+            return json.load(f) == json.loads(json.dumps(self._sidecar_key()))
+
+    def _save(self, data: Union[PIL.Image.Image, np.ndarray]) -> None:
         """Saves image data to the specified filepath."""
-        with self._fs.open(self._filepath, mode="wb") as f:
-            data.save(f)
+        image = Image.fromarray(data) if isinstance(data, np.ndarray) else data
+        buffer = io.BytesIO()
+        image.save(buffer, format=self._format, **self._save_args)
+        write_bytes(self._fs, str(self._filepath), buffer.getbuffer())
+
+    def _exists(self) -> bool:
+        """Checks whether the image file exists."""
+        return self._fs.exists(str(self._filepath))
 
     def _describe(self) -> Dict[str, Any]:
         """Returns a dict that describes the attributes of the dataset."""
-        return dict(filepath=self._filepath, protocol=self._protocol)
+        return dict(
+            filepath=self._filepath,
+            protocol=self._protocol,
+            load_args=self._load_args,
+            save_args=self._save_args,
+        )
@@ -0,0 +1,155 @@
+import io
+from copy import deepcopy
+from pathlib import PurePosixPath
+from typing import Any, Dict
+
+import joblib
+from fsspec.implementations.local import LocalFileSystem
+from kedro.io.core import (
+    AbstractVersionedDataSet,
+    DataSetError,
+    Version,
+    get_filepath_str,
+    get_protocol_and_path,
+)
+
+from modular_spaceflights.remote_io import get_filesystem, read_bytes, write_bytes
+
+# Uncompressed files are a plain pickle, which opens with the PROTO opcode,
+# while every compressor joblib supports writes its own magic number first
+_PICKLE_PROTO = b"\x80"
+
+
+class JoblibDataSet(AbstractVersionedDataSet):
+    """``JoblibDataSet`` loads / saves an object, such as a fitted model, with
+    ``joblib``, which writes every NumPy array the object holds as a raw
+    buffer next to the pickled remainder, rather than pickling the array.
+    Saving and loading large arrays is therefore faster than with ``pickle``.
+
+    Uncompressed files on the local file system are memory mapped on load by
+    default (``mmap_mode: r``), so the arrays are paged in from the file as
+    they are used and shared between processes through the page cache,
+    instead of each process holding a private copy. Estimators which copy
+    their arrays into their own structures when unpickled, such as the trees
+    of a scikit-learn forest, do not benefit from the mapping, only from the
+    faster load. The arrays of memory mapped objects are read-only.
+
+    ``compress`` in ``save_args`` trades speed for size, as an integer level
+    from 0 to 9 or a ``[method, level]`` pair such as ``[zlib, 3]``. Files
+    saved with compression, and files on remote file systems, are read into
+    memory in full. Whether a file is compressed is read from the file itself,
+    so it does not matter which ``save_args`` it was saved with.
+
+    Example:
+    ::
+
+        >>> JoblibDataSet(filepath='/data/06_models/random_forest.joblib')
+        >>> JoblibDataSet(
+        >>>     filepath='/data/06_models/random_forest.joblib',
+        >>>     save_args={'compress': ['zlib', 3]},
+        >>> )
+    """
+
+    DEFAULT_LOAD_ARGS = {"mmap_mode": "r"}  # type: Dict[str, Any]
+    DEFAULT_SAVE_ARGS = {"compress": 0}  # type: Dict[str, Any]
+
+    def __init__(
+        self,
+        filepath: str,
+        load_args: Dict[str, Any] = None,
+        save_args: Dict[str, Any] = None,
+        version: Version = None,
+        credentials: Dict[str, Any] = None,
+        fs_args: Dict[str, Any] = None,
+    ) -> None:
+        """Creates a new instance of JoblibDataSet.
+
+        Args:
+            filepath: The location of the file to load / save data.
+            load_args: Options for ``joblib.load``, such as ``mmap_mode``,
+                which is None to load the arrays into memory.
+            save_args: Options for ``joblib.dump``, such as ``compress``.
+            version: If specified, should be an instance of
+                ``kedro.io.core.Version``. If its ``load`` attribute is
+                None, the latest version will be loaded. If its ``save``
+                attribute is None, save version will be autogenerated.
+            credentials: Credentials required to get access to the underlying
+                filesystem.
+            fs_args: Extra arguments to pass into the underlying filesystem
+                class constructor.
+        """
+        _fs_args = deepcopy(fs_args) or {}
+        protocol, path = get_protocol_and_path(filepath, version)
+        if protocol == "file":
+            _fs_args.setdefault("auto_mkdir", True)
+        self._protocol = protocol
+        self._fs = get_filesystem(protocol, deepcopy(credentials), _fs_args)
+
+        super().__init__(
+            filepath=PurePosixPath(path),
+            version=version,
+            exists_function=self._fs.exists,
+            glob_function=self._fs.glob,
+        )
+
+        self._load_args = {**self.DEFAULT_LOAD_ARGS, **(load_args or {})}
+        self._save_args = {**self.DEFAULT_SAVE_ARGS, **(save_args or {})}
+        # YAML has no tuples, which is what joblib expects a (method, level) as
+        if isinstance(self._save_args["compress"], list):
+            self._save_args["compress"] = tuple(self._save_args["compress"])
+
+    def _describe(self) -> Dict[str, Any]:
+        return dict(
+            filepath=self._filepath,
+            protocol=self._protocol,
+            load_args=self._load_args,
+            save_args=self._save_args,
+            version=self._version,
+        )
+
+    def _is_compressed(self, load_path: str) -> bool:
+        with self._fs.open(load_path, mode="rb") as f:
+            return f.read(1) != _PICKLE_PROTO
+
+    def _load(self) -> Any:
+        load_path = get_filepath_str(self._get_load_path(), self._protocol)
+        if isinstance(self._fs, LocalFileSystem) and not self._is_compressed(load_path):
+            return joblib.load(load_path, **self._load_args)
+
+        # joblib fails to memory map arrays within a compressed file
+        load_args = {k: v for k, v in self._load_args.items() if k != "mmap_mode"}
+        if isinstance(self._fs, LocalFileSystem):
+            return joblib.load(load_path, **load_args)
+        return joblib.load(io.BytesIO(read_bytes(self._fs, load_path)), **load_args)
+
+    def _save(self, data: Any) -> None:
+        save_path = get_filepath_str(self._get_save_path(), self._protocol)
+        try:
+            if isinstance(self._fs, LocalFileSystem):
+                self._fs.makedirs(str(PurePosixPath(save_path).parent), exist_ok=True)
+                joblib.dump(data, save_path, **self._save_args)
+            else:
+                buffer = io.BytesIO()
+                joblib.dump(data, buffer, **self._save_args)
+                write_bytes(self._fs, save_path, buffer.getbuffer())
+        except Exception as exc:
+            raise DataSetError(
+                f"{data.__class__} was not serialized due to: {exc}"
+            ) from exc
+        self._invalidate_cache()
+
+    def _exists(self) -> bool:
+        try:
+            load_path = get_filepath_str(self._get_load_path(), self._protocol)
+        except DataSetError:
+            return False
+        return self._fs.exists(load_path)
+
+    def _release(self) -> None:
+        super()._release()
+        self._invalidate_cache()
+
+    def _invalidate_cache(self) -> None:
+        """Invalidate underlying filesystem caches."""
+        filepath = get_filepath_str(self._filepath, self._protocol)
+        self._fs.invalidate_cache(filepath)
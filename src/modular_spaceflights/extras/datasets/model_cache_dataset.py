@@ -0,0 +1,356 @@
+import hashlib
+import json
+import logging
+import uuid
+from copy import deepcopy
+from datetime import datetime, timedelta
+from pathlib import PurePosixPath
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from kedro.io.core import (
+    VERSION_FORMAT,
+    VERSIONED_FLAG_KEY,
+    AbstractDataSet,
+    DataSetError,
+    Version,
+    generate_timestamp,
+    get_protocol_and_path,
+)
+
+from modular_spaceflights.remote_io import get_filesystem
+
+
+def _update_digest(digest: "hashlib._Hash", data: Any) -> None:
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        # Names and dtypes matter to a model as much as the values do
+        schema = data.dtypes if isinstance(data, pd.DataFrame) else data.dtype
+        digest.update(str((data.shape, getattr(data, "name", None))).encode())
+        digest.update(str(schema).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy())
+    elif isinstance(data, np.ndarray):
+        digest.update(str((data.shape, data.dtype)).encode())
+        digest.update(np.ascontiguousarray(data).tobytes())
+    else:
+        digest.update(json.dumps(data, sort_keys=True, default=str).encode())
+
+
+def _validate_wrapped(dataset: Dict[str, Any]) -> None:
+    if "filepath" not in dataset:
+        raise DataSetError("The dataset wrapped by a model cache needs a filepath")
+    if VERSIONED_FLAG_KEY in dataset:
+        raise DataSetError(
+            "The dataset wrapped by a model cache is always versioned, and "
+            "should not specify it."
+        )
+
+
+class ModelCache:
+    """A store of fitted models, each saved as a version of the wrapped
+    dataset and looked up by the fingerprint of the data and parameters it
+    was fitted with. An index from fingerprint to version, and to when the
+    version was last used, is kept next to the versions, along with the
+    current version: the one most recently added or returned by a lookup.
+
+    Whenever a model is added, versions beyond the ``max_versions`` most
+    recently used, or unused for over ``max_age_days``, are deleted. Versions
+    written without the cache, which are not in the index, are aged by their
+    version timestamp.
+
+    Metadata given with a model, such as the columns it was trained with, is
+    stored as JSON in the directory of its version, and deleted with it.
+
+    The index is replaced as a whole rather than written in place, so a
+    concurrent reader sees either the old or the new index. An index which
+    cannot be read is treated as empty, which costs at most a refit, and
+    when two processes add a model at once the entry of one of them may be
+    lost in the same way.
+    """
+
+    def __init__(
+        self,
+        dataset: Dict[str, Any],
+        max_versions: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+    ):
+        self._dataset = dataset
+        self._max_versions = max_versions
+        self._max_age = None if max_age_days is None else timedelta(max_age_days)
+
+        protocol, path = get_protocol_and_path(dataset["filepath"])
+        self._fs = get_filesystem(
+            protocol, dataset.get("credentials"), dataset.get("fs_args")
+        )
+        self._path = PurePosixPath(path)
+        self._index_path = f"{path}.cache.json"
+
+    @staticmethod
+    def fingerprint(*data: Any) -> str:
+        """Hashes the content of DataFrames, Series and arrays, and the JSON
+        serialisation of anything else, such as parameters."""
+        digest = hashlib.sha256()
+        for item in data:
+            _update_digest(digest, item)
+        return digest.hexdigest()
+
+    def _version_dataset(
+        self, load_version: str = None, save_version: str = None
+    ) -> AbstractDataSet:
+        return AbstractDataSet.from_config(
+            "_model_cache",
+            {**self._dataset, VERSIONED_FLAG_KEY: True},
+            load_version,
+            save_version,
+        )
+
+    def _read_index(self) -> Dict[str, Any]:
+        empty = {"current": None, "models": {}}
+        try:
+            with self._fs.open(self._index_path, mode="r") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return empty
+        except ValueError:
+            logging.getLogger(__name__).warning(
+                "Ignoring the unreadable model cache index '%s'", self._index_path
+            )
+            return empty
+        if not isinstance(index, dict) or not isinstance(index.get("models"), dict):
+            return empty
+        index.setdefault("current", None)
+        return index
+
+    def _write_index(self, index: Dict[str, Any]) -> None:
+        temporary_path = f"{self._index_path}.{uuid.uuid4().hex}.tmp"
+        with self._fs.open(temporary_path, mode="w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        self._fs.mv(temporary_path, self._index_path)
+
+    def _versions(self) -> List[str]:
+        if not self._fs.exists(str(self._path)):
+            return []
+        return sorted(
+            PurePosixPath(path).name
+            for path in self._fs.ls(str(self._path), detail=False)
+        )
+
+    def get(self, fingerprint: str) -> Optional[Any]:
+        """Loads the model fitted with ``fingerprint``, if one was stored and
+        has not been evicted since.
+
+        Returns:
+            The model, or None on a cache miss.
+        """
+        index = self._read_index()
+        entry = index["models"].get(fingerprint)
+        if entry is None or entry["version"] not in self._versions():
+            return None
+
+        model = self.load(entry["version"])
+        entry["last_used"] = generate_timestamp()
+        index["current"] = entry["version"]
+        self._write_index(index)
+        return model
+
+    def load(self, version: Optional[str] = None) -> Any:
+        """Loads a version of the wrapped dataset, the latest if not given"""
+        return self._version_dataset(load_version=version).load()
+
+    def version_of(self, fingerprint: str) -> Optional[str]:
+        """The version holding the model fitted with ``fingerprint``, if any"""
+        entry = self._read_index()["models"].get(fingerprint)
+        return entry and entry["version"]
+
+    def _metadata_path(self, version: str) -> str:
+        return str(self._path / version / f"{self._path.name}.metadata.json")
+
+    def metadata(self, version: Optional[str] = None) -> Dict[str, Any]:
+        """The metadata stored with a version, the latest if not given, which
+        is empty if none was stored"""
+        if version is None:
+            versions = self._versions()
+            if not versions:
+                return {}
+            version = versions[-1]
+        try:
+            with self._fs.open(self._metadata_path(version), mode="r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def current_version(self) -> Optional[str]:
+        """The version most recently added or returned by ``get``, if any"""
+        index = self._read_index()
+        return index["current"] if index["current"] in self._versions() else None
+
+    def put(self, fingerprint: str, model: Any, metadata: Dict[str, Any] = None) -> str:
+        """Saves ``model`` as a new version, with ``metadata`` if given, then
+        evicts old versions.
+
+        Returns:
+            The version the model was saved as.
+        """
+        version = generate_timestamp()
+        self._version_dataset(save_version=version).save(model)
+        if metadata is not None:
+            with self._fs.open(self._metadata_path(version), mode="w") as f:
+                json.dump(metadata, f, indent=2, sort_keys=True)
+
+        index = self._read_index()
+        index["models"][fingerprint] = {"version": version, "last_used": version}
+        index["models"] = self._evict(index["models"], keep=version)
+        index["current"] = version
+        self._write_index(index)
+        return version
+
+    def _evict(
+        self, models: Dict[str, Dict[str, str]], keep: str
+    ) -> Dict[str, Dict[str, str]]:
+        last_used = {version: version for version in self._versions()}
+        for entry in models.values():
+            if entry["version"] in last_used:
+                last_used[entry["version"]] = entry["last_used"]
+
+        by_recency = sorted(last_used, key=last_used.get, reverse=True)
+        evicted = set(by_recency[self._max_versions :]) if self._max_versions else set()
+        if self._max_age is not None:
+            oldest = (datetime.utcnow() - self._max_age).strftime(VERSION_FORMAT)
+            evicted.update(v for v, used in last_used.items() if used < oldest)
+        evicted.discard(keep)
+
+        for version in sorted(evicted):
+            logging.getLogger(__name__).info(
+                "Evicting version '%s' of '%s'", version, self._path
+            )
+            self._fs.rm(str(self._path / version), recursive=True)
+        return {
+            fingerprint: entry
+            for fingerprint, entry in models.items()
+            if entry["version"] in last_used and entry["version"] not in evicted
+        }
+
+
+class ModelCacheDataSet(AbstractDataSet):
+    """``ModelCacheDataSet`` loads a ``ModelCache`` over the versions of a
+    wrapped, versioned model dataset. A node fitting a model looks the
+    fingerprint of its training data and parameters up in the cache, and only
+    fits and adds a new version on a miss, so that a run with unchanged inputs
+    neither refits the model nor writes another copy of it.
+
+    Every version stays loadable by the wrapped dataset on its own, and
+    ``CurrentModelDataSet`` loads the version the cache last returned.
+
+    Example:
+    ::
+
+        >>> ModelCacheDataSet(
+        >>>     dataset={'type': 'pickle.PickleDataSet', 'filepath': 'rf.pkl'},
+        >>>     retention={'max_versions': 5, 'max_age_days': 30},
+        >>> )
+    """
+
+    def __init__(
+        self, dataset: Dict[str, Any], retention: Optional[Dict[str, Any]] = None
+    ):
+        """Creates a new instance of ModelCacheDataSet.
+
+        Args:
+            dataset: The dict/YAML representation of the dataset each model
+                is saved with, which must have a ``filepath`` and support
+                versioning.
+            retention: ``max_versions``, the number of most recently used
+                versions to keep, and ``max_age_days``, after which a version
+                which has not been used is deleted. Versions are kept forever
+                if neither is given.
+
+        Raises:
+            DataSetError: If the wrapped dataset has no ``filepath``, or
+                already specifies that it is versioned.
+        """
+        _validate_wrapped(dataset)
+        self._dataset_config = deepcopy(dataset)
+        self._retention = {**(retention or {})}
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"dataset": self._dataset_config, "retention": self._retention}
+
+    def _load(self) -> ModelCache:
+        return ModelCache(self._dataset_config, **self._retention)
+
+    def _save(self, data: Any) -> None:
+        raise DataSetError(
+            f"{self.__class__.__name__} is a read only data set type, models "
+            f"are added through the loaded ModelCache"
+        )
+
+
+class CurrentModelDataSet(AbstractDataSet):
+    """``CurrentModelDataSet`` loads the current model of the ``ModelCache``
+    over a wrapped dataset, which is the one the last training run fitted or
+    reused. The latest version is not necessarily that model, as a cache hit
+    returns an earlier version without saving a new one.
+
+    Another version can be loaded with ``kedro run --load-version`` when the
+    dataset is declared as ``versioned``, and the latest version is loaded if
+    the cache has no current version, such as for versions saved without it.
+
+    Example:
+    ::
+
+        >>> CurrentModelDataSet(
+        >>>     dataset={'type': 'pickle.PickleDataSet', 'filepath': 'rf.pkl'},
+        >>> )
+    """
+
+    def __init__(self, dataset: Dict[str, Any], version: Version = None):
+        """Creates a new instance of CurrentModelDataSet.
+
+        Args:
+            dataset: The dict/YAML representation of the dataset wrapped by
+                the model cache.
+            version: If its ``load`` attribute is given, that version is
+                loaded instead of the current one.
+
+        Raises:
+            DataSetError: If the wrapped dataset has no ``filepath``, or
+                already specifies that it is versioned.
+        """
+        _validate_wrapped(dataset)
+        self._dataset_config = deepcopy(dataset)
+        self._version = version
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"dataset": self._dataset_config, "version": self._version}
+
+    def _version_to_load(self, cache: ModelCache) -> Optional[str]:
+        return (self._version and self._version.load) or cache.current_version()
+
+    def _load(self) -> Any:
+        cache = ModelCache(self._dataset_config)
+        return cache.load(self._version_to_load(cache))
+
+    def _save(self, data: Any) -> None:
+        raise DataSetError(
+            f"{self.__class__.__name__} is a read only data set type, models "
+            f"are added through a ModelCache"
+        )
+
+
+class CurrentModelMetadataDataSet(CurrentModelDataSet):
+    """``CurrentModelMetadataDataSet`` loads the metadata stored with the model
+    which ``CurrentModelDataSet`` loads, such as the columns it was trained
+    with. A version chosen with ``kedro run --load-version`` has to be chosen
+    for both datasets.
+
+    Example:
+    ::
+
+        >>> CurrentModelMetadataDataSet(
+        >>>     dataset={'type': 'pickle.PickleDataSet', 'filepath': 'rf.pkl'},
+        >>> )
+    """
+
+    def _load(self) -> Dict[str, Any]:
+        cache = ModelCache(self._dataset_config)
+        return cache.metadata(self._version_to_load(cache))
@@ -0,0 +1,196 @@
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple, Union
+
+import pandas as pd
+from kedro.io.core import VERSIONED_FLAG_KEY, AbstractDataSet, Version
+from kedro.io.memory_data_set import _copy_with_mode, _infer_copy_mode
+
+
+def _size_of(data: Any) -> int:
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        return int(data.memory_usage(deep=True).sum())
+    return sys.getsizeof(data)
+
+
+class LRUStore:
+    """A thread-safe store of loaded data, bounded by the total size of its
+    entries. The least recently used entries are evicted to make room for a new
+    one, and entries larger than the bound are not stored at all.
+
+    Hits, misses, evictions and the bytes loaded on a miss are counted per
+    dataset name, until the store is cleared.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # type: OrderedDict[str, Tuple[str, Any, int]]
+        self._size = 0
+        self._lock = threading.RLock()
+        self._key_locks = {}  # type: Dict[str, threading.Lock]
+        self._stats = {}  # type: Dict[str, Dict[str, int]]
+
+    def _count(self, name: str, event: str, amount: int = 1) -> None:
+        counts = self._stats.setdefault(
+            name, {"hits": 0, "misses": 0, "evictions": 0, "loaded_bytes": 0}
+        )
+        counts[event] += amount
+
+    def key_lock(self, key: str) -> threading.Lock:
+        """Returns the lock to hold while loading ``key``, so that concurrent
+        loads of the same data wait for the first one rather than repeat it."""
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key: str, name: str) -> Tuple[bool, Any]:
+        """Looks up ``key``, marking it as the most recently used entry."""
+        with self._lock:
+            if key not in self._entries:
+                self._count(name, "misses")
+                return False, None
+            self._entries.move_to_end(key)
+            self._count(name, "hits")
+            return True, self._entries[key][1]
+
+    def put(self, key: str, name: str, data: Any) -> None:
+        """Stores ``data`` under ``key``, evicting the least recently used
+        entries until it fits."""
+        size = _size_of(data)
+        with self._lock:
+            self._count(name, "loaded_bytes", size)
+            self.discard(key)
+            if size > self.max_bytes:
+                return
+            while self._entries and self._size + size > self.max_bytes:
+                _, (evicted_name, _, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self._count(evicted_name, "evictions")
+            self._entries[key] = (name, data, size)
+            self._size += size
+
+    def discard(self, key: str) -> None:
+        """Removes ``key`` from the store, if present."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= entry[2]
+
+    def clear(self) -> Dict[str, Dict[str, int]]:
+        """Empties the store and resets its counters.
+
+        Returns:
+            The counters collected since the store was last cleared.
+        """
+        with self._lock:
+            stats = self._stats
+            self._entries.clear()
+            self._key_locks.clear()
+            self._size = 0
+            self._stats = {}
+            return stats
+
+
+# Shared by every ReadThroughCacheDataSet in the process, and cleared at the
+# start and end of each run by ``ReadThroughCacheHooks``
+RUN_CACHE = LRUStore(max_bytes=2 ** 30)
+
+
+class ReadThroughCacheDataSet(AbstractDataSet):
+    """``ReadThroughCacheDataSet`` wraps a persisted dataset so that it is only
+    loaded from storage once per run. Subsequent loads, by the same or any other
+    catalog entry wrapping an identically configured dataset, are served from
+    ``RUN_CACHE`` until the entry is evicted or the run ends.
+
+    Unlike Kedro's ``CachedDataSet``, the cache is bounded in size, evicting the
+    least recently used data first, and it counts hits and misses, which
+    ``ReadThroughCacheHooks`` writes to the run log.
+
+    Saving writes through to the wrapped dataset and drops the cached copy.
+
+    Example:
+    ::
+
+        >>> ReadThroughCacheDataSet(
+        >>>     dataset={'type': 'pandas.ParquetDataSet', 'filepath': 'a.pq'},
+        >>>     copy_mode='assign',
+        >>> )
+    """
+
+    def __init__(
+        self,
+        dataset: Union[AbstractDataSet, Dict],
+        version: Version = None,
+        copy_mode: str = None,
+    ):
+        """Creates a new instance of ReadThroughCacheDataSet.
+
+        Args:
+            dataset: A Kedro DataSet object or a dictionary to wrap.
+            version: If specified, should be an instance of
+                ``kedro.io.core.Version``, and the wrapped dataset is versioned.
+            copy_mode: How the cached data is copied before being returned,
+                one of "deepcopy", "copy" and "assign". If not provided, it is
+                inferred based on the data type. "assign" is only safe if no
+                node modifies its input in place.
+
+        Raises:
+            ValueError: If the provided dataset is not a valid dict/YAML
+                representation of a dataset or an actual dataset.
+        """
+        if isinstance(dataset, dict):
+            if VERSIONED_FLAG_KEY in dataset:
+                raise ValueError(
+                    "Read-through cached datasets should specify that they are "
+                    "versioned in the wrapper, not in the wrapped dataset."
+                )
+            if version:
+                dataset = {**dataset, VERSIONED_FLAG_KEY: True}
+                self._dataset = AbstractDataSet.from_config(
+                    "_read_through", dataset, version.load, version.save
+                )
+            else:
+                self._dataset = AbstractDataSet.from_config("_read_through", dataset)
+        elif isinstance(dataset, AbstractDataSet):
+            self._dataset = dataset
+        else:
+            raise ValueError(
+                "The argument type of `dataset` should be either a dict/YAML "
+                "representation of the dataset, or the actual dataset object."
+            )
+        self._copy_mode = copy_mode
+
+    @property
+    def _key(self) -> str:
+        return str(self._dataset)
+
+    @property
+    def _name(self) -> str:
+        return str(self._dataset._describe().get("filepath", type(self._dataset)))
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"dataset": self._dataset._describe(), "copy_mode": self._copy_mode}
+
+    def _load(self) -> Any:
+        key = self._key
+        with RUN_CACHE.key_lock(key):
+            found, data = RUN_CACHE.get(key, self._name)
+            if not found:
+                data = self._dataset.load()
+                RUN_CACHE.put(key, self._name, data)
+            else:
+                logging.getLogger(__name__).debug("Served %s from memory", self._name)
+        return _copy_with_mode(data, self._copy_mode or _infer_copy_mode(data))
+
+    def _save(self, data: Any) -> None:
+        RUN_CACHE.discard(self._key)
+        self._dataset.save(data)
+
+    def _exists(self) -> bool:
+        return self._dataset.exists()
+
+    def _release(self) -> None:
+        # The cached copy is kept, it is bounded and only lives until the run ends
+        super()._release()
+        self._dataset.release()
@@ -0,0 +1,161 @@
+import os
+import uuid
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+from kedro.io.core import AbstractDataSet, DataSetError
+
+_SERIES_KEY = b"modular_spaceflights.series"
+
+
+class _SharedMemory(SharedMemory):
+    """Zero-copy views keep the underlying buffer exported, in which case the
+    block is unmapped once the last view is garbage collected instead."""
+
+    def close(self) -> None:
+        try:
+            super().close()
+        except BufferError:
+            pass
+
+
+class SharedMemoryDataSet(AbstractDataSet):
+    """``SharedMemoryDataSet`` keeps a numeric pandas DataFrame or Series in a
+    named block of POSIX shared memory, laid out as Arrow buffers.
+
+    Loading maps the block and returns a DataFrame whose columns are zero-copy
+    views onto it, rather than a private copy as ``MemoryDataSet`` does. The
+    block is addressed by name, so a pickled instance can load the data in any
+    process on the same host, which makes it safe to use with the
+    ``ParallelRunner`` without multiplying memory use by the number of workers.
+
+    The block is removed when the dataset is released, which the runners do
+    once no remaining node needs it. Processes which only map the block drop
+    it from the ``multiprocessing`` resource tracker, so that the block is not
+    removed, nor reported as leaked, when one of those processes exits.
+
+    Example:
+    ::
+
+        >>> SharedMemoryDataSet().save(pd.DataFrame({'a': [1.0, 2.0]}))
+    """
+
+    def __init__(self, name: str = None):
+        """Creates a new instance of SharedMemoryDataSet.
+
+        Args:
+            name: The name of the shared memory block, unique per host.
+                A random one is generated if not provided.
+        """
+        self._name = name or f"kedro_{uuid.uuid4().hex[:16]}"
+        self._handle = None  # type: Optional[SharedMemory]
+        self._created = False
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Handles are only valid in the process which opened them
+        return {"_name": self._name}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._handle = None
+        self._created = False
+
+    def _attach(self) -> SharedMemory:
+        """Maps the block once per process, reusing the handle afterwards"""
+        if self._handle is None:
+            handle = _SharedMemory(name=self._name)
+            # Python < 3.13 registers every block a process opens, so the
+            # tracker would otherwise remove it when this process exits
+            if os.name == "posix" and not self._created:
+                resource_tracker.unregister(handle._name, "shared_memory")
+            self._handle = handle
+        return self._handle
+
+    def _describe(self) -> Dict[str, Any]:
+        """Returns a dict that describes the attributes of the dataset."""
+        return dict(name=self._name)
+
+    def _load(self) -> Union[pd.DataFrame, pd.Series]:
+        """Maps the shared memory block.
+
+        Returns:
+            A DataFrame or Series, with numeric columns that contain no nulls
+            being views onto the shared memory block.
+        """
+        try:
+            handle = self._attach()
+        except FileNotFoundError as exc:
+            raise DataSetError(
+                f"Shared memory block '{self._name}' does not exist, "
+                f"it must be saved before it can be loaded"
+            ) from exc
+
+        table = pa.ipc.open_stream(pa.py_buffer(handle.buf)).read_all()
+        data = table.to_pandas(split_blocks=True)
+        metadata = table.schema.metadata or {}
+        if _SERIES_KEY in metadata:
+            data = data.iloc[:, 0]
+            if metadata[_SERIES_KEY] == b"unnamed":
+                data.name = None
+        return data
+
+    def _save(self, data: Union[pd.DataFrame, pd.Series]) -> None:
+        """Copies the data into a new shared memory block, replacing any
+        block previously saved by this dataset."""
+        frame = data.to_frame() if isinstance(data, pd.Series) else data
+        non_numeric = [
+            str(column)
+            for column, dtype in frame.dtypes.items()
+            if not pd.api.types.is_numeric_dtype(dtype)
+        ]
+        if non_numeric:
+            raise DataSetError(
+                f"{self.__class__.__name__} only supports numeric columns, "
+                f"got non-numeric columns {non_numeric}"
+            )
+
+        table = pa.Table.from_pandas(frame)
+        if isinstance(data, pd.Series):
+            table = table.replace_schema_metadata(
+                {
+                    **(table.schema.metadata or {}),
+                    _SERIES_KEY: b"named" if data.name is not None else b"unnamed",
+                }
+            )
+
+        sink = pa.MockOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        self._release()
+        handle = _SharedMemory(name=self._name, create=True, size=sink.size())
+        buffer = pa.py_buffer(handle.buf)
+        with pa.ipc.new_stream(pa.FixedSizeBufferWriter(buffer), table.schema) as w:
+            w.write_table(table)
+        del buffer
+        self._handle = handle
+        self._created = True
+
+    def _exists(self) -> bool:
+        try:
+            self._attach()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _release(self) -> None:
+        """Removes the shared memory block. Views which are still in use stay
+        valid until they are garbage collected."""
+        super()._release()
+        try:
+            # Opening the block registers it again, which unlinking undoes
+            _SharedMemory(name=self._name).unlink()
+        except FileNotFoundError:
+            pass
+        if self._handle is not None:
+            self._handle.close()
+        self._handle = None
+        self._created = False
@@ -1,21 +1,48 @@
 """Project hooks."""
+import csv
+import json
 import logging
+import os
+import shutil
+import sys
+import threading
 import time
-from typing import Any, Dict, Iterable, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
+import pandas as pd
 from kedro.config import TemplatedConfigLoader
 from kedro.framework.hooks import hook_impl
-from kedro.io import DataCatalog
+from kedro.framework.project import settings
+from kedro.io import AbstractDataSet, DataCatalog
+from kedro.pipeline.node import Node
 from kedro.versioning import Journal
 
+from modular_spaceflights.config_loader import CachedTemplatedConfigLoader
+from modular_spaceflights.extras.datasets.read_through_cache_dataset import RUN_CACHE
+from modular_spaceflights.pipelines.feature_engineering.nodes import source_columns
+from modular_spaceflights.remote_io import share_filesystems
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 
 class ProjectHooks:
     @hook_impl
     def register_config_loader(
         self, conf_paths: Iterable[str], env: str, extra_params: Dict[str, Any]
     ) -> TemplatedConfigLoader:
-        return TemplatedConfigLoader(
-            conf_paths, globals_pattern="*globals.yml", globals_dict={}
+        # Each of `conf_paths` is `<project_path>/<CONF_ROOT>/<env>`
+        conf_depth = len(Path(settings.CONF_ROOT).parts)
+        project_path = Path(list(conf_paths)[0]).parents[conf_depth]
+        return CachedTemplatedConfigLoader(
+            conf_paths,
+            globals_pattern="*globals.yml",
+            globals_dict={},
+            project_path=project_path,
         )
 
     @hook_impl
@@ -41,23 +68,19 @@ class TimingHooks:
 
     def __init__(self) -> None:
         """This constructor is used to hold state between different parts
-        of the dataset loading lifecycle
+        of the dataset loading lifecycle. Loads are keyed by thread as well as
+        dataset, so that concurrent loads do not overwrite each other
         """
-        self._load_start = 0
-        self._load_end = 0
+        self._load_starts = {}  # type: Dict[Tuple[int, str], float]
 
-    def _start_timing(self):
+    def _start_timing(self, dataset_name: str) -> None:
         """Set time operation starts"""
-        self._load_start = time.time()
-
-    def _stop_timing(self):
-        """Set time operation ends"""
-        self._load_end = time.time()
+        self._load_starts[(threading.get_ident(), dataset_name)] = time.perf_counter()
 
-    @property
-    def current_duration(self) -> float:
-        """Get the delta between the two timestamps"""
-        return self._load_end - self._load_start
+    def _stop_timing(self, dataset_name: str) -> float:
+        """Get the time elapsed since the operation started"""
+        start = self._load_starts.pop((threading.get_ident(), dataset_name))
+        return time.perf_counter() - start
 
     @property
     def _logger(self):
@@ -67,13 +90,13 @@ class TimingHooks:
     @hook_impl
     def before_dataset_loaded(self, dataset_name: str) -> None:
         """Start timing when dataset starts loading"""
-        self._start_timing()
+        self._start_timing(dataset_name)
 
     @hook_impl
     def after_dataset_loaded(self, dataset_name: str, data: Any) -> None:
         """Stop timing once in memory and report duration"""
-        self._stop_timing()
-        message = self._humanise_duration(self.current_duration)
+        duration = self._stop_timing(dataset_name)
+        message = self._humanise_duration(duration)
         self._logger.info("Dataset '%s' took %s to load ⏳", dataset_name, message)
 
     @staticmethod
@@ -85,5 +108,320 @@ class TimingHooks:
         elif duration > 1 and duration < 60:
             message = f"{duration} seconds"
         else:
-            message = f"{round(duration/60)} seconds"
+            message = f"{round(duration/60)} minutes"
         return message
+
+
+def _measure_data(data: Any) -> Tuple[Optional[int], Optional[int]]:
+    """Counts the rows and in-memory bytes of DataFrames, Series and numpy
+    arrays. Object columns are counted as pointers, as inspecting every Python
+    object would cost more than the operation being profiled"""
+    if isinstance(data, pd.DataFrame):
+        return len(data), int(data.memory_usage(index=True, deep=False).sum())
+    if isinstance(data, pd.Series):
+        return len(data), int(data.memory_usage(index=True, deep=False))
+    if isinstance(data, np.ndarray):
+        return (len(data) if data.ndim else 1), int(data.nbytes)
+    return None, None
+
+
+def _sum_measures(values: Iterable[Any]) -> Tuple[Optional[int], Optional[int]]:
+    measures = [m for m in map(_measure_data, values) if m[0] is not None]
+    if not measures:
+        return None, None
+    return sum(m[0] for m in measures), sum(m[1] for m in measures)
+
+
+def _peak_rss() -> Optional[int]:
+    """The peak resident set size of this process so far, in bytes"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ProfilingHooks:
+    """
+    This class profiles every node run, dataset load and dataset save,
+    recording the wall time, the CPU time of the running thread, how much the
+    peak RSS of the process grew and the number of rows and bytes involved.
+
+    Measurements are keyed by thread, so that they are safe under the
+    ``ThreadRunner``. Node and dataset hooks which run in a worker process,
+    as with the ``ParallelRunner``, spool their records to a file per process
+    which the main process collects at the end of the run. The report is then
+    written to ``profile.json`` and ``profile.csv`` within ``report_dir``.
+
+    Peak RSS is tracked per process, so it is only attributable to a single
+    node or dataset when nothing else runs concurrently in the same process.
+    """
+
+    REPORT_FIELDS = [
+        "kind",
+        "name",
+        "operation",
+        "pid",
+        "thread",
+        "started_at",
+        "wall_seconds",
+        "cpu_seconds",
+        "peak_rss_delta_bytes",
+        "rows",
+        "bytes",
+    ]
+
+    def __init__(self, report_dir: str = "data/08_reporting/profiling") -> None:
+        """This constructor holds the measurements in progress and the records
+        of those which have completed
+
+        Args:
+            report_dir: Where to write the report, relative to the project root
+        """
+        self._report_dir = Path(report_dir)
+        self._lock = threading.Lock()
+        self._starts = {}  # type: Dict[Tuple[int, str, str], Dict[str, Any]]
+        self._records = []  # type: List[Dict[str, Any]]
+        self._run_pid = None  # type: Optional[int]
+
+    @property
+    def _logger(self):
+        """Utility property to get a named logger"""
+        return logging.getLogger(self.__class__.__name__)
+
+    def _spool_dir(self, run_pid: int) -> Path:
+        return self._report_dir / f".spool-{run_pid}"
+
+    def _start(self, operation: str, name: str) -> None:
+        key = (threading.get_ident(), operation, name)
+        start = {
+            "started_at": time.time(),
+            "wall": time.perf_counter(),
+            "cpu": time.thread_time(),
+            "peak_rss": _peak_rss(),
+        }
+        with self._lock:
+            self._starts[key] = start
+
+    def _stop(
+        self, kind: str, operation: str, name: str, measure: Tuple[Any, Any]
+    ) -> None:
+        wall, cpu, peak_rss = time.perf_counter(), time.thread_time(), _peak_rss()
+        with self._lock:
+            start = self._starts.pop((threading.get_ident(), operation, name), None)
+        if start is None:
+            return
+
+        record = {
+            "kind": kind,
+            "name": name,
+            "operation": operation,
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+            "started_at": start["started_at"],
+            "wall_seconds": wall - start["wall"],
+            "cpu_seconds": cpu - start["cpu"],
+            "peak_rss_delta_bytes": (
+                None if peak_rss is None else peak_rss - start["peak_rss"]
+            ),
+            "rows": measure[0],
+            "bytes": measure[1],
+        }
+        if self._run_pid == os.getpid():
+            with self._lock:
+                self._records.append(record)
+            return
+
+        # A worker process, whose hooks cannot share memory with the main one
+        spool_dir = self._spool_dir(os.getppid())
+        spool_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(spool_dir / f"{os.getpid()}.jsonl", "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    @hook_impl
+    def before_pipeline_run(self) -> None:
+        """Reset the records and note which process is running the pipeline"""
+        self._run_pid = os.getpid()
+        with self._lock:
+            self._starts.clear()
+            self._records = []
+        shutil.rmtree(self._spool_dir(self._run_pid), ignore_errors=True)
+
+    @hook_impl
+    def before_node_run(self, node: Node) -> None:
+        """Start measuring the node function"""
+        self._start("run", node.name)
+
+    @hook_impl
+    def after_node_run(self, node: Node, outputs: Dict[str, Any]) -> None:
+        """Record the node function, counting the rows and bytes it output"""
+        self._stop("node", "run", node.name, _sum_measures(outputs.values()))
+
+    @hook_impl
+    def before_dataset_loaded(self, dataset_name: str) -> None:
+        """Start measuring the load"""
+        self._start("load", dataset_name)
+
+    @hook_impl
+    def after_dataset_loaded(self, dataset_name: str, data: Any) -> None:
+        """Record the load, counting the rows and bytes loaded"""
+        self._stop("dataset", "load", dataset_name, _measure_data(data))
+
+    @hook_impl
+    def before_dataset_saved(self, dataset_name: str) -> None:
+        """Start measuring the save"""
+        self._start("save", dataset_name)
+
+    @hook_impl
+    def after_dataset_saved(self, dataset_name: str, data: Any) -> None:
+        """Record the save, counting the rows and bytes saved"""
+        self._stop("dataset", "save", dataset_name, _measure_data(data))
+
+    @hook_impl
+    def after_pipeline_run(self, run_params: Dict[str, Any]) -> None:
+        """Write the report once the run has completed"""
+        self._write_report(run_params)
+
+    @hook_impl
+    def on_pipeline_error(self, run_params: Dict[str, Any]) -> None:
+        """Write the report for as much of the run as completed"""
+        self._write_report(run_params)
+
+    def _collect_records(self) -> List[Dict[str, Any]]:
+        records = list(self._records)
+        spool_dir = self._spool_dir(os.getpid())
+        for spool_file in sorted(spool_dir.glob("*.jsonl")):
+            with open(spool_file) as f:
+                records.extend(json.loads(line) for line in f)
+        shutil.rmtree(spool_dir, ignore_errors=True)
+        return sorted(records, key=lambda record: record["started_at"])
+
+    def _write_report(self, run_params: Dict[str, Any]) -> None:
+        records = self._collect_records()
+        self._report_dir.mkdir(parents=True, exist_ok=True)
+
+        report = {"run_id": run_params.get("run_id"), "records": records}
+        with open(self._report_dir / "profile.json", "w") as f:
+            json.dump(report, f, indent=2)
+        with open(self._report_dir / "profile.csv", "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+
+        self._logger.info(
+            "Profiled %d operations, report written to '%s' 📊",
+            len(records),
+            self._report_dir,
+        )
+
+
+class ReadThroughCacheHooks:
+    """
+    This class scopes the cache shared by every ``ReadThroughCacheDataSet`` to
+    a single run, and reports how many loads of each cached dataset were
+    served from memory rather than from storage.
+    """
+
+    def __init__(self, max_bytes: int = 2 ** 30) -> None:
+        """Bound the total size of the data cached during a run"""
+        RUN_CACHE.max_bytes = max_bytes
+
+    @property
+    def _logger(self):
+        """Utility property to get a named logger"""
+        return logging.getLogger(self.__class__.__name__)
+
+    @hook_impl
+    def before_pipeline_run(self) -> None:
+        """Start the run with an empty cache"""
+        RUN_CACHE.clear()
+
+    @hook_impl
+    def after_pipeline_run(self) -> None:
+        """Free the cache and report its counters"""
+        self._report()
+
+    @hook_impl
+    def on_pipeline_error(self) -> None:
+        """Free the cache and report its counters for the failed run"""
+        self._report()
+
+    def _report(self) -> None:
+        for name, counts in sorted(RUN_CACHE.clear().items()):
+            self._logger.info(
+                "Read-through cache for '%s': %d hits, %d misses, %d evictions, "
+                "%.1f MB loaded",
+                name,
+                counts["hits"],
+                counts["misses"],
+                counts["evictions"],
+                counts["loaded_bytes"] / 2 ** 20,
+            )
+
+
+class RemoteIOHooks:
+    """
+    This class makes every remote dataset in the catalog share one pooled
+    file system client per protocol and set of options, including the
+    datasets Kedro provides, rather than each holding its own.
+    """
+
+    @property
+    def _logger(self):
+        """Utility property to get a named logger"""
+        return logging.getLogger(self.__class__.__name__)
+
+    @hook_impl
+    def after_catalog_created(self, catalog: DataCatalog) -> None:
+        """Swap the pooled file system into every remote dataset"""
+        shared = share_filesystems(catalog)
+        if shared:
+            self._logger.info("%d remote datasets share pooled clients", shared)
+
+
+class FeatureProjectionHooks:
+    """
+    This class sets the columns loaded by each projection of the primary
+    table to those its features are created from, as listed in the
+    `feature` parameters, so that the catalog never has to repeat them.
+    """
+
+    def __init__(self, projections: Dict[str, Tuple[str, ...]] = None) -> None:
+        """Map each projected dataset to the groups of `feature` it serves"""
+        self._projections = projections or {
+            "prm_shuttle_company_reviews@static_features": ("static",),
+            "prm_shuttle_company_reviews@derived_features": ("derived",),
+            "prm_shuttle_company_reviews@row_groups": ("static", "derived"),
+        }
+
+    @hook_impl(tryfirst=True)
+    def after_catalog_created(
+        self,
+        catalog: DataCatalog,
+        conf_catalog: Dict[str, Any],
+        conf_creds: Dict[str, Any],
+        feed_dict: Dict[str, Any],
+        save_version: str,
+        load_versions: Dict[str, str],
+    ) -> None:
+        """Recreate each projection with the columns the features need"""
+        feature_params = feed_dict.get("params:feature")
+        if feature_params is None:
+            return
+        for name, groups in self._projections.items():
+            if name not in conf_catalog:
+                continue
+            config = dict(conf_catalog[name])
+            config.pop("layer", None)  # kept by the catalog, not the dataset
+            if isinstance(config.get("credentials"), str):
+                config["credentials"] = conf_creds[config["credentials"]]
+            config["load_args"] = dict(
+                config.get("load_args") or {},
+                columns=source_columns({g: feature_params[g] for g in groups}),
+            )
+            catalog.add(
+                name,
+                AbstractDataSet.from_config(
+                    name, config, (load_versions or {}).get(name), save_version
+                ),
+                replace=True,
+            )
@@ -0,0 +1,388 @@
+"""Content-hash based incremental execution.
+
+Every node is given a fingerprint built from the source code of its function
+and of every function and class of the project it refers to, the values of its
+parameters and the fingerprints of its inputs. The fingerprint of a dataset
+produced within the pipeline is the fingerprint of the node that produced it.
+A dataset read from outside the pipeline carries the fingerprint stored when
+it was last produced, so that a node has the same fingerprint whichever
+registered pipeline it is run in, and files which no node produces, such as
+the raw data, are fingerprinted from their metadata. A change anywhere
+upstream therefore changes the fingerprint of every node downstream of it, and
+nothing else.
+
+The ``IncrementalRunner`` below stores the fingerprint next to each persisted
+output as soon as it is saved, together with the size and modification time of
+the output, and skips any node whose persisted outputs all carry its current
+fingerprint and are unchanged since. Other runners neither read nor write
+fingerprints, so an output they overwrite no longer matches its stored
+metadata, and is treated as changed by the next incremental run:
+::
+
+    kedro run --runner=modular_spaceflights.incremental.IncrementalRunner
+"""
+import hashlib
+import inspect
+import json
+import logging
+from types import FunctionType, ModuleType
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import fsspec
+from kedro.config import MissingConfigException
+from kedro.framework.hooks import get_hook_manager, hook_impl
+from kedro.io import DataCatalog
+from kedro.io.core import get_protocol_and_path
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+from kedro.runner import SequentialRunner
+
+from modular_spaceflights.remote_io import get_filesystem
+
+FINGERPRINT_SUFFIX = ".fingerprint"
+
+
+def _hash(payload: Any) -> str:
+    serialised = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(serialised.encode("utf-8")).hexdigest()
+
+
+def _is_parameter(data_set_name: str) -> bool:
+    return data_set_name == "parameters" or data_set_name.startswith("params:")
+
+
+def _base_name(data_set_name: str) -> str:
+    """Transcoded names (`name@projection`) all share the data of `name`"""
+    return data_set_name.split("@")[0]
+
+
+def _referenced_names(code: Any) -> Iterator[str]:
+    """The global and attribute names used by a code object and the functions,
+    lambdas and comprehensions nested within it"""
+    yield from code.co_names
+    for constant in code.co_consts:
+        if inspect.iscode(constant):
+            yield from _referenced_names(constant)
+
+
+def _members(obj: Any) -> Iterator[Any]:
+    if isinstance(obj, FunctionType):
+        names = set(_referenced_names(obj.__code__))
+        for name in names:
+            member = obj.__globals__.get(name)
+            if isinstance(member, ModuleType):
+                # e.g. `nodes.joiner`, the attribute is referenced by name too
+                yield from (getattr(member, n, None) for n in names)
+            else:
+                yield member
+    elif inspect.isclass(obj):
+        for attribute in vars(obj).values():
+            yield getattr(attribute, "__func__", attribute)
+
+
+def _dependencies(func: Any) -> List[Any]:
+    """The function plus every function and class of the same top-level
+    package which it refers to, directly or through one another"""
+    func = inspect.unwrap(getattr(func, "func", func))
+    package = (getattr(func, "__module__", None) or "").split(".")[0]
+    found, stack = [], [func]
+    while stack:
+        obj = stack.pop()
+        if any(obj is seen for seen in found):
+            continue
+        found.append(obj)
+        for member in _members(obj):
+            module = getattr(member, "__module__", None) or ""
+            is_code = isinstance(member, FunctionType) or inspect.isclass(member)
+            if is_code and package and module.split(".")[0] == package:
+                stack.append(member)
+    return found
+
+
+def _source_code(node: Node) -> str:
+    sources = []
+    for obj in _dependencies(node.func):
+        try:
+            source = inspect.getsource(obj)
+        except (OSError, TypeError):
+            source = repr(obj)
+        name = f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', '')}"
+        sources.append((name, source))
+    return "\n".join(source for _, source in sorted(sources))
+
+
+def _file_metadata(
+    fs: fsspec.AbstractFileSystem, path: str
+) -> Optional[Dict[str, Any]]:
+    if not fs.exists(path):
+        return None
+    info = fs.info(path)
+    modified = info.get("mtime") or info.get("LastModified") or info.get("updated")
+    return {"size": info.get("size"), "modified": str(modified)}
+
+
+class FingerprintStore:
+    """Reads and writes the fingerprint stored next to each persisted dataset.
+    Datasets are located from the catalog configuration, so any entry with a
+    ``filepath``, or wrapping a ``dataset`` with one, is persisted.
+    """
+
+    def __init__(
+        self, catalog_config: Dict[str, Any], credentials: Dict[str, Any] = None
+    ):
+        """Creates a new instance of FingerprintStore.
+
+        Args:
+            catalog_config: The catalog configuration, by dataset name.
+            credentials: The credentials configuration, by name.
+        """
+        self._catalog_config = catalog_config
+        self._credentials = credentials or {}
+
+    def locate(
+        self, data_set_name: str
+    ) -> Optional[Tuple[fsspec.AbstractFileSystem, str]]:
+        """The file system and path of a persisted dataset, if it is one"""
+        config = self._catalog_config.get(data_set_name)
+        while isinstance(config, dict) and "filepath" not in config:
+            config = config.get("dataset")
+        if not isinstance(config, dict):
+            return None
+
+        credentials = config.get("credentials")
+        if isinstance(credentials, str):
+            credentials = self._credentials.get(credentials)
+        fs_args = {
+            key: value
+            for key, value in (config.get("fs_args") or {}).items()
+            if not key.startswith("open_args_")
+        }
+        protocol, path = get_protocol_and_path(config["filepath"])
+        return get_filesystem(protocol, credentials, fs_args), path.rstrip("/")
+
+    def metadata(self, data_set_name: str) -> Optional[Dict[str, Any]]:
+        """The path, size and modification time of a persisted dataset, or
+        None if it is not persisted or does not exist"""
+        location = self.locate(data_set_name)
+        if location is None:
+            return None
+        fs, path = location
+        metadata = _file_metadata(fs, path)
+        return metadata and {"filepath": path, **metadata}
+
+    def read(self, data_set_name: str) -> Optional[str]:
+        """The fingerprint stored alongside a persisted dataset, or None if
+        there is none or the dataset changed since it was stored"""
+        location = self.locate(data_set_name)
+        if location is None:
+            return None
+        fs, path = location
+        sidecar = path + FINGERPRINT_SUFFIX
+        if not fs.exists(sidecar):
+            return None
+        try:
+            with fs.open(sidecar, mode="r") as f:
+                stored = json.load(f)
+        except ValueError:  # written by an earlier version, or truncated
+            return None
+        if stored.get("metadata") != _file_metadata(fs, path):
+            return None
+        return stored.get("fingerprint")
+
+    def write(self, data_set_name: str, fingerprint: str) -> None:
+        """Stores a fingerprint alongside a persisted dataset, with its
+        current metadata. Datasets which are not persisted are ignored."""
+        location = self.locate(data_set_name)
+        if location is None:
+            return
+        fs, path = location
+        stored = {"fingerprint": fingerprint, "metadata": _file_metadata(fs, path)}
+        with fs.open(path + FINGERPRINT_SUFFIX, mode="w") as f:
+            json.dump(stored, f)
+
+
+def _external_fingerprint(
+    catalog: DataCatalog, store: FingerprintStore, data_set_name: str
+) -> str:
+    """Fingerprints a dataset which is not produced by the pipeline being run.
+    Parameters are hashed by value, datasets produced by an earlier run carry
+    the fingerprint stored then, and other files are hashed by metadata."""
+    if _is_parameter(data_set_name):
+        return _hash(catalog.load(data_set_name))
+    stored = store.read(data_set_name)
+    if stored is not None:
+        return stored
+    return _hash(store.metadata(data_set_name) or data_set_name)
+
+
+def fingerprint_nodes(
+    pipeline: Pipeline, catalog: DataCatalog, store: FingerprintStore
+) -> Dict[str, str]:
+    """Computes the fingerprint of every node in the pipeline without running
+    any of them.
+
+    Args:
+        pipeline: The pipeline to fingerprint.
+        catalog: The catalog the pipeline will be run against.
+        store: The fingerprints stored by earlier runs.
+
+    Returns:
+        A mapping of node name to fingerprint.
+    """
+    data_set_fingerprints = {}  # type: Dict[str, str]
+    node_fingerprints = {}
+    for node in pipeline.nodes:  # topologically sorted
+        inputs = {}
+        for data_set_name in node.inputs:
+            base_name = _base_name(data_set_name)
+            if base_name not in data_set_fingerprints:
+                data_set_fingerprints[base_name] = _external_fingerprint(
+                    catalog, store, data_set_name
+                )
+            inputs[data_set_name] = data_set_fingerprints[base_name]
+
+        fingerprint = _hash(
+            {"name": node.name, "source": _source_code(node), "inputs": inputs}
+        )
+        node_fingerprints[node.name] = fingerprint
+        for data_set_name in node.outputs:
+            data_set_fingerprints[_base_name(data_set_name)] = fingerprint
+    return node_fingerprints
+
+
+class _FingerprintRecorder:
+    """Stores the fingerprint of the node which produced each persisted output
+    as soon as it is saved, so that the nodes which completed before a failure
+    are skipped by the next run"""
+
+    def __init__(self, fingerprints: Dict[str, str], store: FingerprintStore):
+        self._fingerprints = fingerprints
+        self._store = store
+
+    @hook_impl
+    def after_dataset_saved(self, dataset_name: str) -> None:
+        fingerprint = self._fingerprints.get(dataset_name)
+        if fingerprint is not None:
+            self._store.write(dataset_name, fingerprint)
+
+
+def _project_catalog_config() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    from kedro.framework.session import get_current_session
+
+    session = get_current_session(silent=True)
+    if session is None:
+        raise RuntimeError(
+            "IncrementalRunner needs the catalog configuration, either from an "
+            "active KedroSession or as `catalog_config`"
+        )
+    config_loader = session.load_context().config_loader
+    catalog_config = config_loader.get("catalog*", "catalog*/**", "**/catalog*")
+    try:
+        credentials = config_loader.get(
+            "credentials*", "credentials*/**", "**/credentials*"
+        )
+    except MissingConfigException:
+        credentials = {}
+    return catalog_config, credentials
+
+
+class IncrementalRunner(SequentialRunner):
+    """``IncrementalRunner`` runs a pipeline sequentially, but only the nodes
+    whose fingerprint differs from the one stored next to their persisted
+    outputs, plus any nodes needed to recreate the in-memory inputs of those.
+    """
+
+    def __init__(
+        self,
+        is_async: bool = False,
+        catalog_config: Dict[str, Any] = None,
+        credentials: Dict[str, Any] = None,
+    ):
+        """Creates a new instance of IncrementalRunner.
+
+        Args:
+            is_async: If True, node inputs and outputs are loaded and saved
+                asynchronously with threads.
+            catalog_config: The catalog configuration the datasets were created
+                from, used to locate their files. Read from the active
+                ``KedroSession`` if not given.
+            credentials: The credentials configuration, by name.
+        """
+        super().__init__(is_async=is_async)
+        self._catalog_config = catalog_config
+        self._credentials = credentials
+
+    def run(
+        self, pipeline: Pipeline, catalog: DataCatalog, run_id: str = None
+    ) -> Dict[str, Any]:
+        """Runs only the stale part of the ``Pipeline``.
+
+        Args:
+            pipeline: The ``Pipeline`` to run.
+            catalog: The ``DataCatalog`` from which to fetch data.
+            run_id: The id of the run.
+
+        Returns:
+            Any node outputs that cannot be processed by the ``DataCatalog``.
+        """
+        if self._catalog_config is None:
+            self._catalog_config, self._credentials = _project_catalog_config()
+        store = FingerprintStore(self._catalog_config, self._credentials)
+        fingerprints = fingerprint_nodes(pipeline, catalog, store)
+        stale_nodes = self._find_stale_nodes(pipeline, store, fingerprints)
+        to_rerun = Pipeline([n for n in pipeline.nodes if n.name in stale_nodes])
+
+        skipped = len(pipeline.nodes) - len(to_rerun.nodes)
+        self._logger.info(
+            "Skipping %d out of %d nodes with unchanged fingerprints",
+            skipped,
+            len(pipeline.nodes),
+        )
+
+        recorder = _FingerprintRecorder(
+            {out: fingerprints[n.name] for n in to_rerun.nodes for out in n.outputs},
+            store,
+        )
+        hook_manager = get_hook_manager()
+        hook_manager.register(recorder)
+        try:
+            return super().run(to_rerun, catalog, run_id)
+        finally:
+            hook_manager.unregister(recorder)
+
+    @staticmethod
+    def _find_stale_nodes(
+        pipeline: Pipeline, store: FingerprintStore, fingerprints: Dict[str, str]
+    ) -> Set[str]:
+        consumed = {data_set for node in pipeline.nodes for data_set in node.inputs}
+        producers = {out: node for node in pipeline.nodes for out in node.outputs}
+        logger = logging.getLogger(__name__)
+
+        stale = set()
+        for node in pipeline.nodes:
+            for data_set_name in node.outputs:
+                if store.locate(data_set_name) is not None:
+                    is_stale = store.read(data_set_name) != fingerprints[node.name]
+                else:
+                    # An in-memory output which no node consumes is a result of
+                    # the run itself, so its node always runs. Consumed ones are
+                    # only recreated for stale nodes, below
+                    is_stale = data_set_name not in consumed
+                if is_stale:
+                    logger.info(
+                        "Dataset '%s' is stale, node '%s' will run",
+                        data_set_name,
+                        node.name,
+                    )
+                    stale.add(node.name)
+
+        # Any in-memory inputs of stale nodes have to be recreated as well,
+        # walking backwards so that chains of in-memory datasets are followed
+        for node in reversed(pipeline.nodes):
+            if node.name not in stale:
+                continue
+            for data_set_name in node.inputs:
+                producer = producers.get(data_set_name)
+                if producer and store.locate(data_set_name) is None:
+                    stale.add(producer.name)
+        return stale
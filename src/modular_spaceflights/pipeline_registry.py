@@ -1,46 +1,137 @@
-"""Project pipelines."""
-from typing import Dict
+"""Project pipelines.
+
+Each pipeline package is only imported, and each pipeline only constructed, the
+first time that pipeline is requested. Running ``kedro run --pipeline "Data
+ingestion"`` therefore never imports the modelling or reporting packages, nor
+the libraries their nodes depend on.
+"""
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, MutableMapping
 
 from kedro.pipeline import Pipeline
 from kedro.pipeline.modular_pipeline import pipeline
 
-from modular_spaceflights.pipelines import data_ingestion as di
-from modular_spaceflights.pipelines import feature_engineering as fe
-from modular_spaceflights.pipelines import modelling as mod
-from modular_spaceflights.pipelines import reporting as rep
 
+class _LazyPipelines(MutableMapping):
+    """A dictionary of pipelines, holding a factory for each name which is
+    only called the first time that name is looked up."""
 
-def register_pipelines() -> Dict[str, Pipeline]:
-    """Register the project's pipelines.
+    def __init__(self, factories: Dict[str, Callable[[], Pipeline]]):
+        self._factories = dict(factories)
 
-    Returns:
-        A mapping from a pipeline name to a ``Pipeline`` object.
+    def __getitem__(self, name: str) -> Pipeline:
+        return self._factories[name]()
 
-    """
-    ingestion_pipeline = di.new_ingestion_pipeline(namespace="data_ingestion")
+    def __setitem__(self, name: str, value: Pipeline) -> None:
+        self._factories[name] = lambda: value
+
+    def __delitem__(self, name: str) -> None:
+        del self._factories[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({sorted(self._factories)})"
+
+
+@lru_cache(maxsize=None)
+def _ingestion_pipeline() -> Pipeline:
+    from modular_spaceflights.pipelines import data_ingestion as di
+
+    return di.new_ingestion_pipeline(namespace="data_ingestion")
+
+
+@lru_cache(maxsize=None)
+def _partitioned_ingestion_pipeline() -> Pipeline:
+    from modular_spaceflights.pipelines import data_ingestion as di
+
+    return di.new_ingestion_pipeline(namespace="data_ingestion", partitioned=True)
+
+
+@lru_cache(maxsize=None)
+def _streaming_ingestion_pipeline() -> Pipeline:
+    from modular_spaceflights.pipelines import data_ingestion as di
+
+    return di.new_streaming_ingestion_pipeline(namespace="data_ingestion")
+
+
+@lru_cache(maxsize=None)
+def _feature_pipeline() -> Pipeline:
+    from modular_spaceflights.pipelines import feature_engineering as fe
+
+    return fe.new_feature_pipeline()
 
-    feature_pipeline = fe.new_feature_pipeline()
 
-    modelling_pipeline = mod.new_modeling_pipeline(
-        model_types=["linear_regression", "random_forest"]
+@lru_cache(maxsize=None)
+def _modelling_pipeline() -> Pipeline:
+    from modular_spaceflights.pipelines import modelling as mod
+
+    return mod.new_modeling_pipeline(model_types=["linear_regression", "random_forest"])
+
+
+@lru_cache(maxsize=None)
+def _out_of_core_modelling_pipeline() -> Pipeline:
+    from modular_spaceflights.pipelines import modelling as mod
+
+    return mod.new_modeling_pipeline(
+        model_types=["linear_regression", "random_forest"], out_of_core=True
     )
 
-    reporting_pipeline = pipeline(
+
+@lru_cache(maxsize=None)
+def _search_pipeline() -> Pipeline:
+    from modular_spaceflights.pipelines import modelling as mod
+
+    return mod.new_search_pipeline(model_types=["random_forest"])
+
+
+@lru_cache(maxsize=None)
+def _scoring_pipeline() -> Pipeline:
+    from modular_spaceflights.pipelines import scoring as sc
+
+    return sc.new_scoring_pipeline(model_types=["linear_regression", "random_forest"])
+
+
+@lru_cache(maxsize=None)
+def _reporting_pipeline() -> Pipeline:
+    from modular_spaceflights.pipelines import reporting as rep
+
+    return pipeline(
         rep.create_pipeline(),
         inputs=["prm_shuttle_company_reviews"],
         namespace="reporting",
     )
 
-    return {
-        "__default__": (
-            ingestion_pipeline
-            + feature_pipeline
-            + modelling_pipeline
-            + reporting_pipeline
-        ),
-        "Data ingestion": ingestion_pipeline,
-        "Modelling stage": modelling_pipeline,
-        "Feature engineering": feature_pipeline,
-        "Reporting stage": reporting_pipeline,
-        "Pre-modelling": ingestion_pipeline + feature_pipeline,
-    }
+
+def register_pipelines() -> Dict[str, Pipeline]:
+    """Register the project's pipelines.
+
+    Returns:
+        A mapping from a pipeline name to a ``Pipeline`` object, which is
+        constructed on first access.
+
+    """
+    return _LazyPipelines(
+        {
+            "__default__": lambda: (
+                _ingestion_pipeline()
+                + _feature_pipeline()
+                + _modelling_pipeline()
+                + _reporting_pipeline()
+            ),
+            "Data ingestion": _ingestion_pipeline,
+            "Data ingestion (streaming)": _streaming_ingestion_pipeline,
+            "Data ingestion (partitioned)": _partitioned_ingestion_pipeline,
+            "Modelling stage": _modelling_pipeline,
+            "Modelling stage (out-of-core)": _out_of_core_modelling_pipeline,
+            "Hyperparameter search": _search_pipeline,
+            "Scoring": _scoring_pipeline,
+            "Feature engineering": _feature_pipeline,
+            "Reporting stage": _reporting_pipeline,
+            "Pre-modelling": lambda: _ingestion_pipeline() + _feature_pipeline(),
+        }
+    )
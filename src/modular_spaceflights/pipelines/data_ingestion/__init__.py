@@ -1,3 +1,7 @@
 """Complete Data Processing pipeline for the spaceflights tutorial"""
 
-from .pipeline import create_pipeline, new_ingestion_pipeline  # NOQA
+from .pipeline import (  # NOQA
+    create_pipeline,
+    new_ingestion_pipeline,
+    new_streaming_ingestion_pipeline,
+)
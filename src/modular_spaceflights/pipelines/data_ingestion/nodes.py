@@ -1,8 +1,14 @@
-from typing import List, Tuple
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple
 
 import numpy as np
 import pandas as pd
 
+from modular_spaceflights.pipelines.iterators import SharedPartitions, skip_empty
+
 
 def _is_true(column: pd.Series) -> pd.Series:
     return column == "t"
@@ -73,10 +79,105 @@ def apply_types_to_reviews(
     return typed_reviews.assign(review_id=lambda df: df.index + 1)
 
 
+def apply_types_to_companies_chunked(
+    companies: Iterator[pd.DataFrame],
+) -> Iterator[pd.DataFrame]:
+    """Lazily applies ``apply_types_to_companies`` to each chunk of raw data.
+
+    Args:
+        companies: Raw data, streamed in bounded-size chunks.
+    Returns:
+        An iterator of preprocessed chunks, evaluated as the output is saved.
+    """
+    return (apply_types_to_companies(chunk) for chunk in companies)
+
+
+def apply_types_to_reviews_chunked(
+    reviews: Iterator[pd.DataFrame], columns_as_floats: List[str]
+) -> Iterator[pd.DataFrame]:
+    """Lazily applies ``apply_types_to_reviews`` to each chunk of raw data.
+    The `review_id` column stays unique across chunks because the chunks
+    keep the row numbering of the source file.
+
+    Args:
+        reviews: Raw data, streamed in bounded-size chunks.
+        columns_as_floats: Which columns to cast as floats
+    Returns:
+        An iterator of preprocessed chunks, evaluated as the output is saved.
+    """
+    return (apply_types_to_reviews(chunk, columns_as_floats) for chunk in reviews)
+
+
+def _compact_float_dtype(column: pd.Series) -> str:
+    narrow = column.astype(np.float32)
+    round_trips = np.array_equal(
+        narrow.to_numpy().astype(column.dtype), column.to_numpy(), equal_nan=True
+    )
+    return "float32" if round_trips else str(column.dtype)
+
+
+def plan_dtypes(data: pd.DataFrame, max_category_ratio: float = 0.5) -> Dict[str, str]:
+    """Chooses the most compact dtype each column can be stored as without
+    losing information.
+
+    Args:
+        data: A typed table.
+        max_category_ratio: String columns with at most this many distinct
+            values per row are stored as categoricals.
+    Returns:
+        A mapping of column name to dtype name. Integers are downcast to the
+        narrowest signed width which holds their range, floats are downcast
+        to `float32` only if every value survives the round trip, and
+        booleans and high-cardinality strings are kept as they are.
+    """
+    plan = {}
+    for name, column in data.items():
+        if pd.api.types.is_bool_dtype(column):
+            dtype = str(column.dtype)
+        elif pd.api.types.is_integer_dtype(column):
+            dtype = str(pd.to_numeric(column, downcast="integer").dtype)
+        elif pd.api.types.is_float_dtype(column):
+            dtype = _compact_float_dtype(column)
+        elif pd.api.types.is_object_dtype(column) and len(column):
+            ratio = column.nunique() / len(column)
+            dtype = "category" if ratio <= max_category_ratio else str(column.dtype)
+        else:
+            dtype = str(column.dtype)
+        plan[str(name)] = dtype
+    return plan
+
+
+def optimise_dtypes(
+    data: pd.DataFrame, dtype_options: Dict[str, Any]
+) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """Converts a typed table to the compact dtypes chosen by ``plan_dtypes``.
+
+    Args:
+        data: A typed table.
+        dtype_options: Keyword arguments for ``plan_dtypes``.
+    Returns:
+        The converted table, and the dtype chosen for each column so that it
+        can be recorded alongside the table in the catalog.
+    """
+    plan = plan_dtypes(data, **dtype_options)
+    compact = data.astype(plan)
+    logging.getLogger(__name__).info(
+        "Compacted %d columns from %.1f MB to %.1f MB",
+        len(plan),
+        data.memory_usage(deep=True).sum() / 2 ** 20,
+        compact.memory_usage(deep=True).sum() / 2 ** 20,
+    )
+    return compact, plan
+
+
 def aggregate_company_data(typed_companies: pd.DataFrame) -> pd.DataFrame:
     """This function aggregates company data so that we have one
     record per company.
 
+    Only built-in reducers are used so that pandas can aggregate every group
+    in vectorised code rather than calling back into Python per group. The
+    `company_location` retained is the first non-null value in row order.
+
     Args:
         typed_companies: The typed company information
 
@@ -86,10 +187,10 @@ def aggregate_company_data(typed_companies: pd.DataFrame) -> pd.DataFrame:
 
     working_companies = typed_companies.groupby(["id"]).agg(
         {
-            "company_rating": np.mean,
-            "company_location": lambda x: list(set(x))[0],  # Take first item
-            "total_fleet_count": max,
-            "iata_approved": any,
+            "company_rating": "mean",
+            "company_location": "first",
+            "total_fleet_count": "max",
+            "iata_approved": "any",
         }
     )
     return working_companies.reset_index().rename(columns={"id": "company_id"})
@@ -116,3 +217,126 @@ def combine_shuttle_level_information(
     working_table = combined_table.dropna(how="any")
     id_columns = [x for x in working_table.columns if x.endswith("id")]
     return working_table, working_table[id_columns]
+
+
+def _hash_partition(keys: pd.Series, partitions: int) -> np.ndarray:
+    """Assigns each key to a partition, consistently across processes"""
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy() % partitions
+
+
+def _partition_positions(buckets: np.ndarray, partitions: int) -> List[np.ndarray]:
+    order = np.argsort(buckets, kind="stable")
+    bounds = np.searchsorted(buckets[order], np.arange(partitions + 1))
+    return [order[bounds[i] : bounds[i + 1]] for i in range(partitions)]
+
+
+def _join_partitions(
+    shuttles: pd.DataFrame,
+    companies: pd.DataFrame,
+    reviews: pd.DataFrame,
+    partitions: int,
+    max_workers: int = None,
+) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """Co-partitions the three tables by `company_id` and yields the result of
+    ``combine_shuttle_level_information`` for each partition, computed in a
+    process pool. Reviews do not hold a `company_id`, so they are routed to
+    the partition of the shuttle they review."""
+    # Equal keys only hash equally if they share a type, as they do in a merge
+    key_type = pd.concat(
+        [shuttles["company_id"].iloc[:0], companies["company_id"].iloc[:0]]
+    ).dtype
+    shuttle_buckets = _hash_partition(
+        shuttles["company_id"].astype(key_type), partitions
+    )
+    company_buckets = _hash_partition(
+        companies["company_id"].astype(key_type), partitions
+    )
+
+    # Narrow join of review positions to shuttle partitions, a review goes to
+    # more than one partition only if its shuttle id appears in several
+    routes = (
+        pd.DataFrame(
+            {"shuttle_id": shuttles["id"].to_numpy(), "_bucket": shuttle_buckets}
+        )
+        .drop_duplicates()
+        .merge(
+            pd.DataFrame(
+                {
+                    "shuttle_id": reviews["shuttle_id"].to_numpy(),
+                    "_position": np.arange(len(reviews)),
+                }
+            ),
+            on="shuttle_id",
+        )
+    )
+    route_positions = routes["_position"].to_numpy()
+    review_positions = [
+        np.sort(route_positions[positions])
+        for positions in _partition_positions(routes["_bucket"].to_numpy(), partitions)
+    ]
+    shuttle_positions = _partition_positions(shuttle_buckets, partitions)
+    company_positions = _partition_positions(company_buckets, partitions)
+    del routes
+
+    max_workers = max_workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        # Bound the partitions in flight, so that only a few are held at once
+        in_flight = 2 * max_workers
+        pending = deque()
+        for partition in range(partitions):
+            pending.append(
+                pool.submit(
+                    combine_shuttle_level_information,
+                    shuttles=shuttles.take(shuttle_positions[partition]),
+                    companies=companies.take(company_positions[partition]),
+                    reviews=reviews.take(review_positions[partition]),
+                )
+            )
+            if len(pending) >= in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def combine_shuttle_level_information_partitioned(
+    shuttles: pd.DataFrame,
+    companies: pd.DataFrame,
+    reviews: pd.DataFrame,
+    join_options: Dict[str, Any],
+) -> Tuple[Iterator[pd.DataFrame], Iterator[pd.DataFrame]]:
+    """Combines all data to create a domain level primary table, one hash
+    partition at a time rather than in a single in-memory merge.
+
+    All three inputs are co-partitioned by `company_id`, each partition is
+    joined and has its nulls dropped in a separate process, and the results
+    are returned as iterators so that each partition can be written out as
+    soon as it is ready.
+
+    This bounds the memory of the join itself, not of its inputs: the three
+    tables are still loaded in full by this process, and the rows of each
+    partition are copied out of them and pickled to a worker, so up to
+    `2 * max_workers` partitions exist twice while they are in flight.
+
+    Args:
+        shuttles: Preprocessed data for shuttles.
+        companies: Preprocessed data for companies.
+        reviews: Raw data for reviews.
+        join_options: `partitions`, the number of hash partitions, and
+            `max_workers`, the size of the process pool, which defaults to the
+            number of CPUs, as set in `conf/base/parameters/data_ingestion.yml`.
+    Returns:
+        Iterators over the partitions of the combined primary layer table and
+        of its id columns
+
+    """
+    shared = SharedPartitions(
+        _join_partitions(
+            shuttles,
+            companies,
+            reviews,
+            partitions=join_options["partitions"],
+            max_workers=join_options.get("max_workers"),
+        ),
+        outputs=2,
+    )
+    return skip_empty(shared.output(0)), skip_empty(shared.output(1))
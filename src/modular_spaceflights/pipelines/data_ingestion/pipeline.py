@@ -4,58 +4,119 @@ from kedro.pipeline.modular_pipeline import pipeline
 from .nodes import (
     aggregate_company_data,
     apply_types_to_companies,
+    apply_types_to_companies_chunked,
     apply_types_to_reviews,
+    apply_types_to_reviews_chunked,
     apply_types_to_shuttles,
     combine_shuttle_level_information,
+    combine_shuttle_level_information_partitioned,
+    optimise_dtypes,
 )
 
 
-def create_pipeline(**kwargs) -> Pipeline:
+def create_pipeline(
+    chunked: bool = False, partitioned: bool = False, **kwargs
+) -> Pipeline:
     """This method imports the python functions which accept raw data,
     add types and wrangle into primary layer outputs.
 
+    Args:
+        chunked (bool): If True, the `companies` and `reviews` inputs are
+            expected to be iterators of DataFrames and are typed one chunk
+            at a time.
+        partitioned (bool): If True, the primary layer tables are joined one
+            hash partition at a time in a process pool, and are output as
+            iterators of partitions.
+
+    Unless ``chunked``, each typed table is converted to compact dtypes
+    before it is saved to the intermediate layer, and the chosen dtypes are
+    saved next to it. Streamed chunks are saved as they are typed, because a
+    dtype which is safe for one chunk may not be for the next.
+
     Returns:
         Pipeline: A set of nodes which take data from the raw to
         the intermediate then primary layers.
     """
+    if chunked:
+        type_companies, type_reviews = (
+            apply_types_to_companies_chunked,
+            apply_types_to_reviews_chunked,
+        )
+    else:
+        type_companies, type_reviews = apply_types_to_companies, apply_types_to_reviews
+
+    tables = ["companies", "shuttles", "reviews"]
+    if chunked:
+        typed_outputs = {table: f"int_typed_{table}" for table in tables}
+        optimise_steps = []
+    else:
+        typed_outputs = {table: f"typed_{table}" for table in tables}
+        optimise_steps = [
+            node(
+                func=optimise_dtypes,
+                inputs=[f"typed_{table}", "params:dtype_optimisation"],
+                outputs=[f"int_typed_{table}", f"int_{table}_dtypes"],
+                name=f"optimise_{table}_dtypes",
+            )
+            for table in tables
+        ]
+
+    if partitioned:
+        combine_step = node(
+            func=combine_shuttle_level_information_partitioned,
+            inputs={
+                "shuttles": "int_typed_shuttles",
+                "reviews": "int_typed_reviews",
+                "companies": "prm_agg_companies",
+                "join_options": "params:partitioned_join",
+            },
+            outputs=["prm_shuttle_company_reviews@full", "prm_spine_table"],
+            name="combine_step",
+        )
+    else:
+        combine_step = node(
+            func=combine_shuttle_level_information,
+            inputs={
+                "shuttles": "int_typed_shuttles",
+                "reviews": "int_typed_reviews",
+                "companies": "prm_agg_companies",
+            },
+            outputs=["prm_shuttle_company_reviews@full", "prm_spine_table"],
+            name="combine_step",
+        )
+
     return Pipeline(
         [
             node(
-                func=apply_types_to_companies,
+                func=type_companies,
                 inputs="companies",
-                outputs="int_typed_companies",
+                outputs=typed_outputs["companies"],
             ),
             node(
                 func=apply_types_to_shuttles,
                 inputs="shuttles",
-                outputs="int_typed_shuttles",
+                outputs=typed_outputs["shuttles"],
             ),
             node(
-                func=apply_types_to_reviews,
+                func=type_reviews,
                 inputs=["reviews", "params:typing.reviews.columns_as_floats"],
-                outputs="int_typed_reviews",
+                outputs=typed_outputs["reviews"],
             ),
+            *optimise_steps,
             node(
                 func=aggregate_company_data,
                 inputs="int_typed_companies",
                 outputs="prm_agg_companies",
                 name="company_agg",
             ),
-            node(
-                func=combine_shuttle_level_information,
-                inputs={
-                    "shuttles": "int_typed_shuttles",
-                    "reviews": "int_typed_reviews",
-                    "companies": "prm_agg_companies",
-                },
-                outputs=["prm_shuttle_company_reviews", "prm_spine_table"],
-                name="combine_step",
-            ),
+            combine_step,
         ]
     )
 
 
-def new_ingestion_pipeline(namespace: str = "ingestion") -> Pipeline:
+def new_ingestion_pipeline(
+    namespace: str = "ingestion", partitioned: bool = False
+) -> Pipeline:
     """This function creates a new instance of the ingestion pipeline
     declared above, however it ensures
     that the pipeline inputs and outputs are appropriately namespaced
@@ -63,12 +124,14 @@ def new_ingestion_pipeline(namespace: str = "ingestion") -> Pipeline:
 
     Args:
         namespace (str): The namespace to apply
+        partitioned (bool): Whether to join the primary layer tables one hash
+            partition at a time, see `create_pipeline`
 
     Returns:
         Pipeline: The correctly namespaced pipeline
     """
     return pipeline(
-        pipe=create_pipeline(),
+        pipe=create_pipeline(partitioned=partitioned),
         namespace=namespace,  # provide inputs
         inputs={"reviews", "shuttles", "companies"},  # map inputs outside of namespace
         outputs={
@@ -76,3 +139,35 @@ def new_ingestion_pipeline(namespace: str = "ingestion") -> Pipeline:
             "prm_shuttle_company_reviews",
         },
     )
+
+
+def new_streaming_ingestion_pipeline(namespace: str = "ingestion") -> Pipeline:
+    """This function creates a variant of the ingestion pipeline which
+    streams the raw `companies` and `reviews` CSV files in bounded-size
+    chunks, so peak memory does not grow with the size of the raw files.
+    Each typed chunk is appended to the partitioned Parquet outputs on the
+    intermediate layer as soon as it has been processed.
+
+    Only the typing steps are streamed. `shuttles` is read in full, and the
+    company aggregation and the primary join still load the typed tables in
+    full, so peak memory grows with the size of the intermediate layer.
+
+    Args:
+        namespace (str): The namespace to apply
+
+    Returns:
+        Pipeline: The correctly namespaced pipeline
+    """
+    return pipeline(
+        pipe=create_pipeline(chunked=True),
+        namespace=namespace,
+        inputs={
+            "companies": "companies_chunked",
+            "reviews": "reviews_chunked",
+            "shuttles": "shuttles",
+        },
+        outputs={
+            "prm_spine_table",
+            "prm_shuttle_company_reviews",
+        },
+    )
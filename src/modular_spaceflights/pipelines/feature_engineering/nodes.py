@@ -3,8 +3,7 @@ This is a boilerplate pipeline 'feature_engineering'
 generated using Kedro 0.17.6
 """
 
-from functools import reduce
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 import numpy
 import pandas as pd
@@ -31,71 +30,238 @@ def create_static_features(data: pd.DataFrame, column_names: List[str]) -> pd.Da
     return data[columns_to_select]
 
 
-def _create_metric_column(
-    data: pd.DataFrame,
-    column_a: str,
-    column_b: str,
-    numpy_method: str,
-    conjunction: str,
+def _derived_column_name(spec: Dict[str, str]) -> str:
+    return f"{spec['column_a']}_{spec['conjunction']}_{spec['column_b']}"
+
+
+def source_columns(feature_params: Dict[str, List]) -> List[str]:
+    """This function lists the columns of the primary layer which the
+    features are created from, in the order they are first used, so that
+    only those need to be loaded.
+
+    Args:
+        feature_params (Dict[str, List]): The `static` column names and/or
+            the `derived` feature specs, as defined in
+            `conf/base/parameters/feature_engineering.yml`
+
+    Returns:
+        List[str]: The pattern matching the ID columns, then the columns
+            used by the features
+    """
+    columns = list(feature_params.get("static", []))
+    for spec in feature_params.get("derived", []):
+        columns.extend((spec["column_a"], spec["column_b"]))
+    return ["*_id"] + list(dict.fromkeys(columns))
+
+
+def _evaluate_derived_features(
+    data: pd.DataFrame, derived_params: List[Dict[str, str]]
 ) -> pd.DataFrame:
-    """This method will retrieve a numpy function, combine two columns and make
-    a new column. it then retruns a new DataFrame which is the available ID
-    columns plus the new column.
+    """This method evaluates every derived feature spec in a single pass. Each
+    spec retrieves a numpy function and applies it to two columns, named
+    {a}_{conjunction}_{b}. Source columns are converted to numpy arrays once,
+    however many specs use them, and repeated specs are only evaluated once.
 
     Args:
         data (pd.DataFrame): The DataFrame to work with
-        column_a (str): The left operand to the numpy function
-        columb_b (str): The right operand to the numpy function
-        numpy_method (str): The numpy function to use such as `numpy.divide`
-        conjunction (str): This is used to name the new column
-            i.e. {a}_{conjunction}_{b}
+        derived_params (List[Dict[str, str]]): The specs, each made of
+            `column_a`, `column_b`, `numpy_method` such as `divide`, and
+            the `conjunction` used to name the new column
+
+    Raises:
+        ValueError: If two different specs would create the same column
 
     Returns:
-        pd.DataFrame: A new feature table
+        pd.DataFrame: The available ID columns plus one column per unique spec
     """
-    column_operation = getattr(numpy, numpy_method)
-    new_column = column_operation(data[column_a], data[column_b])
+    specs = {}  # type: Dict[str, Dict[str, str]]
+    for spec in derived_params:
+        name = _derived_column_name(spec)
+        if specs.setdefault(name, spec) != spec:
+            raise ValueError(
+                f"Derived feature '{name}' is defined more than once with "
+                f"different parameters"
+            )
+
+    source_columns = {
+        column
+        for spec in specs.values()
+        for column in (spec["column_a"], spec["column_b"])
+    }
+    arrays = {column: data[column].to_numpy() for column in source_columns}
+
+    new_columns = {}
+    # Match the pandas behaviour of yielding inf/nan rather than warning
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        for name, spec in specs.items():
+            column_operation = getattr(numpy, spec["numpy_method"])
+            new_columns[name] = column_operation(
+                arrays[spec["column_a"]], arrays[spec["column_b"]]
+            )
+
     id_columns = _get_id_columns(data=data)
-    working_df = data[id_columns]
-    working_df.assign(**{f"{column_a}_{conjunction}_{column_b}": new_column})
-    return working_df
+    return pd.concat(
+        [data[id_columns], pd.DataFrame(new_columns, index=data.index)], axis=1
+    )
 
 
 def create_derived_features(
     spine_df: pd.DataFrame, data: pd.DataFrame, derived_params: List[Dict[str, str]]
 ) -> pd.DataFrame:
-    """[summary]
+    """This function creates every derived feature from the primary data as
+    one wide table, which is then joined onto the spine in a single operation.
 
     Args:
-        spine_df (pd.DataFrame): [description]
-        data (pd.DataFrame): [description]
-        derived_params (Dict[str, str]): [description]
+        spine_df (pd.DataFrame): The identifier columns at the correct grain
+        data (pd.DataFrame): The DataFrame to derive features from
+        derived_params (List[Dict[str, str]]): The derived feature specs as
+            defined in `conf/base/parameters/feature_engineering.yml`
+
+    Returns:
+        pd.DataFrame: The spine plus one column per derived feature
     """
-    new_columns = [_create_metric_column(data, **kwargs) for kwargs in derived_params]
-    combined_df = joiner(spine_df, *new_columns)
+    derived_df = _evaluate_derived_features(data, derived_params)
+    combined_df = joiner(spine_df, derived_df)
     return combined_df
 
 
+def create_model_input(
+    data: pd.DataFrame, feature_params: Dict[str, List]
+) -> pd.DataFrame:
+    """This function applies every step of the feature pipeline to a single
+    table, such as one chunk of the primary layer, using its identifier
+    columns as the spine. The columns come out in the same order as those of
+    `model_input_table`, so that the result can be scored by a model trained
+    on it.
+
+    Args:
+        data (pd.DataFrame): The DataFrame to create features from
+        feature_params (Dict[str, List]): The `static` column names and the
+            `derived` feature specs, as defined in
+            `conf/base/parameters/feature_engineering.yml`
+
+    Returns:
+        pd.DataFrame: The identifier columns plus every feature column
+    """
+    spine_df = data[_get_id_columns(data=data)]
+    static_df = create_static_features(data, feature_params["static"])
+    derived_df = create_derived_features(spine_df, data, feature_params["derived"])
+    return joiner(spine_df, static_df, derived_df)
+
+
+def _encode_ids(
+    id_df: pd.DataFrame,
+    levels: Optional[List[Tuple[pd.Index, Optional[pd.Index]]]] = None,
+) -> Tuple[numpy.ndarray, List[Tuple[pd.Index, Optional[pd.Index]]]]:
+    """This method encodes each row of identifiers as a single integer, one
+    column at a time so that the codes never grow beyond the number of rows.
+
+    Args:
+        id_df (pd.DataFrame): The identifier columns to encode
+        levels (List[Tuple[pd.Index, Optional[pd.Index]]]): The levels returned
+            by a previous call, to encode rows consistently with that call.
+            Rows with identifiers not seen by that call, or with a missing
+            identifier, are encoded as -1
+
+    Returns:
+        Tuple[numpy.ndarray, List[Tuple[pd.Index, Optional[pd.Index]]]]: The
+            code of each row and the levels used to encode them
+    """
+    encode = levels is None
+    levels = [] if encode else levels
+    key = None
+    for position, column in enumerate(id_df.columns):
+        if encode:
+            codes, column_uniques = pd.factorize(id_df[column])
+            column_uniques = pd.Index(column_uniques)
+        else:
+            column_uniques, key_uniques = levels[position]
+            codes = column_uniques.get_indexer(id_df[column])
+
+        if key is None:
+            key, key_uniques = codes, None
+        else:
+            combined = key * len(column_uniques) + codes
+            combined[(key < 0) | (codes < 0)] = -1
+            if encode:
+                key, key_uniques = pd.factorize(combined)
+                key_uniques = pd.Index(key_uniques)
+            else:
+                key = key_uniques.get_indexer(combined)
+        if encode:
+            levels.append((column_uniques, key_uniques))
+    return key, levels
+
+
 def joiner(spine_df: pd.DataFrame, *dfs: pd.DataFrame) -> pd.DataFrame:
     """This function takes an arbitrary number of DataFrames and will
-    keep left-joining them to themselves along any columns suffixed
-    with "id". There is an assumption that the tables passed in share
-    the same identifiers and grain.
+    left-join them onto the spine along any columns suffixed with "id".
+    There is an assumption that the tables passed in share the same
+    identifiers and grain.
+
+    The spine's identifiers are encoded once and every table is aligned
+    against those codes, or used as is when its identifiers are already in
+    the same order, before all of them are concatenated in one go rather than
+    merged one at a time.
 
     Args:
         spine_df (pd.DataFrame): The first argument should simply contain
         the identifier columns at the correct grain.
         *dfs (pd.DataFrame): Any subsequent tables are joined to the spine
 
+    Raises:
+        ValueError: If a column other than the identifiers appears in more
+            than one of the tables, or if the identifiers of a table other
+            than the spine are not unique
+
     Returns:
         pd.DataFrame: A single data-frame where all inputs to this function
             have been left joined together.
     """
     id_columns = _get_id_columns(data=spine_df)
+    spine_key, levels = _encode_ids(spine_df[id_columns])
+    n_keys = int(spine_key.max()) + 1 if len(spine_key) else 0
+    merged_index = pd.RangeIndex(len(spine_df))
 
-    merged_dfs = reduce(
-        lambda df, df2: df.merge(df2, on=id_columns, how="left"), dfs, spine_df
-    )
+    spine_df_copy = spine_df.copy(deep=False)
+    spine_df_copy.index = merged_index
+
+    seen_columns = set(spine_df.columns)
+    aligned_dfs = [spine_df_copy]
+    for df in dfs:
+        value_columns = [x for x in df.columns if x not in id_columns]
+        overlap = seen_columns.intersection(value_columns)
+        if overlap:
+            raise ValueError(f"Columns {sorted(overlap)} appear in more than one table")
+        seen_columns.update(value_columns)
+
+        feature_df = df[value_columns]
+        feature_df.index = pd.RangeIndex(len(df))
+        is_aligned = all(
+            numpy.array_equal(df[x].to_numpy(), spine_df[x].to_numpy())
+            for x in id_columns
+        )
+        if not is_aligned:
+            feature_key, _ = _encode_ids(df[id_columns], levels)
+            found = numpy.flatnonzero(feature_key >= 0)
+            # Duplicated keys would have multiplied the rows of a merge
+            if numpy.bincount(feature_key[found], minlength=1).max() > 1:
+                raise ValueError(
+                    f"Identifiers {id_columns} are not unique in a table joined "
+                    f"to the spine"
+                )
+            row_of_key = numpy.full(n_keys, -1)
+            row_of_key[feature_key[found]] = found
+            # Spine rows with a missing identifier match nothing, rather than
+            # the last row which a key of -1 would index
+            rows = numpy.full(len(spine_key), -1)
+            has_key = spine_key >= 0
+            rows[has_key] = row_of_key[spine_key[has_key]]
+            feature_df = feature_df.reindex(rows)
+        feature_df.index = merged_index
+        aligned_dfs.append(feature_df)
+
+    merged_dfs = pd.concat(aligned_dfs, axis=1, copy=False)
     # Confirm that the number of rows is unchanged after the operation has completed
     assert spine_df.shape[0] == merged_dfs.shape[0]
     return merged_dfs
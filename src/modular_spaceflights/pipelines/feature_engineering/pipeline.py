@@ -25,14 +25,17 @@ def new_feature_pipeline() -> Pipeline:
         [
             node(
                 func=create_static_features,
-                inputs=["prm_shuttle_company_reviews", "params:feature.static"],
+                inputs=[
+                    "prm_shuttle_company_reviews@static_features",
+                    "params:feature.static",
+                ],
                 outputs="feat_static_features",
             ),
             node(
                 func=create_derived_features,
                 inputs=[
                     "prm_spine_table",
-                    "prm_shuttle_company_reviews",
+                    "prm_shuttle_company_reviews@derived_features",
                     "params:feature.derived",
                 ],
                 outputs="feat_derived_features",
@@ -44,7 +47,7 @@ def new_feature_pipeline() -> Pipeline:
                     "feat_static_features",
                     "feat_derived_features",
                 ],
-                outputs="model_input_table",
+                outputs="model_input_table@full",
             ),
         ]
     )
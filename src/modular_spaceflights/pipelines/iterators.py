@@ -0,0 +1,52 @@
+"""Iterators over partitions of a table, shared by the pipelines which write
+their outputs one partition at a time."""
+import threading
+from collections import deque
+from typing import Any, Iterator, Tuple
+
+import pandas as pd
+
+
+class SharedPartitions:
+    """Splits an iterator of tuples into one iterator per tuple element, which
+    can be consumed in any order or concurrently while the source is only
+    iterated once. Elements are buffered until every output has read them."""
+
+    def __init__(self, source: Iterator[Tuple[Any, ...]], outputs: int):
+        self._source = source
+        self._buffers = [deque() for _ in range(outputs)]
+        self._lock = threading.Lock()
+        self._exhausted = False
+
+    def output(self, index: int) -> Iterator[Any]:
+        """Returns the iterator over the ``index``-th element of each tuple"""
+        while True:
+            with self._lock:
+                if self._buffers[index]:
+                    item = self._buffers[index].popleft()
+                elif self._exhausted:
+                    return
+                else:
+                    try:
+                        items = next(self._source)
+                    except StopIteration:
+                        self._exhausted = True
+                        return
+                    for other, buffer in enumerate(self._buffers):
+                        if other != index:
+                            buffer.append(items[other])
+                    item = items[index]
+            yield item
+
+
+def skip_empty(partitions: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """Drops empty partitions, which carry no column types, unless all are"""
+    first_empty, any_yielded = None, False
+    for partition in partitions:
+        if len(partition):
+            any_yielded = True
+            yield partition
+        elif first_empty is None:
+            first_empty = partition
+    if not any_yielded and first_empty is not None:
+        yield first_empty
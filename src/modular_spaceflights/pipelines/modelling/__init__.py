@@ -1,8 +1,15 @@
 """Complete Data Science pipeline for the spaceflights tutorial"""
 
-from .pipeline import new_modeling_pipeline, new_train_eval_template  # NOQA
+from .pipeline import (  # NOQA
+    new_modeling_pipeline,
+    new_search_pipeline,
+    new_search_template,
+    new_train_eval_template,
+)
 
 __all__ = [
     "new_train_eval_template",
     "new_modeling_pipeline",
+    "new_search_template",
+    "new_search_pipeline",
 ]
@@ -0,0 +1,254 @@
+"""A runner which trains the model branches of the modelling pipeline in
+parallel, while every other node is run sequentially.
+
+The branches created by ``new_modeling_pipeline`` are independent of each other
+and all read the same split data. Rather than pickling ``X_train``, ``y_train``
+etc. into every worker, as the ``ParallelRunner`` would, the split data is
+written once to POSIX shared memory with ``SharedMemoryDataSet``, unless the
+catalog already declares it as one, and each worker maps it as a zero-copy
+pandas view.
+"""
+import copyreg
+import importlib
+import io
+import multiprocessing
+import pickle
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from types import ModuleType
+from typing import Any, Dict, List
+
+import pandas as pd
+from kedro.io import DataCatalog, MemoryDataSet
+from kedro.io.core import AbstractDataSet, DataSetError
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+from kedro.runner import SequentialRunner, run_node
+
+from modular_spaceflights.extras.datasets.shared_memory_dataset import (
+    SharedMemoryDataSet,
+)
+
+
+def _reduce_module(module: ModuleType):
+    return importlib.import_module, (module.__name__,)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Pickles ``obj`` along with any modules it refers to, by name.
+
+    ``PickleDataSet`` holds a reference to its backend module, which the
+    default pickler refuses. Registering the reducer on this pickler only,
+    rather than on ``ForkingPickler``, leaves the rest of the process alone.
+    """
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = {**copyreg.dispatch_table, ModuleType: _reduce_module}
+    pickler.dump(obj)
+    return buffer.getvalue()
+
+
+def _run_pickled_branch(payload: bytes, package_name: str = None) -> Dict[str, Any]:
+    """Configures the project in spawned processes before the branch, which
+    was pickled with ``_dumps``, is loaded and run by ``_run_branch``"""
+    if multiprocessing.get_start_method() == "spawn" and package_name:
+        from kedro.framework.project import configure_project
+
+        configure_project(package_name)
+    return _run_branch(**pickle.loads(payload))
+
+
+def _run_branch(
+    nodes: List[Node],
+    inputs: Dict[str, Any],
+    datasets: Dict[str, AbstractDataSet],
+    free_outputs: List[str],
+    is_async: bool,
+    run_id: str,
+) -> Dict[str, Any]:
+    """Runs the nodes of a single model branch inside a worker process.
+
+    Args:
+        nodes: The branch nodes in topological order.
+        inputs: Inputs passed by value, such as parameters, by dataset name.
+        datasets: The shared memory datasets the branch reads its inputs from
+            and the persisted datasets it saves its outputs to.
+        free_outputs: In-memory outputs to hand back to the parent process.
+        is_async: Whether to load and save node data with threads.
+        run_id: The id of the run.
+
+    Returns:
+        The values of ``free_outputs``.
+    """
+    catalog = DataCatalog(
+        data_sets={
+            name: MemoryDataSet(data, copy_mode="assign")
+            for name, data in inputs.items()
+        }
+    )
+    catalog.add_all(datasets)
+    for name in free_outputs:
+        catalog.add(name, MemoryDataSet())
+
+    for node in nodes:
+        run_node(node, catalog, is_async, run_id)
+    return {name: catalog.load(name) for name in free_outputs}
+
+
+class ModelFanOutRunner(SequentialRunner):
+    """``ModelFanOutRunner`` runs the nodes of a pipeline sequentially, apart
+    from the model branches created by ``new_modeling_pipeline``, which are
+    trained and evaluated concurrently in a process pool.
+
+    Example:
+    ::
+
+        >>> ModelFanOutRunner(max_model_workers=2).run(pipeline, catalog)
+    """
+
+    def __init__(
+        self,
+        max_model_workers: int = None,
+        is_async: bool = False,
+        namespace: str = "train_evaluation",
+    ):
+        """Creates a new instance of ModelFanOutRunner.
+
+        Args:
+            max_model_workers: The maximum number of branches to train at once.
+                Defaults to the number of CPUs.
+            is_async: If True, node inputs and outputs are loaded and saved
+                asynchronously with threads.
+            namespace: The namespace wrapping every model branch, each branch
+                being a namespace nested within it.
+        """
+        super().__init__(is_async=is_async)
+        self._max_model_workers = max_model_workers or multiprocessing.cpu_count()
+        self._namespace = namespace
+
+    def _group_branches(self, pipeline: Pipeline) -> Dict[str, List[Node]]:
+        branches = defaultdict(list)
+        prefix = f"{self._namespace}."
+        for node in pipeline.nodes:
+            if node.namespace and node.namespace.startswith(prefix):
+                branch = node.namespace[len(prefix) :].split(".")[0]
+                branches[branch].append(node)
+        return dict(branches)
+
+    def _run(
+        self, pipeline: Pipeline, catalog: DataCatalog, run_id: str = None
+    ) -> None:
+        """Runs everything upstream of the model branches, then the branches
+        in parallel, then anything downstream of them.
+
+        Args:
+            pipeline: The ``Pipeline`` to run.
+            catalog: The ``DataCatalog`` from which to fetch data.
+            run_id: The id of the run.
+        """
+        branches = self._group_branches(pipeline)
+        if len(branches) < 2:
+            super()._run(pipeline, catalog, run_id)
+            return
+
+        branch_pipeline = Pipeline([n for nodes in branches.values() for n in nodes])
+        remaining = pipeline - branch_pipeline
+        downstream = remaining.only_nodes_with_inputs(
+            *(branch_pipeline.outputs() & remaining.inputs())
+        )
+        if downstream.nodes:
+            downstream = remaining.from_nodes(*(n.name for n in downstream.nodes))
+        upstream = remaining - downstream
+
+        if upstream.nodes:
+            super()._run(upstream, catalog, run_id)
+        self._run_branches(branches, catalog, run_id)
+
+        # Release the branch inputs nothing else needs, as ``SequentialRunner``
+        # would once their last consumer has run
+        for data_set in (
+            branch_pipeline.inputs()
+            - downstream.inputs()
+            - pipeline.inputs()
+            - pipeline.outputs()
+        ):
+            catalog.release(data_set)
+
+        if downstream.nodes:
+            super()._run(downstream, catalog, run_id)
+
+    def _run_branches(
+        self, branches: Dict[str, List[Node]], catalog: DataCatalog, run_id: str
+    ) -> None:
+        from kedro.framework.project import PACKAGE_NAME
+
+        branch_pipelines = [Pipeline(nodes) for nodes in branches.values()]
+        all_inputs = set().union(*(p.inputs() for p in branch_pipelines))
+
+        # Inputs are loaded once, DataFrames are shared rather than copied
+        shared = {}  # type: Dict[str, AbstractDataSet]
+        temporary = []  # type: List[SharedMemoryDataSet]
+        inputs = {}
+        try:
+            for name in sorted(all_inputs):
+                dataset = catalog._data_sets.get(name)
+                if isinstance(dataset, SharedMemoryDataSet):
+                    shared[name] = dataset
+                    continue
+                data = catalog.load(name)
+                if isinstance(data, (pd.DataFrame, pd.Series)):
+                    try:
+                        dataset = SharedMemoryDataSet()
+                        dataset.save(data)
+                    except DataSetError:  # not numeric, pickled instead
+                        inputs[name] = data
+                    else:
+                        temporary.append(dataset)
+                        shared[name] = dataset
+                else:
+                    inputs[name] = data
+                del data
+
+            workers = min(self._max_model_workers, len(branches))
+            self._logger.info(
+                "Running %d model branches across %d processes",
+                len(branches),
+                workers,
+            )
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = []
+                for branch in branch_pipelines:
+                    branch_inputs = branch.inputs()
+                    datasets = {
+                        name: catalog._data_sets[name]
+                        for name in branch.data_sets() - branch_inputs
+                    }
+                    branch_shared = {
+                        k: v for k, v in shared.items() if k in branch_inputs
+                    }
+                    persisted = {
+                        name: dataset
+                        for name, dataset in datasets.items()
+                        if not isinstance(dataset, MemoryDataSet)
+                    }
+                    payload = _dumps(
+                        dict(
+                            nodes=branch.nodes,
+                            inputs={
+                                k: v for k, v in inputs.items() if k in branch_inputs
+                            },
+                            datasets={**branch_shared, **persisted},
+                            free_outputs=sorted(set(datasets) - set(persisted)),
+                            is_async=self._is_async,
+                            run_id=run_id,
+                        )
+                    )
+                    futures.append(
+                        pool.submit(_run_pickled_branch, payload, PACKAGE_NAME)
+                    )
+                for future in futures:
+                    for name, data in future.result().items():
+                        catalog.save(name, data)
+        finally:
+            for dataset in temporary:
+                dataset.release()
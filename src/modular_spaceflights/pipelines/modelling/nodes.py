@@ -1,11 +1,18 @@
 import importlib
 import logging
-from typing import Any, Dict, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-from sklearn.base import BaseEstimator
-from sklearn.metrics import r2_score
-from sklearn.model_selection import train_test_split
+
+from modular_spaceflights.pipelines.iterators import SharedPartitions, skip_empty
+
+# scikit-learn is imported by the nodes which use it, so that importing this
+# module to construct the pipeline stays cheap
+if TYPE_CHECKING:
+    from sklearn.base import BaseEstimator
+
+    from modular_spaceflights.extras.datasets.model_cache_dataset import ModelCache
 
 
 def split_data(data: pd.DataFrame, split_options: Dict) -> Tuple:
@@ -30,6 +37,8 @@ def split_data(data: pd.DataFrame, split_options: Dict) -> Tuple:
         f"'{random_state}'"
     )
 
+    from sklearn.model_selection import train_test_split
+
     X = data[independent_variables]
     y = data[target_variable]
     X_train, X_test, y_train, y_test = train_test_split(
@@ -39,14 +48,85 @@ def split_data(data: pd.DataFrame, split_options: Dict) -> Tuple:
     return X_train, X_test, y_train, y_test
 
 
+def _hash_split(
+    chunk: pd.DataFrame, target_variable: str, test_size: float, random_state: int
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
+    """Assigns each row to the test set if the hash of its id columns, salted
+    with ``random_state``, falls in the lowest ``test_size`` fraction of the
+    hash range. A row is therefore always assigned to the same set, whichever
+    chunk it arrives in."""
+    id_columns = [x for x in chunk.columns if x.endswith("_id")]
+    if not id_columns:
+        raise ValueError("An out-of-core split needs at least one '*_id' column")
+
+    hashes = pd.util.hash_pandas_object(chunk[id_columns], index=False).to_numpy()
+    salted = pd.util.hash_array(hashes ^ np.uint64(random_state or 0))
+    is_test = salted < np.uint64(min(int(test_size * 2 ** 64), 2 ** 64 - 1))
+
+    X = chunk.drop(columns=target_variable)
+    y = chunk[target_variable]
+    return X[~is_test], X[is_test], y[~is_test], y[is_test]
+
+
+def split_data_out_of_core(
+    row_groups: Iterator[pd.DataFrame], split_options: Dict
+) -> Tuple[Iterator[pd.DataFrame], ...]:
+    """Splits data into features and targets training and test sets, one
+    row group at a time, so that the input table is never held in memory.
+
+    Rows are assigned by a hash of their id columns rather than sampled, so
+    the split is reproducible for a given `random_state` however the input is
+    chunked, and the test set holds approximately, not exactly, `test_size`
+    of the rows.
+
+    Args:
+        row_groups: Data containing features and target, by row group.
+        split_options: `target`, `test_size` as a fraction of the rows and
+            `random_state`.
+    Returns:
+        Iterators over the chunks of `X_train`, `X_test`, `y_train` and
+        `y_test`, which can be saved one chunk at a time.
+    """
+    target_variable = split_options["target"]
+    test_size = split_options["test_size"]
+    random_state = split_options["random_state"]
+    if not 0 < test_size < 1:
+        raise ValueError(
+            f"An out-of-core split needs 'test_size' as a fraction of the rows, "
+            f"got {test_size}"
+        )
+
+    logger = logging.getLogger(__name__)
+    logger.info(
+        f"Splitting data out of core against the target of '{target_variable}' "
+        f"with a test sized of {test_size} and a random state of "
+        f"'{random_state}'"
+    )
+
+    shared = SharedPartitions(
+        (
+            _hash_split(chunk, target_variable, test_size, random_state)
+            for chunk in row_groups
+        ),
+        outputs=4,
+    )
+    return tuple(skip_empty(shared.output(i)) for i in range(4))
+
+
 def train_model(
-    X_train: pd.DataFrame, y_train: pd.Series, model_options: Dict[str, Any]
-) -> Tuple[BaseEstimator, Dict[str, Any]]:
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    model_options: Dict[str, Any],
+    model_cache: Optional["ModelCache"] = None,
+) -> Tuple["BaseEstimator", Dict[str, Any]]:
     """Trains the linear regression model.
 
     Args:
         X_train: Training data of independent features.
         y_train: Training data for price.
+        model_cache: If given, the model is only fitted, and added to the
+            cache, if no model was fitted with the same training data,
+            options and library version before. Otherwise that one is loaded.
 
     Returns:
         Trained model.
@@ -56,22 +136,45 @@ def train_model(
     model_module = model_options.get("module")
     model_type = model_options.get("class")
     model_arguments = model_options.get("kwargs")
+    flat_model_params = {**{"model_type": model_type}, **model_arguments}
+    logger = logging.getLogger(__name__)
+
+    module = importlib.import_module(model_module)
+    if model_cache is not None:
+        library = importlib.import_module(model_module.split(".")[0])
+        fingerprint = model_cache.fingerprint(
+            X_train,
+            y_train,
+            model_options,
+            getattr(library, "__version__", None),
+        )
+        cached_regressor = model_cache.get(fingerprint)
+        if cached_regressor is not None:
+            logger.info(
+                f"Loaded model of type {type(cached_regressor)} fitted with the "
+                f"same data and options, version "
+                f"'{model_cache.version_of(fingerprint)}'"
+            )
+            return cached_regressor, flat_model_params
 
     # Import and instantiate Sklearn regressor object
-    regressor_class = getattr(importlib.import_module(model_module), model_type)
+    regressor_class = getattr(module, model_type)
     regressor_instance = regressor_class(**model_arguments)
 
-    logger = logging.getLogger(__name__)
     logger.info(f"Fitting model of type {type(regressor_instance)}")
 
     # Fit model
     regressor_instance.fit(X_train, y_train)
-    flat_model_params = {**{"model_type": model_type}, **model_arguments}
+    if model_cache is not None:
+        # Checked against the columns created for scoring
+        metadata = {"feature_names": [str(x) for x in X_train.columns]}
+        version = model_cache.put(fingerprint, regressor_instance, metadata)
+        logger.info(f"Saved model as version '{version}'")
     return regressor_instance, flat_model_params
 
 
 def evaluate_model(
-    regressor: BaseEstimator,
+    regressor: "BaseEstimator",
     X_test: pd.DataFrame,
     y_test: pd.Series,
 ) -> Dict[str, float]:
@@ -82,6 +185,8 @@ def evaluate_model(
         X_test: Testing data of independent features.
         y_test: Testing data for price.
     """
+    from sklearn.metrics import r2_score
+
     y_pred = regressor.predict(X_test)
     score = r2_score(y_test, y_pred)
     logger = logging.getLogger(__name__)
@@ -90,3 +195,133 @@ def evaluate_model(
         f"regressor of type '{type(regressor)}'"
     )
     return {"r2_score": score}
+
+
+def _to_builtin(value: Any) -> Any:
+    """Converts numpy scalars, such as those drawn from a distribution, so
+    that they can be tracked as JSON"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _param_space(search_options: Dict[str, Any]) -> Dict[str, Any]:
+    """The values to try for each keyword argument, either a list of values
+    from `grid` or a `scipy.stats` distribution from `distributions`"""
+    import scipy.stats
+
+    space = dict(search_options.get("grid") or {})
+    for name, spec in (search_options.get("distributions") or {}).items():
+        distribution = getattr(scipy.stats, spec["name"])
+        space[name] = distribution(*spec.get("args", []), **spec.get("kwargs", {}))
+    return space
+
+
+def search_hyperparameters(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_test: pd.DataFrame,
+    y_test: pd.Series,
+    model_options: Dict[str, Any],
+    search_options: Dict[str, Any],
+) -> Tuple["BaseEstimator", Dict[str, Any], Dict[str, Any], Dict[str, float]]:
+    """Searches the keyword arguments of a model by successive halving. Every
+    candidate is first cross validated on the training data with a small
+    budget, such as few trees or rows, and only the best `1 / factor` of them
+    go on to the next round, with `factor` times the budget. Candidates are
+    fitted in parallel across cores.
+
+    The candidates are every combination of the `grid` values, or, if
+    `distributions` are given, `n_candidates` draws from those and the
+    `grid` values. The best candidate is then refitted on all the training
+    data and scored on the test data.
+
+    Args:
+        X_train: Training data of independent features.
+        y_train: Training data for price.
+        X_test: Testing data of independent features.
+        y_test: Testing data for price.
+        model_options: The `module`, `class` and fixed `kwargs` of the model,
+            as for `train_model`.
+        search_options: The `grid` and `distributions` to search, the number
+            of `n_candidates` to draw, `halving` arguments for the scikit-learn
+            search such as `resource`, `factor` and `cv`, and `n_jobs`.
+
+    Returns:
+        The best regressor, its flattened parameters, the fit time and
+        `r2_score` of every candidate in every round, and its test `r2_score`.
+    """
+    from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+    from sklearn.model_selection import HalvingGridSearchCV, HalvingRandomSearchCV
+
+    regressor_class = getattr(
+        importlib.import_module(model_options["module"]), model_options["class"]
+    )
+    fixed_kwargs = model_options.get("kwargs") or {}
+    space = _param_space(search_options)
+    halving_args = {
+        "scoring": "r2",
+        "n_jobs": search_options.get("n_jobs"),
+        **(search_options.get("halving") or {}),
+    }
+    # The resource is set by the search, so it cannot be fixed as well
+    resource = halving_args.get("resource", "n_samples")
+    estimator = regressor_class(
+        **{k: v for k, v in fixed_kwargs.items() if k not in space and k != resource}
+    )
+
+    if search_options.get("distributions"):
+        search = HalvingRandomSearchCV(
+            estimator,
+            space,
+            n_candidates=search_options.get("n_candidates", "exhaust"),
+            **halving_args,
+        )
+    else:
+        search = HalvingGridSearchCV(estimator, space, **halving_args)
+
+    logger = logging.getLogger(__name__)
+    logger.info(
+        f"Searching {sorted(space)} of model of type {regressor_class} by "
+        f"successive halving of '{resource}'"
+    )
+    search.fit(X_train, y_train)
+
+    results = search.cv_results_
+    candidates = [
+        {
+            "iteration": int(results["iter"][i]),
+            "n_resources": int(results["n_resources"][i]),
+            "params": {k: _to_builtin(v) for k, v in results["params"][i].items()},
+            "mean_fit_time": float(results["mean_fit_time"][i]),
+            "mean_r2_score": float(results["mean_test_score"][i]),
+            "std_r2_score": float(results["std_test_score"][i]),
+        }
+        for i in range(len(results["params"]))
+    ]
+    for iteration in range(search.n_iterations_):
+        logger.info(
+            f"Round {iteration + 1} of {search.n_iterations_} fitted "
+            f"{search.n_candidates_[iteration]} candidates with "
+            f"{search.n_resources_[iteration]} '{resource}' each"
+        )
+
+    best_params = {k: _to_builtin(v) for k, v in search.best_params_.items()}
+    fitted_params = search.best_estimator_.get_params()
+    flat_model_params = {
+        "model_type": model_options["class"],
+        **{
+            k: _to_builtin(fitted_params[k])
+            for k in [*fixed_kwargs, *best_params, resource]
+            if k in fitted_params
+        },
+    }
+    search_results = {
+        "best_params": best_params,
+        "best_mean_r2_score": float(search.best_score_),
+        "candidates": candidates,
+    }
+    return (
+        search.best_estimator_,
+        flat_model_params,
+        search_results,
+        evaluate_model(search.best_estimator_, X_test, y_test),
+    )
@@ -1,15 +1,22 @@
-from typing import List
+from typing import Dict, List, Tuple
 
 from kedro.pipeline import Pipeline, node
 from kedro.pipeline.modular_pipeline import pipeline
 
-from .nodes import evaluate_model, split_data, train_model
+from .nodes import (
+    evaluate_model,
+    search_hyperparameters,
+    split_data,
+    split_data_out_of_core,
+    train_model,
+)
 
 
 def new_train_eval_template() -> Pipeline:
     """This two node pipeline will train a Sklearn model and return
     a regressor object along with `experiment_params` as tracked
-    metadata.
+    metadata. The model is only fitted if the `model_cache` holds
+    no model fitted with the same data and options.
 
     Returns:
         Pipeline: This pipeline has been designed in a way that
@@ -20,7 +27,12 @@ def new_train_eval_template() -> Pipeline:
         [
             node(
                 func=train_model,
-                inputs=["X_train", "y_train", "params:dummy_model_options"],
+                inputs=[
+                    "X_train",
+                    "y_train",
+                    "params:dummy_model_options",
+                    "model_cache",
+                ],
                 outputs=["regressor", "experiment_params"],
             ),
             node(
@@ -32,7 +44,66 @@ def new_train_eval_template() -> Pipeline:
     )
 
 
-def new_modeling_pipeline(model_types: List[str]) -> Pipeline:
+def new_search_template() -> Pipeline:
+    """This single node pipeline will search the hyperparameters of
+    a Sklearn model, returning the best regressor refitted on the
+    training data along with its parameters, the scores of every
+    candidate and its score on the test data.
+
+    Returns:
+        Pipeline: This pipeline has been designed to be instantiated
+        once per model type via modular pipeline instances, the same
+        as `new_train_eval_template`.
+    """
+    return Pipeline(
+        [
+            node(
+                func=search_hyperparameters,
+                inputs=[
+                    "X_train",
+                    "y_train",
+                    "X_test",
+                    "y_test",
+                    "params:dummy_model_options",
+                    "params:dummy_search_options",
+                ],
+                outputs=[
+                    "regressor",
+                    "experiment_params",
+                    "search_results",
+                    "r2_score",
+                ],
+            ),
+        ]
+    )
+
+
+def _split_stage(out_of_core: bool) -> Tuple[Pipeline, Dict[str, str]]:
+    """The shared 'split' stage, and the names of the datasets it outputs
+    for each of `X_train`, `X_test`, `y_train` and `y_test`"""
+    test_train_refs = ["X_train", "X_test", "y_train", "y_test"]
+
+    # Split the model_input data
+    if out_of_core:
+        split_refs = {ref: f"{ref}_partitioned" for ref in test_train_refs}
+        split_step = node(
+            func=split_data_out_of_core,
+            inputs=["model_input_table@row_groups", "params:split_options"],
+            outputs=list(split_refs.values()),
+        )
+    else:
+        split_refs = {ref: ref for ref in test_train_refs}
+        split_step = node(
+            func=split_data,
+            inputs=["model_input_table@full", "params:split_options"],
+            outputs=test_train_refs,
+        )
+    return Pipeline([split_step]), split_refs
+
+
+def new_modeling_pipeline(
+    model_types: List[str], out_of_core: bool = False
+) -> Pipeline:
     """This function will create a complete modelling
     pipeline that consolidates a single shared 'split' stage,
     several modular instances of the 'train test evaluate' stage
@@ -56,25 +127,16 @@ def new_modeling_pipeline(model_types: List[str]) -> Pipeline:
         model_types (List[str]): The instances of Sklearn models
             we want to build, each of these must correspond to
             parameter keys of the same name
+        out_of_core (bool): If True, the model input table is split one row
+            group at a time by a hash of its id columns, and the splits are
+            persisted as Parquet parts rather than held in memory
 
     Returns:
         Pipeline: A single pipeline encapsulating the split
             stage as well as one train/evaluation sub-pipeline
             for each `model_type` passed in.
     """
-
-    test_train_refs = ["X_train", "X_test", "y_train", "y_test"]
-
-    # Split the model_input data
-    split_stage_pipeline = Pipeline(
-        [
-            node(
-                func=split_data,
-                inputs=["model_input_table", "params:split_options"],
-                outputs=test_train_refs,
-            )
-        ]
-    )
+    split_stage_pipeline, split_refs = _split_stage(out_of_core)
 
     # Instantiate a new modeling pipeline for every model type
     model_pipelines = [
@@ -83,7 +145,7 @@ def new_modeling_pipeline(model_types: List[str]) -> Pipeline:
             parameters={
                 "params:dummy_model_options": f"params:model_options.{model_type}"
             },
-            inputs={k: k for k in test_train_refs},
+            inputs=split_refs,
             outputs={  # both of these are tracked as experiments
                 "experiment_params": f"hyperparams_{model_type}",
                 "r2_score": f"r2_score_{model_type}",
@@ -100,9 +162,54 @@ def new_modeling_pipeline(model_types: List[str]) -> Pipeline:
     consolidated_model_pipelines = pipeline(
         pipe=all_modeling_pipelines,
         namespace="train_evaluation",
-        inputs=test_train_refs,
+        inputs=list(split_refs.values()),
     )
 
     # Combine split and modeling stages into one pipeline
     complete_model_pipeline = split_stage_pipeline + consolidated_model_pipelines
     return complete_model_pipeline
+
+
+def new_search_pipeline(model_types: List[str], out_of_core: bool = False) -> Pipeline:
+    """This function will create a hyperparameter search pipeline
+    with the same shared 'split' stage as `new_modeling_pipeline`,
+    followed by one search instance per model type, namespaced
+    under `hyperparameter_search`.
+
+    Args:
+        model_types (List[str]): The instances of Sklearn models
+            to tune, each of these must correspond to keys of the
+            same name in both `model_options` and `search_options`
+        out_of_core (bool): Whether to split the model input table
+            out of core, see `new_modeling_pipeline`
+
+    Returns:
+        Pipeline: A single pipeline encapsulating the split stage
+            as well as one search sub-pipeline for each `model_type`.
+    """
+    split_stage_pipeline, split_refs = _split_stage(out_of_core)
+
+    search_pipelines = [
+        pipeline(
+            pipe=new_search_template(),
+            parameters={
+                "params:dummy_model_options": f"params:model_options.{model_type}",
+                "params:dummy_search_options": f"params:search_options.{model_type}",
+            },
+            inputs=split_refs,
+            outputs={  # all of these are tracked as experiments
+                "experiment_params": f"hyperparams_{model_type}",
+                "search_results": f"candidates_{model_type}",
+                "r2_score": f"r2_score_{model_type}",
+            },
+            namespace=f"{model_type}",
+        )
+        for model_type in model_types
+    ]
+
+    consolidated_search_pipelines = pipeline(
+        pipe=sum(search_pipelines),
+        namespace="hyperparameter_search",
+        inputs=list(split_refs.values()),
+    )
+    return split_stage_pipeline + consolidated_search_pipelines
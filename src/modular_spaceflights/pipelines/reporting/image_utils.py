@@ -1,94 +1,145 @@
+import string
+from functools import lru_cache
+from typing import Dict, List, Optional
+
 import pandas as pd
 from PIL import Image, ImageDraw, ImageFont
 
 
+@lru_cache(maxsize=None)
+def _default_font() -> ImageFont.ImageFont:
+    return ImageFont.load_default()
+
+
+class _GlyphMetrics:
+    """Measures text one glyph at a time, remembering the width of each glyph.
+    The default Pillow font is a bitmap font without kerning, so the width of a
+    string is the sum of the widths of its glyphs. If every printable ASCII
+    glyph has the same width, as in the default font, ASCII text is measured
+    from its length alone."""
+
+    def __init__(self, font: ImageFont.ImageFont):
+        self._font = font
+        self._widths = {
+            glyph: font.getsize(glyph)[0] for glyph in string.printable.strip() + " "
+        }  # type: Dict[str, int]
+        widths = set(self._widths.values())
+        self._fixed_width = widths.pop() if len(widths) == 1 else None
+        self.height = font.getsize("Ag")[1]
+
+    def width(self, text: str) -> int:
+        if self._fixed_width is not None and text.isascii():
+            return self._fixed_width * len(text)
+        widths = self._widths
+        total = 0
+        for glyph in text:
+            glyph_width = widths.get(glyph)
+            if glyph_width is None:
+                glyph_width = widths[glyph] = self._font.getsize(glyph)[0]
+            total += glyph_width
+        return total
+
+
 class DrawTable:
-    """This class accepts a Pandas DataFrame and writes out a Pillow image
-    this snippet was taken from here https://stackoverflow.com/a/35722080/2010808
+    """This class accepts a Pandas DataFrame and writes out a Pillow image of
+    it as a table, with the index in the first column and the column names in
+    the first row.
+
+    Every cell is converted to text and measured once, which sets the width of
+    each column, and the canvas is sized to fit the whole table unless a size
+    is given. The grid is drawn with one line per row and per column, so tables
+    of thousands of cells render quickly.
     """
 
-    def __init__(self, _df: pd.DataFrame, x: int = 500, y: int = 200):
+    def __init__(
+        self,
+        _df: pd.DataFrame,
+        x: Optional[int] = None,
+        y: Optional[int] = None,
+        border: int = 20,
+        padding: int = 6,
+    ):
         self.rows, self.cols = _df.shape
-        img_size = (x, y)
-        self.border = 50
+        self.border = border
+        self.padding = padding
         self.bg_col = (255, 255, 255)
         self.div_w = 1
         self.div_col = (128, 128, 128)
         self.head_w = 2
         self.head_col = (0, 0, 0)
+        self.text_col = (0, 0, 128)
+        self.font = _default_font()
+        self.metrics = _GlyphMetrics(self.font)
+
+        columns = self._cell_text(_df)
+        text_widths = [
+            [self.metrics.width(text) for text in column] for column in columns
+        ]
+        self.col_widths = [max(widths) + 2 * padding for widths in text_widths]
+        self.row_height = self.metrics.height + 2 * padding
+
+        img_size = (
+            x or sum(self.col_widths) + 2 * border,
+            y or self.row_height * (self.rows + 1) + 2 * border,
+        )
         self.image = Image.new("RGBA", img_size, self.bg_col)
         self.draw = ImageDraw.Draw(self.image)
         self._draw_grid()
-        self._populate(_df)
+        self._populate(columns, text_widths)
+
+    @staticmethod
+    def _cell_text(_df: pd.DataFrame) -> List[List[str]]:
+        """The text of every cell by column, headers first, starting with the
+        index as the left-most column"""
+        columns = [[""] + [str(label) for label in _df.index]]
+        for position, name in enumerate(_df.columns):
+            values = _df.iloc[:, position].tolist()
+            columns.append([str(name)] + [str(value) for value in values])
+        return columns
+
+    def _column_edges(self) -> List[int]:
+        edges = [self.border]
+        for width in self.col_widths:
+            edges.append(edges[-1] + width)
+        return edges
 
     def _draw_grid(self):
+        col_edges = self._column_edges()
+        left, right = col_edges[0], col_edges[-1]
+        top = self.border
+        bottom = top + self.row_height * (self.rows + 1)
 
-        width, height = self.image.size
-        row_step = (height - self.border * 2) / (self.rows)
-        col_step = (width - self.border * 2) / (self.cols)
-        for row in range(1, self.rows + 1):
+        for row in range(2, self.rows + 2):
+            y_pos = top + self.row_height * row
             self.draw.line(
-                (
-                    self.border - row_step // 2,
-                    self.border + row_step * row,
-                    width - self.border,
-                    self.border + row_step * row,
-                ),
-                fill=self.div_col,
-                width=self.div_w,
+                (left, y_pos, right, y_pos), fill=self.div_col, width=self.div_w
             )
-            for col in range(1, self.cols + 1):
-                self.draw.line(
-                    (
-                        self.border + col_step * col,
-                        self.border - col_step // 2,
-                        self.border + col_step * col,
-                        height - self.border,
-                    ),
-                    fill=self.div_col,
-                    width=self.div_w,
-                )
+        for x_pos in col_edges[2:]:
+            self.draw.line(
+                (x_pos, top, x_pos, bottom), fill=self.div_col, width=self.div_w
+            )
+
+        # The header row and index column are separated by heavier lines
+        header_y = top + self.row_height
         self.draw.line(
-            (
-                self.border - row_step // 2,
-                self.border,
-                width - self.border,
-                self.border,
-            ),
-            fill=self.head_col,
-            width=self.head_w,
+            (left, header_y, right, header_y), fill=self.head_col, width=self.head_w
         )
+        index_x = col_edges[1]
         self.draw.line(
-            (
-                self.border,
-                self.border - col_step // 2,
-                self.border,
-                height - self.border,
-            ),
-            fill=self.head_col,
-            width=self.head_w,
+            (index_x, top, index_x, bottom), fill=self.head_col, width=self.head_w
         )
-        self.row_step = row_step
-        self.col_step = col_step
-
-    def _populate(self, _df2: pd.DataFrame):
-        font = ImageFont.load_default().font
-        for row in range(self.rows):
-            self.draw.text(
-                (self.border - self.row_step // 2, self.border + self.row_step * row),
-                str(_df2.index[row]),
-                font=font,
-                fill=(0, 0, 128),
-            )
-            for col in range(self.cols):
-                text = str(_df2.iloc[row, col])
-                text_w, text_h = font.getsize(text)
-                x_pos = self.border + self.col_step * (col + 1) - text_w
-                y_pos = self.border + self.row_step * row
-                self.draw.text((x_pos, y_pos), text, font=font, fill=(0, 0, 128))
-        for col in range(self.cols):
-            text = str(_df2.columns[col])
-            text_w, _ = font.getsize(text)
-            x_pos = self.border + self.col_step * (col + 1) - text_w
-            y_pos = self.border - self.row_step // 2
-            self.draw.text((x_pos, y_pos), text, font=font, fill=(0, 0, 128))
+
+    def _populate(self, columns: List[List[str]], text_widths: List[List[int]]):
+        """Draws every cell, right-aligned within its column"""
+        col_edges = self._column_edges()
+        for col, (column, widths) in enumerate(zip(columns, text_widths)):
+            right = col_edges[col + 1] - self.padding
+            for row, (text, width) in enumerate(zip(column, widths)):
+                if text:
+                    y_pos = self.border + self.row_height * row + self.padding
+                    self.draw.text(
+                        (right - width, y_pos),
+                        text,
+                        font=self.font,
+                        fill=self.text_col,
+                    )
@@ -2,39 +2,65 @@
 This is a boilerplate pipeline 'reporting'
 generated using Kedro 0.17.6
 """
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import numpy as np
 import pandas as pd
-import PIL
-import plotly.express as px
-from plotly import graph_objects as go
 
-from .image_utils import DrawTable
+# Plotly and Pillow are imported by the nodes which use them, so that importing
+# this module to construct the pipeline stays cheap
+if TYPE_CHECKING:
+    import PIL
+    from plotly import graph_objects as go
+
+
+def aggregate_by_location_and_policy(model_input_data: pd.DataFrame) -> pd.DataFrame:
+    """This function computes, in a single group by over the input table, the
+    sums and counts every report is derived from. Coarser aggregates, such as
+    per cancellation policy, are then derived from this small table rather
+    than by scanning the input again.
+
+    Args:
+        model_input_data (pd.DataFrame): The data to report on
+
+    Returns:
+        pd.DataFrame: The sum and count of `price` and `review_scores_rating`
+            per `company_location` and `cancellation_policy`
+    """
+    return model_input_data.groupby(
+        ["company_location", "cancellation_policy"], observed=True
+    ).agg(
+        price=("price", "sum"),
+        price_count=("price", "count"),
+        review_scores_rating=("review_scores_rating", "sum"),
+        review_scores_rating_count=("review_scores_rating", "count"),
+    )
 
 
 def make_cancel_policy_bar_chart(
-    model_input_data: pd.DataFrame, top_counties: int = 20
+    aggregates: pd.DataFrame, top_counties: int = 20
 ) -> pd.DataFrame:
 
-    """This function performs a group by on the input table, limits the
-    results to the top n countries based on price and returns the
-    data needed to visualise a stacked bar chart. The DataFrame is
-    rendered as a Plot using the YAML API exposed in the Kedro Catalog.
+    """This function limits the aggregated results to the top n countries
+    based on price and returns the data needed to visualise a stacked bar
+    chart. The DataFrame is rendered as a Plot using the YAML API exposed in
+    the Kedro Catalog.
 
     Args:
-        model_input_data (pd.DataFrame): The data to plot
+        aggregates (pd.DataFrame): The output of
+            `aggregate_by_location_and_policy`
         top_counties (int, optional): [description]. Defaults to 20.
 
     Returns:
         pd.DataFrame: The aggregated data ready for visualisation
     """
-    country_policy_df = (
-        model_input_data.groupby(["company_location", "cancellation_policy"])["price"]
-        .sum()
-        .reset_index()
-    )
+    country_policy_df = aggregates["price"].reset_index()
 
     high_value_countries = (
-        model_input_data.groupby("company_location")
-        .price.sum()
+        aggregates["price"]
+        .groupby(level="company_location", observed=True)
+        .sum()
         .sort_values()
         .head(top_counties)
         .index
@@ -44,47 +70,137 @@ def make_cancel_policy_bar_chart(
     return country_policy_df[high_value_filter]
 
 
-def make_price_histogram(model_input_data: pd.DataFrame) -> go.Figure:
-    """This function retrieves the two key columns needed to visualise the
-    price-engine histogram. We then prepare the Plotly figure using the
-    Plotly Python API
+def _log_spaced_histogram(
+    prices: pd.Series, groups: pd.Series, bins: int
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Counts the positive prices of each group into the same log-spaced bins.
+    Rows without a group are left out, as they are from a groupby.
+
+    Returns:
+        Tuple[np.ndarray, Dict[str, np.ndarray]]: The ``bins + 1`` bin edges,
+            and the counts per bin of each group in sorted order
+    """
+    keep = (prices.to_numpy() > 0) & groups.notna().to_numpy()
+    values = prices.to_numpy()[keep]
+    labels = groups.to_numpy()[keep]
+    if not len(values):
+        return np.array([1.0, 10.0]), {}
+
+    low, high = np.log10(values.min()), np.log10(values.max())
+    edges = np.logspace(low, high if high > low else low + 1, bins + 1)
+    codes, uniques = pd.factorize(labels, sort=True)
+    # One pass over the data, binning every group at once
+    bin_index = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, bins - 1)
+    counts = np.bincount(
+        codes * bins + bin_index, minlength=len(uniques) * bins
+    ).reshape(len(uniques), bins)
+    return edges, {str(group): counts[i] for i, group in enumerate(uniques)}
+
+
+def make_price_histogram(
+    model_input_data: pd.DataFrame, bins: Optional[int] = 50
+) -> "go.Figure":
+    """This function visualises the price-engine histogram. The prices are
+    counted into log-spaced bins per engine type with NumPy, so the figure
+    holds one bar per bin rather than every price, and its size does not grow
+    with the number of rows.
 
     Args:
         model_input_data (pd.DataFrame): The data to plot
+        bins (int, optional): The number of log-spaced bins. If None, every
+            price is embedded in the figure and binned by Plotly instead.
+            Defaults to 50.
 
     Returns:
         BaseFigure: Plotly object which is serialised as JSON for rendering
     """
+    import plotly.express as px
+    from plotly import graph_objects as go
+
     price_data_df = model_input_data[["price", "engine_type"]]
+    if bins is None:
+        return px.histogram(
+            data_frame=price_data_df, x="price", log_x=True, color="engine_type"
+        )
 
-    plotly_object = px.histogram(
-        data_frame=price_data_df, x="price", log_x=True, color="engine_type"
+    edges, counts = _log_spaced_histogram(
+        price_data_df["price"], price_data_df["engine_type"], bins
+    )
+    colours = px.colors.qualitative.Plotly
+    plotly_object = go.Figure(
+        [
+            go.Bar(
+                name=engine_type,
+                x=edges[:-1],
+                y=engine_counts,
+                width=np.diff(edges),
+                offset=0,
+                marker_color=colours[i % len(colours)],
+            )
+            for i, (engine_type, engine_counts) in enumerate(counts.items())
+        ]
+    )
+    plotly_object.update_layout(
+        barmode="relative",
+        bargap=0,
+        xaxis={"type": "log", "title": "price"},
+        yaxis={"title": "count"},
+        legend={"title": "engine_type"},
     )
     return plotly_object
 
 
-def make_price_analysis_image(model_input_table: pd.DataFrame) -> PIL.Image:
-    """This function accepts a Pandas DataFrame and renders a bitmap
-    plot of the data.
+def make_price_analysis_image(aggregates: pd.DataFrame) -> "PIL.Image":
+    """This function accepts the aggregated data and renders a bitmap
+    table of the mean price and rating per cancellation policy.
 
     This method is intended to show how easy it is to use a custom
     dataset in Kedro. You can read more here:
     https://kedro.readthedocs.io/en/stable/07_extend_kedro/03_custom_datasets.html
 
     Args:
-        model_input_table (pd.DataFrame): The data to plot
+        aggregates (pd.DataFrame): The output of
+            `aggregate_by_location_and_policy`
 
     Returns:
         PIL.Image: An image of a table ready to be saved as .png
     """
+    from .image_utils import DrawTable
 
-    analysis_df = (
-        model_input_table.groupby("cancellation_policy")[
-            ["price", "review_scores_rating"]
-        ]
-        .mean()
-        .reset_index()
-    )
+    policy_totals = aggregates.groupby(level="cancellation_policy", observed=True).sum()
+    analysis_df = pd.DataFrame(
+        {
+            column: policy_totals[column] / policy_totals[f"{column}_count"]
+            for column in ["price", "review_scores_rating"]
+        }
+    ).reset_index()
 
     pil_table = DrawTable(analysis_df)
     return pil_table.image
+
+
+def create_reports(
+    model_input_data: pd.DataFrame,
+    top_counties: int = 20,
+    histogram_bins: Optional[int] = 50,
+) -> Tuple[pd.DataFrame, "go.Figure", "PIL.Image"]:
+    """This function produces every report from one scan of the input table,
+    then renders the reports concurrently, each in its own thread.
+
+    Args:
+        model_input_data (pd.DataFrame): The data to report on
+        top_counties (int, optional): The number of countries in the
+            cancellation policy breakdown. Defaults to 20.
+        histogram_bins (int, optional): The number of bins of the price
+            histogram, see `make_price_histogram`. Defaults to 50.
+
+    Returns:
+        Tuple[pd.DataFrame, go.Figure, PIL.Image]: The cancellation policy
+            breakdown, the price histogram and the price analysis image
+    """
+    aggregates = aggregate_by_location_and_policy(model_input_data)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        bar_chart = pool.submit(make_cancel_policy_bar_chart, aggregates, top_counties)
+        histogram = pool.submit(make_price_histogram, model_input_data, histogram_bins)
+        image = pool.submit(make_price_analysis_image, aggregates)
+        return bar_chart.result(), histogram.result(), image.result()
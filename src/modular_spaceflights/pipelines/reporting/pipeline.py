@@ -5,31 +5,28 @@ generated using Kedro 0.17.6
 
 from kedro.pipeline import Pipeline, node
 
-from modular_spaceflights.pipelines.reporting.nodes import (
-    make_cancel_policy_bar_chart,
-    make_price_analysis_image,
-    make_price_histogram,
-)
+from modular_spaceflights.pipelines.reporting.nodes import create_reports
 
 
 def create_pipeline(**kwargs) -> Pipeline:
-    """This is a simple pipeline which generates a series of plots"""
+    """This is a simple pipeline which generates a series of plots. They are
+    all created by a single node so that the input table is only scanned once.
+    `kedro run --pipeline "Reporting stage"` saves them concurrently too, as
+    it runs asynchronously unless `--no-async` is given."""
     return Pipeline(
         [
             node(
-                func=make_cancel_policy_bar_chart,
-                inputs="prm_shuttle_company_reviews",
-                outputs="cancellation_policy_breakdown",
-            ),
-            node(
-                func=make_price_histogram,
-                inputs="prm_shuttle_company_reviews",
-                outputs="price_histogram",
-            ),
-            node(
-                func=make_price_analysis_image,
-                inputs="prm_shuttle_company_reviews",
-                outputs="cancellation_policy_grid",
+                func=create_reports,
+                inputs={
+                    "model_input_data": "prm_shuttle_company_reviews@reporting",
+                    "histogram_bins": "params:price_histogram.bins",
+                },
+                outputs=[
+                    "cancellation_policy_breakdown",
+                    "price_histogram",
+                    "cancellation_policy_grid",
+                ],
+                name="create_reports",
             ),
         ]
     )
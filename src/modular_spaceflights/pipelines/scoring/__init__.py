@@ -0,0 +1,5 @@
+"""Batch scoring pipeline for the spaceflights tutorial"""
+
+from .pipeline import new_scoring_pipeline, new_scoring_template  # NOQA
+
+__all__ = ["new_scoring_template", "new_scoring_pipeline"]
@@ -0,0 +1,195 @@
+"""
+This is a boilerplate pipeline 'scoring'
+generated using Kedro 0.17.6
+"""
+
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from modular_spaceflights.pipelines.feature_engineering.nodes import create_model_input
+
+if TYPE_CHECKING:
+    from sklearn.base import BaseEstimator
+
+# The regressor of each worker process, sent once when the worker starts
+# rather than with every chunk
+_worker_state = {}  # type: Dict[str, Any]
+
+
+def _init_worker(regressor: "BaseEstimator") -> None:
+    _worker_state["regressor"] = regressor
+
+
+def _slice_chunks(
+    row_groups: Iterator[pd.DataFrame], chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    """Splits each row group into chunks of at most ``chunk_size`` rows"""
+    for row_group in row_groups:
+        for start in range(0, len(row_group), chunk_size):
+            yield row_group.iloc[start : start + chunk_size]
+
+
+def _training_columns(
+    X: pd.DataFrame,
+    regressor: "BaseEstimator",
+    feature_names: Optional[List[str]],
+) -> pd.DataFrame:
+    """Orders the columns of ``X`` as those the regressor was trained with.
+
+    Raises:
+        ValueError: If the columns differ from the training columns, or from
+            their number for a regressor stored without their names
+    """
+    if feature_names is None:
+        n_features = getattr(regressor, "n_features_in_", X.shape[1])
+        if n_features != X.shape[1]:
+            raise ValueError(
+                f"The regressor was trained on {n_features} columns, but "
+                f"{X.shape[1]} were created for scoring"
+            )
+        return X
+
+    missing = [x for x in feature_names if x not in X.columns]
+    unexpected = [x for x in X.columns if x not in feature_names]
+    if missing or unexpected:
+        raise ValueError(
+            f"The columns created for scoring differ from those the regressor "
+            f"was trained with, missing {missing} and unexpected {unexpected}"
+        )
+    return X[feature_names]
+
+
+def _score_chunk(
+    chunk: pd.DataFrame,
+    feature_params: Dict[str, List],
+    target: str,
+    feature_names: Optional[List[str]],
+    regressor: Optional["BaseEstimator"] = None,
+) -> Tuple[pd.DataFrame, float]:
+    """Creates the features of a chunk and predicts the target for each row.
+
+    Returns:
+        The identifier columns and the predictions of the chunk, and the
+        seconds spent scoring it.
+    """
+    start = time.perf_counter()
+    regressor = _worker_state["regressor"] if regressor is None else regressor
+    features = create_model_input(chunk, feature_params)
+    X = _training_columns(
+        features.drop(columns=[target], errors="ignore"), regressor, feature_names
+    )
+
+    id_columns = [x for x in features.columns if x.endswith("_id")]
+    predictions = features[id_columns].assign(
+        **{f"predicted_{target}": regressor.predict(X)}
+    )
+    return predictions, time.perf_counter() - start
+
+
+def _predict_chunks(
+    chunks: Iterator[pd.DataFrame],
+    regressor: "BaseEstimator",
+    feature_names: Optional[List[str]],
+    feature_params: Dict[str, List],
+    target: str,
+    n_jobs: int,
+) -> Iterator[Tuple[pd.DataFrame, float]]:
+    """Scores chunks in a pool of ``n_jobs`` processes, with at most two chunks
+    per process in flight, yielding the results in the order of the chunks"""
+    if n_jobs == 1:
+        for chunk in chunks:
+            yield _score_chunk(chunk, feature_params, target, feature_names, regressor)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=n_jobs, initializer=_init_worker, initargs=(regressor,)
+    ) as pool:
+        pending = deque()  # type: Deque[Future]
+        for chunk in chunks:
+            pending.append(
+                pool.submit(_score_chunk, chunk, feature_params, target, feature_names)
+            )
+            if len(pending) >= 2 * n_jobs:
+                yield pending.popleft().result()
+        for future in pending:
+            yield future.result()
+
+
+def score_chunks(
+    row_groups: Iterator[pd.DataFrame],
+    regressor: "BaseEstimator",
+    model_metadata: Dict[str, Any],
+    feature_params: Dict[str, List],
+    split_options: Dict[str, Any],
+    scoring_options: Dict[str, Any],
+) -> Iterator[pd.DataFrame]:
+    """Predicts the target of every row of a table which is streamed one row
+    group at a time, so that it is never held in memory in full.
+
+    Each row group is split into chunks of at most `chunk_size` rows, which
+    go through the same transforms as the feature pipeline and are then
+    predicted, in parallel across `n_jobs` processes. Chunks are yielded in
+    the order they were read, as soon as they are scored, so the predictions
+    are saved while the rest of the table is being scored. The throughput of
+    each chunk, and of the whole table, is logged.
+
+    Args:
+        row_groups: The primary layer table to score, by row group.
+        regressor: The trained model.
+        model_metadata: What the model cache stored with the regressor, the
+            `feature_names` it was trained with. A regressor stored without
+            them is only checked for the number of columns.
+        feature_params: The `static` and `derived` features the model was
+            trained with.
+        split_options: The `target` the model was trained to predict.
+        scoring_options: The `chunk_size` in rows and `n_jobs`, the number of
+            processes, or -1 for one per core. With a single process every
+            chunk is scored without starting a pool.
+
+    Raises:
+        ValueError: If the feature columns differ from those the regressor
+            was trained with.
+
+    Returns:
+        The identifier columns and `predicted_{target}` of each chunk.
+    """
+    from joblib import effective_n_jobs
+
+    chunk_size = scoring_options.get("chunk_size", 10_000)
+    n_jobs = effective_n_jobs(scoring_options.get("n_jobs", -1))
+
+    logger = logging.getLogger(__name__)
+    logger.info(
+        f"Scoring chunks of {chunk_size} rows across {n_jobs} processes using a "
+        f"regressor of type '{type(regressor)}'"
+    )
+
+    start, total_rows = time.perf_counter(), 0
+    for index, (predictions, seconds) in enumerate(
+        _predict_chunks(
+            _slice_chunks(row_groups, chunk_size),
+            regressor,
+            model_metadata.get("feature_names"),
+            feature_params,
+            split_options["target"],
+            n_jobs,
+        )
+    ):
+        rows = len(predictions)
+        logger.info(
+            f"Scored chunk {index} of {rows} rows in {seconds:.3f}s "
+            f"({rows / max(seconds, 1e-9):,.0f} rows/sec)"
+        )
+        total_rows += rows
+        yield predictions
+
+    seconds = time.perf_counter() - start
+    logger.info(
+        f"Scored {total_rows} rows in {seconds:.3f}s "
+        f"({total_rows / max(seconds, 1e-9):,.0f} rows/sec)"
+    )
@@ -0,0 +1,71 @@
+"""
+This is a boilerplate pipeline 'scoring'
+generated using Kedro 0.17.6
+"""
+
+from typing import List
+
+from kedro.pipeline import Pipeline, node
+from kedro.pipeline.modular_pipeline import pipeline
+
+from .nodes import score_chunks
+
+
+def new_scoring_template() -> Pipeline:
+    """This single node pipeline will stream the primary layer table
+    through the feature transforms and a trained regressor, saving
+    the predictions one chunk at a time.
+
+    Returns:
+        Pipeline: This pipeline has been designed to be instantiated
+        once per model type via modular pipeline instances, the same
+        as the modelling templates.
+    """
+    return Pipeline(
+        [
+            node(
+                func=score_chunks,
+                inputs=[
+                    "prm_shuttle_company_reviews@row_groups",
+                    "regressor",
+                    "model_metadata",
+                    "params:feature",
+                    "params:split_options",
+                    "params:scoring_options",
+                ],
+                outputs="predictions",
+            ),
+        ]
+    )
+
+
+def new_scoring_pipeline(model_types: List[str]) -> Pipeline:
+    """This function will create a batch scoring pipeline with one
+    instance of the scoring template per model type, namespaced
+    under `scoring`. Each instance loads the regressor which the last
+    training run fitted or reused from `06_models`, with the metadata
+    stored next to it, unless another
+    version is selected with `kedro run --load-version`.
+
+    Args:
+        model_types (List[str]): The instances of Sklearn models
+            to score with, each of these must have been trained by
+            the modelling pipeline
+
+    Returns:
+        Pipeline: A single pipeline encapsulating one scoring
+            sub-pipeline for each `model_type` passed in.
+    """
+    scoring_pipelines = [
+        pipeline(
+            pipe=new_scoring_template(),
+            inputs=["prm_shuttle_company_reviews"],
+            namespace=f"{model_type}",
+        )
+        for model_type in model_types
+    ]
+    return pipeline(
+        pipe=sum(scoring_pipelines),
+        namespace="scoring",
+        inputs=["prm_shuttle_company_reviews"],
+    )
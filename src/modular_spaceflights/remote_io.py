@@ -0,0 +1,426 @@
+"""Pooled, concurrent and retrying access to remote storage.
+
+Every dataset whose files live on a remote file system, such as the
+``s3://`` ``base_location`` of the ``prod`` environment, shares one
+``fsspec`` client per protocol and set of options via ``get_filesystem``. The
+project's own datasets request it when they are constructed, and
+``RemoteIOHooks`` in ``hooks.py`` swaps it into every other dataset of the
+catalog. S3 clients default to adaptive retries and a connection pool large
+enough for the concurrent transfers below.
+
+``read_bytes`` and ``write_bytes`` move whole objects as concurrent ranged
+reads and multipart uploads, and ``with_retries`` retries transient errors
+with exponential backoff. The ``PrefetchRunner`` loads the inputs of each
+stage of the pipeline concurrently, and those of the next stage while the
+current one runs:
+::
+
+    kedro run --env=prod --runner=modular_spaceflights.remote_io.PrefetchRunner
+
+To run against a local S3 stand-in such as ``moto_server``, point the client
+at it through the ``fsspec`` configuration, for example with a
+``$FSSPEC_CONFIG_DIR/s3.json`` holding
+``{"s3": {"client_kwargs": {"endpoint_url": "http://localhost:5555"}}}``.
+"""
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from copy import deepcopy
+from functools import wraps
+from itertools import chain
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Union
+
+import fsspec
+from fsspec.implementations.local import LocalFileSystem
+from kedro.io import DataCatalog, MemoryDataSet
+from kedro.io.core import AbstractDataSet
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+from kedro.pipeline.pipeline import _strip_transcoding
+from kedro.runner import SequentialRunner, run_node
+
+PART_SIZE = 16 * 2 ** 20
+MAX_WORKERS = 8
+
+DEFAULT_FS_ARGS = {
+    "s3": {
+        "config_kwargs": {
+            "retries": {"max_attempts": 10, "mode": "adaptive"},
+            "max_pool_connections": 4 * MAX_WORKERS,
+        }
+    },
+}  # type: Dict[str, Dict[str, Any]]
+
+# Errors which retrying cannot fix, all other ``OSError`` are assumed transient
+_PERMANENT_ERRORS = (
+    FileNotFoundError,
+    FileExistsError,
+    IsADirectoryError,
+    NotADirectoryError,
+    PermissionError,
+)
+
+_POOL = {}  # type: Dict[str, fsspec.AbstractFileSystem]
+_POOL_LOCK = threading.Lock()
+
+
+def _merge(defaults: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    merged = deepcopy(defaults)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = deepcopy(value)
+    return merged
+
+
+def get_filesystem(
+    protocol: str,
+    credentials: Optional[Dict[str, Any]] = None,
+    fs_args: Optional[Dict[str, Any]] = None,
+) -> fsspec.AbstractFileSystem:
+    """Returns the file system shared by every caller in this process with the
+    same protocol and options. Clients are not shared with forked processes,
+    such as those of the ``ParallelRunner``, as their connections are not.
+
+    Args:
+        protocol: The protocol of the file system, e.g. ``file`` or ``s3``.
+        credentials: Credentials required to get access to the file system.
+        fs_args: Extra arguments for the file system class constructor, which
+            take precedence over ``DEFAULT_FS_ARGS``.
+
+    Returns:
+        The pooled file system.
+    """
+    options = _merge(DEFAULT_FS_ARGS.get(protocol, {}), credentials or {})
+    options = _merge(options, fs_args or {})
+    key = json.dumps([os.getpid(), protocol, options], sort_keys=True, default=str)
+    with _POOL_LOCK:
+        if key not in _POOL:
+            _POOL[key] = fsspec.filesystem(protocol, **options)
+        return _POOL[key]
+
+
+def _datasets(catalog: DataCatalog) -> Iterator[AbstractDataSet]:
+    for dataset in catalog._data_sets.values():
+        # Look through wrappers such as ``CachedDataSet`` as well
+        while dataset is not None:
+            yield dataset
+            dataset = getattr(dataset, "_dataset", None)
+
+
+def share_filesystems(catalog: DataCatalog) -> int:
+    """Replaces the file system of every remote dataset in the catalog with
+    the pooled one for its protocol and options.
+
+    Returns:
+        The number of datasets whose file system was replaced.
+    """
+    shared = 0
+    for dataset in _datasets(catalog):
+        fs = getattr(dataset, "_fs", None)
+        protocol = getattr(dataset, "_protocol", None)
+        if not isinstance(fs, fsspec.AbstractFileSystem) or protocol in (
+            None,
+            "file",
+        ):
+            continue
+        # Kedro's file system arguments end up in ``storage_options``
+        dataset._fs = get_filesystem(protocol, fs_args=fs.storage_options)
+        shared += 1
+    return shared
+
+
+def _is_transient(error: BaseException) -> bool:
+    """Whether ``error``, or an error it was raised from such as the cause of a
+    ``DataSetError``, is an ``OSError`` which retrying may fix"""
+    while error is not None:
+        if isinstance(error, _PERMANENT_ERRORS):
+            return False
+        if isinstance(error, OSError):
+            return True
+        error = error.__cause__
+    return False
+
+
+def with_retries(func: Callable, attempts: int = 5, backoff: float = 0.5) -> Callable:
+    """Wraps ``func`` so that transient errors, any ``OSError`` other than a
+    missing file or a denied permission, are retried with exponential backoff
+    and full jitter. Errors raised from a transient error are retried too, so
+    that wrapping ``DataCatalog.load`` retries the ``DataSetError`` which Kedro
+    raises from the failure of the underlying read.
+
+    Args:
+        func: The function to wrap.
+        attempts: The maximum number of calls, including the first.
+        backoff: The maximum delay in seconds before the first retry, which
+            doubles for every retry after it.
+
+    Returns:
+        The wrapped function.
+    """
+
+    @wraps(func)
+    def _retrying(*args, **kwargs):
+        for attempt in range(1, attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except Exception as error:
+                if attempt == attempts or not _is_transient(error):
+                    raise
+                delay = random.uniform(0, backoff * 2 ** (attempt - 1))
+                logging.getLogger(__name__).warning(
+                    "Attempt %d of %d of '%s' failed with %r, retrying in %.2fs",
+                    attempt,
+                    attempts,
+                    getattr(func, "__name__", func),
+                    error,
+                    delay,
+                )
+                time.sleep(delay)
+        return None
+
+    return _retrying
+
+
+def _is_local(fs: fsspec.AbstractFileSystem) -> bool:
+    return isinstance(fs, LocalFileSystem)
+
+
+def read_bytes(
+    fs: fsspec.AbstractFileSystem,
+    path: str,
+    part_size: int = PART_SIZE,
+    max_workers: int = MAX_WORKERS,
+) -> Union[bytes, bytearray]:
+    """Reads a whole file. Remote files larger than ``part_size`` are read as
+    concurrent ranged requests, each retried on its own.
+
+    Args:
+        fs: The file system to read from.
+        path: The path of the file, without the protocol.
+        part_size: The size of each ranged request in bytes.
+        max_workers: The maximum number of concurrent requests.
+
+    Returns:
+        The content of the file.
+    """
+    cat_file = with_retries(fs.cat_file)
+    size = fs.size(path) if not _is_local(fs) else 0
+    if size <= part_size:
+        return cat_file(path)
+
+    content = bytearray(size)
+
+    def _read_part(start: int) -> None:
+        block = cat_file(path, start=start, end=min(start + part_size, size))
+        content[start : start + len(block)] = block
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(_read_part, range(0, size, part_size)))
+    return content
+
+
+def write_bytes(
+    fs: fsspec.AbstractFileSystem,
+    path: str,
+    data: Union[bytes, bytearray, memoryview],
+    part_size: int = PART_SIZE,
+    max_workers: int = MAX_WORKERS,
+) -> None:
+    """Writes a whole file. Content larger than ``part_size`` is uploaded to S3
+    as a multipart upload whose parts are sent concurrently, each retried on
+    its own, and aborted if any part fails for good.
+
+    Args:
+        fs: The file system to write to.
+        path: The path of the file, without the protocol.
+        data: The content of the file.
+        part_size: The size of each part in bytes, at least 5 MB for S3.
+        max_workers: The maximum number of concurrent uploads.
+    """
+    view = memoryview(data).cast("B")
+    if len(view) <= part_size or "s3" not in fs.protocol:
+        with_retries(fs.pipe_file)(path, bytes(view))
+        return
+
+    call_s3 = with_retries(fs.call_s3)
+    bucket, key, _ = fs.split_path(path)
+    # S3 accepts at most 10,000 parts per upload
+    part_size = max(part_size, -(-len(view) // 10_000))
+    upload_id = call_s3("create_multipart_upload", Bucket=bucket, Key=key)["UploadId"]
+
+    def _upload_part(number: int) -> Dict[str, Any]:
+        start = (number - 1) * part_size
+        response = call_s3(
+            "upload_part",
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=number,
+            Body=bytes(view[start : start + part_size]),
+        )
+        return {"PartNumber": number, "ETag": response["ETag"]}
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            parts = list(
+                pool.map(_upload_part, range(1, -(-len(view) // part_size) + 1))
+            )
+        call_s3(
+            "complete_multipart_upload",
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except BaseException:
+        fs.call_s3("abort_multipart_upload", Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
+    finally:
+        fs.invalidate_cache(path)
+
+
+class PrefetchRunner(SequentialRunner):
+    """``PrefetchRunner`` runs a pipeline sequentially, one stage of
+    independent nodes at a time, but loads the persisted inputs of each stage
+    concurrently before it runs, and loads the inputs of the next stage which
+    are already available while it runs. Loading from remote storage then
+    overlaps with other loads and with computation, rather than every node
+    waiting on its own reads.
+
+    Each prefetched input is loaded once per run and held until the last node
+    using it has run. If prefetching an input fails, the node loads it itself.
+    """
+
+    def __init__(self, is_async: bool = False, max_workers: int = MAX_WORKERS):
+        """Instantiates the runner class.
+
+        Args:
+            is_async: If True, the node outputs are saved asynchronously with
+                threads. Defaults to False.
+            max_workers: The maximum number of inputs loaded concurrently.
+        """
+        super().__init__(is_async=is_async)
+        self._max_workers = max_workers
+
+    @staticmethod
+    def _is_prefetchable(catalog: DataCatalog, data_set_name: str) -> bool:
+        if data_set_name == "parameters" or data_set_name.startswith("params:"):
+            return False
+        dataset = catalog._data_sets.get(data_set_name)
+        return dataset is not None and not isinstance(dataset, MemoryDataSet)
+
+    def _prefetch(
+        self,
+        stage: List[Node],
+        catalog: DataCatalog,
+        pool: ThreadPoolExecutor,
+        prefetched: Dict[str, Future],
+        pending: Set[str],
+    ) -> None:
+        """Starts loading the inputs of ``stage`` which are not produced by
+        any of the nodes in ``pending``, nor already loading"""
+        for data_set_name in sorted(chain.from_iterable(n.inputs for n in stage)):
+            if (
+                data_set_name not in prefetched
+                and _strip_transcoding(data_set_name) not in pending
+                and self._is_prefetchable(catalog, data_set_name)
+            ):
+                prefetched[data_set_name] = pool.submit(
+                    with_retries(catalog.load), data_set_name
+                )
+
+    def _stage_catalog(
+        self, stage: List[Node], catalog: DataCatalog, prefetched: Dict[str, Future]
+    ) -> DataCatalog:
+        """A copy of the catalog serving the prefetched inputs from memory"""
+        stage_catalog = catalog.shallow_copy()
+        for data_set_name in {i for node in stage for i in node.inputs}:
+            if data_set_name not in prefetched:
+                continue
+            try:
+                data = prefetched[data_set_name].result()
+            except Exception as error:
+                self._logger.warning(
+                    "Prefetching '%s' failed with %r, loading it on demand",
+                    data_set_name,
+                    error,
+                )
+                continue
+            # Streams can only be consumed once, so they are not copied
+            copy_mode = "assign" if isinstance(data, Iterator) else None
+            stage_catalog._data_sets[data_set_name] = MemoryDataSet(
+                data, copy_mode=copy_mode
+            )
+        return stage_catalog
+
+    def _run(
+        self, pipeline: Pipeline, catalog: DataCatalog, run_id: str = None
+    ) -> None:
+        """The method implementing staged pipeline running with prefetching.
+
+        Args:
+            pipeline: The ``Pipeline`` to run.
+            catalog: The ``DataCatalog`` from which to fetch data.
+            run_id: The id of the run.
+
+        Raises:
+            Exception: in case of any downstream node failure.
+        """
+        nodes = pipeline.nodes
+        # Stages of nodes which only depend on nodes of earlier stages
+        stages = [[n for n in nodes if n in group] for group in pipeline.grouped_nodes]
+        done_nodes = set()
+        load_counts = Counter(chain.from_iterable(n.inputs for n in nodes))
+        prefetched = {}  # type: Dict[str, Future]
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            for index, stage in enumerate(stages):
+                self._prefetch(stage, catalog, pool, prefetched, pending=set())
+                stage_catalog = self._stage_catalog(stage, catalog, prefetched)
+                if index + 1 < len(stages):
+                    pending = {_strip_transcoding(o) for n in stage for o in n.outputs}
+                    self._prefetch(
+                        stages[index + 1], catalog, pool, prefetched, pending
+                    )
+
+                for node in stage:
+                    try:
+                        run_node(node, stage_catalog, self._is_async, run_id)
+                        done_nodes.add(node)
+                    except Exception:
+                        self._suggest_resume_scenario(pipeline, done_nodes)
+                        raise
+                    self._release(node, pipeline, catalog, load_counts, prefetched)
+                    self._logger.info(
+                        "Completed %d out of %d tasks", len(done_nodes), len(nodes)
+                    )
+
+    @staticmethod
+    def _release(
+        node: Node,
+        pipeline: Pipeline,
+        catalog: DataCatalog,
+        load_counts: Counter,
+        prefetched: Dict[str, Future],
+    ) -> None:
+        """Decrements load counts and releases any data sets we've finished with,
+        including their prefetched data"""
+        released = []  # type: List[str]
+        for data_set in node.inputs:
+            load_counts[data_set] -= 1
+            if load_counts[data_set] < 1:
+                prefetched.pop(data_set, None)
+                if data_set not in pipeline.inputs():
+                    released.append(data_set)
+        for data_set in node.outputs:
+            if load_counts[data_set] < 1 and data_set not in pipeline.outputs():
+                released.append(data_set)
+        for data_set in released:
+            catalog.release(data_set)
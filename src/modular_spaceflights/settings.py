@@ -1,8 +1,22 @@
 """Project settings."""
-from modular_spaceflights.hooks import ProjectHooks, TimingHooks
+from modular_spaceflights.hooks import (
+    FeatureProjectionHooks,
+    ProfilingHooks,
+    ProjectHooks,
+    ReadThroughCacheHooks,
+    RemoteIOHooks,
+    TimingHooks,
+)
 
 # Instantiate and list your project hooks here
-HOOKS = (ProjectHooks(), TimingHooks())
+HOOKS = (
+    ProjectHooks(),
+    TimingHooks(),
+    ProfilingHooks(),
+    ReadThroughCacheHooks(),
+    RemoteIOHooks(),
+    FeatureProjectionHooks(),
+)
 
 # List the installed plugins for which to disable auto-registry
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from kedro.io import DataSetError
+
+from modular_spaceflights.extras.datasets.chunked_dataset import ChunkedParquetDataSet
+
+
+@pytest.fixture
+def filepath(tmp_path):
+    return (tmp_path / "table.pq").as_posix()
+
+
+class TestChunkedParquetDataSet:
+    def test_save_chunks_as_parts(self, filepath):
+        chunks = [pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3]})]
+        data_set = ChunkedParquetDataSet(filepath=filepath)
+        data_set.save(iter(chunks))
+
+        pd.testing.assert_frame_equal(data_set.load(), pd.DataFrame({"a": [1, 2, 3]}))
+
+    def test_later_chunk_with_nulls_fits_integer_schema(self, filepath):
+        chunks = [pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3.0, np.nan]})]
+        data_set = ChunkedParquetDataSet(filepath=filepath)
+        data_set.save(iter(chunks))
+
+        assert data_set.load()["a"].tolist()[:3] == [1, 2, 3]
+        assert data_set.load()["a"].isna().sum() == 1
+
+    def test_mismatched_chunk_names_columns(self, filepath):
+        chunks = [
+            pd.DataFrame({"a": np.array([1, 2], dtype="int8"), "b": [1, 2]}),
+            pd.DataFrame({"a": [300.5, 1.0], "b": [1, 2]}),
+        ]
+        data_set = ChunkedParquetDataSet(filepath=filepath)
+        pattern = r"Chunk 1 .* 'a' \(int8 in the first chunk, double in this one\)"
+        with pytest.raises(DataSetError, match=pattern):
+            data_set.save(iter(chunks))
+
+    def test_load_by_row_group(self, filepath):
+        data = pd.DataFrame({"a": range(5), "b_id": range(5, 10)})
+        ChunkedParquetDataSet(filepath=filepath, save_args={"row_group_size": 2}).save(
+            iter([data.iloc[:3], data.iloc[3:]])
+        )
+        data_set = ChunkedParquetDataSet(
+            filepath=filepath, by_row_group=True, load_args={"columns": ["*_id"]}
+        )
+
+        row_groups = list(data_set.load())
+
+        assert [len(group) for group in row_groups] == [2, 1, 2]
+        pd.testing.assert_frame_equal(
+            pd.concat(row_groups, ignore_index=True), data[["b_id"]]
+        )
+
+    def test_by_row_group_does_not_filter(self, filepath):
+        with pytest.raises(DataSetError, match="filters"):
+            ChunkedParquetDataSet(
+                filepath=filepath,
+                by_row_group=True,
+                load_args={"filters": [("a", ">", 1)]},
+            )
+
+    def test_series_round_trip(self, filepath):
+        series = pd.Series([1.0, 2.0, 3.0], name="price")
+        data_set = ChunkedParquetDataSet(filepath=filepath)
+        data_set.save(iter([series.iloc[:2], series.iloc[2:]]))
+
+        pd.testing.assert_series_equal(data_set.load(), series)
+        row_groups = ChunkedParquetDataSet(filepath=filepath, by_row_group=True)
+        assert all(isinstance(group, pd.Series) for group in row_groups.load())
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+from kedro.io import DataSetError
+from PIL import Image, JpegImagePlugin
+
+from modular_spaceflights.extras.datasets.image_dataset import ImageDataSet
+
+
+@pytest.fixture
+def pixels():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (60, 100, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def filepath(tmp_path, pixels):
+    filepath = (tmp_path / "image.png").as_posix()
+    ImageDataSet(filepath).save(pixels)
+    return filepath
+
+
+class TestImageDataSet:
+    def test_rgba_by_default(self, filepath, pixels):
+        data = ImageDataSet(filepath).load()
+
+        assert data.shape == (60, 100, 4)
+        np.testing.assert_array_equal(data[..., :3], pixels)
+
+    @pytest.mark.parametrize("mode,shape", [(None, (60, 100, 3)), ("L", (60, 100))])
+    def test_mode(self, filepath, mode, shape):
+        data = ImageDataSet(filepath, load_args={"mode": mode}).load()
+
+        assert data.shape == shape
+
+    def test_lazy_image_is_not_decoded(self, filepath, mocker):
+        decode = mocker.spy(ImageDataSet, "_decode")
+
+        image = ImageDataSet(filepath, load_args={"lazy": True}).load()
+
+        assert isinstance(image, Image.Image)
+        assert (image.size, image.mode) == ((100, 60), "RGB")
+        assert decode.call_count == 0
+
+    def test_thumbnail_keeps_the_aspect_ratio(self, filepath):
+        data = ImageDataSet(filepath, load_args={"thumbnail": [50, 50]}).load()
+
+        assert data.shape == (30, 50, 4)
+
+    def test_jpeg_thumbnail_is_decoded_at_a_reduced_scale(self, tmp_path, monkeypatch):
+        filepath = (tmp_path / "image.jpg").as_posix()
+        ImageDataSet(filepath).save(np.zeros((400, 400, 3), dtype=np.uint8))
+        drafts = []
+        draft = JpegImagePlugin.JpegImageFile.draft
+
+        def _draft(self, *args):
+            drafts.append(draft(self, *args))
+            return drafts[-1]
+
+        monkeypatch.setattr(JpegImagePlugin.JpegImageFile, "draft", _draft)
+
+        data = ImageDataSet(filepath, load_args={"thumbnail": [50, 50]}).load()
+
+        assert data.shape == (50, 50, 4)
+        # The scale the decoder was set to, rather than None for no reduction
+        assert len(drafts) == 1 and drafts[0] is not None
+
+    def test_save_args_are_passed_to_pillow(self, tmp_path):
+        pixels = np.zeros((60, 100, 3), dtype=np.uint8)
+        sizes = {}
+        for level in (0, 9):
+            filepath = tmp_path / f"image_{level}.png"
+            ImageDataSet(filepath.as_posix(), save_args={"compress_level": level}).save(
+                pixels
+            )
+            sizes[level] = filepath.stat().st_size
+
+        assert sizes[0] > sizes[9]
+
+    def test_unsupported_extension_is_rejected(self, tmp_path):
+        with pytest.raises(DataSetError, match="does not support"):
+            ImageDataSet((tmp_path / "image.unknown").as_posix())
+
+
+class TestMemoryMappedImageDataSet:
+    def test_sidecar_is_reused(self, filepath, pixels, mocker):
+        data_set = ImageDataSet(filepath, load_args={"mmap": True})
+        data_set.load()
+        decode = mocker.spy(ImageDataSet, "_decode")
+
+        data = data_set.load()
+
+        assert isinstance(data, np.memmap)
+        assert not data.flags.writeable
+        np.testing.assert_array_equal(data[..., :3], pixels)
+        assert decode.call_count == 0
+
+    def test_sidecar_is_invalidated_by_a_new_image(self, filepath, pixels):
+        data_set = ImageDataSet(filepath, load_args={"mmap": True})
+        old = data_set.load()
+
+        data_set.save(255 - pixels)
+        new = data_set.load()
+
+        np.testing.assert_array_equal(new[..., :3], 255 - pixels)
+        # The map of the replaced sidecar is still backed by its own file
+        np.testing.assert_array_equal(old[..., :3], pixels)
+
+    def test_sidecar_is_invalidated_by_other_load_args(self, filepath):
+        ImageDataSet(filepath, load_args={"mmap": True}).load()
+
+        data = ImageDataSet(filepath, load_args={"mmap": True, "mode": "L"}).load()
+
+        assert data.shape == (60, 100)
+
+    def test_no_temporary_files_are_left(self, filepath, tmp_path):
+        ImageDataSet(filepath, load_args={"mmap": True}).load()
+
+        assert sorted(p.name for p in (tmp_path / ".cache").iterdir()) == [
+            "image.png.json",
+            "image.png.npy",
+        ]
+
+    def test_remote_file_is_rejected(self):
+        with pytest.raises(DataSetError, match="local file system"):
+            ImageDataSet("memory:///image.png", load_args={"mmap": True})
+
+    def test_lazy_is_rejected(self, filepath):
+        with pytest.raises(DataSetError, match="both lazy and memory mapped"):
+            ImageDataSet(filepath, load_args={"mmap": True, "lazy": True})
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from kedro.io.core import Version
+
+from modular_spaceflights.extras.datasets.joblib_dataset import JoblibDataSet
+
+
+@pytest.fixture
+def filepath(tmp_path):
+    return (tmp_path / "model.joblib").as_posix()
+
+
+@pytest.fixture
+def model():
+    return {"coef": np.arange(1_000, dtype="float64"), "name": "linear"}
+
+
+class TestJoblibDataSet:
+    def test_round_trip_is_memory_mapped(self, filepath, model):
+        data_set = JoblibDataSet(filepath=filepath)
+        data_set.save(model)
+
+        loaded = data_set.load()
+
+        assert loaded["name"] == "linear"
+        np.testing.assert_array_equal(loaded["coef"], model["coef"])
+        assert isinstance(loaded["coef"], np.memmap)
+
+    def test_compressed_round_trip(self, filepath, model):
+        data_set = JoblibDataSet(filepath=filepath, save_args={"compress": ["zlib", 3]})
+        data_set.save(model)
+
+        loaded = data_set.load()
+
+        np.testing.assert_array_equal(loaded["coef"], model["coef"])
+        assert not isinstance(loaded["coef"], np.memmap)
+
+    def test_compression_is_read_from_the_file(self, filepath, model):
+        JoblibDataSet(filepath=filepath, save_args={"compress": 3}).save(model)
+
+        loaded = JoblibDataSet(filepath=filepath).load()
+
+        np.testing.assert_array_equal(loaded["coef"], model["coef"])
+
+    def test_uncompressed_file_is_mapped_whatever_the_save_args(self, filepath, model):
+        JoblibDataSet(filepath=filepath).save(model)
+
+        loaded = JoblibDataSet(filepath=filepath, save_args={"compress": 3}).load()
+
+        assert isinstance(loaded["coef"], np.memmap)
+
+    def test_versioned_round_trip(self, filepath, model):
+        data_set = JoblibDataSet(filepath=filepath, version=Version(None, None))
+        data_set.save(model)
+
+        assert data_set.exists()
+        np.testing.assert_array_equal(data_set.load()["coef"], model["coef"])
@@ -0,0 +1,175 @@
+import time
+
+import pandas as pd
+import pytest
+from kedro.io import DataSetError, Version
+
+from modular_spaceflights.extras.datasets.model_cache_dataset import (
+    CurrentModelDataSet,
+    CurrentModelMetadataDataSet,
+    ModelCache,
+    ModelCacheDataSet,
+)
+
+
+@pytest.fixture
+def dataset_config(tmp_path):
+    return {
+        "type": "pickle.PickleDataSet",
+        "filepath": (tmp_path / "model.pkl").as_posix(),
+    }
+
+
+def _put(cache, fingerprint, model, metadata=None):
+    # Versions are timestamps with a resolution of one millisecond
+    time.sleep(0.002)
+    return cache.put(fingerprint, model, metadata)
+
+
+class TestModelCache:
+    def test_miss(self, dataset_config):
+        cache = ModelCache(dataset_config)
+
+        assert cache.get("unknown") is None
+        assert cache.version_of("unknown") is None
+
+    def test_hit(self, dataset_config):
+        cache = ModelCache(dataset_config)
+        version = _put(cache, "abc", {"coef": [1.0, 2.0]})
+
+        assert cache.get("abc") == {"coef": [1.0, 2.0]}
+        assert cache.version_of("abc") == version
+
+    def test_least_recently_used_versions_are_evicted(self, dataset_config):
+        cache = ModelCache(dataset_config, max_versions=2)
+        _put(cache, "first", 1)
+        _put(cache, "second", 2)
+        time.sleep(0.002)
+        assert cache.get("first") == 1  # now used more recently than "second"
+        _put(cache, "third", 3)
+
+        assert cache.get("second") is None
+        assert cache.get("first") == 1
+        assert cache.get("third") == 3
+
+    def test_unused_versions_are_evicted_by_age(self, dataset_config):
+        cache = ModelCache(dataset_config, max_age_days=0)
+        _put(cache, "first", 1)
+        _put(cache, "second", 2)
+
+        assert cache.get("first") is None
+        assert cache.get("second") == 2
+
+    def test_unreadable_index_is_empty(self, dataset_config, tmp_path):
+        cache = ModelCache(dataset_config)
+        _put(cache, "abc", 1)
+        (tmp_path / "model.pkl.cache.json").write_text('{"abc": ')
+
+        assert cache.get("abc") is None
+        _put(cache, "abc", 2)
+        assert cache.get("abc") == 2
+        # The index is replaced rather than written in place
+        assert [p.name for p in tmp_path.glob("*.tmp")] == []
+
+    def test_put_makes_the_version_current(self, dataset_config):
+        cache = ModelCache(dataset_config)
+        assert cache.current_version() is None
+
+        version = _put(cache, "abc", 1)
+
+        assert cache.current_version() == version
+
+    def test_hit_makes_the_version_current(self, dataset_config):
+        cache = ModelCache(dataset_config)
+        first = _put(cache, "first", 1)
+        _put(cache, "second", 2)
+
+        cache.get("first")
+
+        assert cache.current_version() == first
+
+    def test_metadata_is_stored_with_its_version(self, dataset_config):
+        cache = ModelCache(dataset_config, max_versions=1)
+        first = _put(cache, "first", 1, {"feature_names": ["a", "b"]})
+
+        assert cache.metadata(first) == {"feature_names": ["a", "b"]}
+        assert cache.metadata() == {"feature_names": ["a", "b"]}
+
+        second = _put(cache, "second", 2)  # evicts the first version
+
+        assert cache.metadata(second) == {}
+        assert cache.metadata(first) == {}
+
+    def test_no_metadata_without_versions(self, dataset_config):
+        assert ModelCache(dataset_config).metadata() == {}
+
+    def test_fingerprint_depends_on_values_and_names(self):
+        data = pd.DataFrame({"a": [1, 2]})
+
+        assert ModelCache.fingerprint(data, {"k": 1}) == ModelCache.fingerprint(
+            data.copy(), {"k": 1}
+        )
+        assert ModelCache.fingerprint(data) != ModelCache.fingerprint(data + 1)
+        assert ModelCache.fingerprint(data) != ModelCache.fingerprint(
+            data.rename(columns={"a": "b"})
+        )
+
+
+class TestModelCacheDataSet:
+    def test_load_returns_cache(self, dataset_config):
+        data_set = ModelCacheDataSet(dataset_config, retention={"max_versions": 1})
+
+        assert isinstance(data_set.load(), ModelCache)
+
+    def test_versioned_dataset_is_rejected(self, dataset_config):
+        with pytest.raises(DataSetError, match="always versioned"):
+            ModelCacheDataSet({**dataset_config, "versioned": True})
+
+
+class TestCurrentModelDataSet:
+    def test_load_returns_the_current_model(self, dataset_config):
+        cache = ModelCache(dataset_config)
+        _put(cache, "first", 1)
+        _put(cache, "second", 2)
+        cache.get("first")
+
+        assert CurrentModelDataSet(dataset_config).load() == 1
+
+    def test_load_version_overrides_the_current_model(self, dataset_config):
+        cache = ModelCache(dataset_config)
+        _put(cache, "first", 1)
+        second = _put(cache, "second", 2)
+        cache.get("first")
+
+        data_set = CurrentModelDataSet(dataset_config, version=Version(second, None))
+
+        assert data_set.load() == 2
+
+    def test_latest_version_without_a_current_model(self, dataset_config, tmp_path):
+        cache = ModelCache(dataset_config)
+        _put(cache, "first", 1)
+        _put(cache, "second", 2)
+        cache.get("first")
+        (tmp_path / "model.pkl.cache.json").unlink()
+
+        assert CurrentModelDataSet(dataset_config).load() == 2
+
+    def test_save_is_rejected(self, dataset_config):
+        with pytest.raises(DataSetError, match="read only"):
+            CurrentModelDataSet(dataset_config).save(1)
+
+
+class TestCurrentModelMetadataDataSet:
+    def test_load_returns_the_metadata_of_the_current_model(self, dataset_config):
+        cache = ModelCache(dataset_config)
+        _put(cache, "first", 1, {"feature_names": ["a"]})
+        second = _put(cache, "second", 2, {"feature_names": ["b"]})
+        cache.get("first")
+
+        assert CurrentModelMetadataDataSet(dataset_config).load() == {
+            "feature_names": ["a"]
+        }
+        data_set = CurrentModelMetadataDataSet(
+            dataset_config, version=Version(second, None)
+        )
+        assert data_set.load() == {"feature_names": ["b"]}
@@ -0,0 +1,101 @@
+import pandas as pd
+import pytest
+from kedro.extras.datasets.pickle import PickleDataSet
+
+from modular_spaceflights.extras.datasets.read_through_cache_dataset import (
+    RUN_CACHE,
+    LRUStore,
+    ReadThroughCacheDataSet,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_run_cache():
+    RUN_CACHE.clear()
+    yield
+    RUN_CACHE.clear()
+
+
+@pytest.fixture
+def wrapped(tmp_path):
+    wrapped = PickleDataSet(filepath=(tmp_path / "data.pkl").as_posix())
+    wrapped.save(pd.DataFrame({"a": [1, 2, 3]}))
+    return wrapped
+
+
+def _frame(rows):
+    return pd.DataFrame({"a": range(rows)}, dtype="int64")
+
+
+class TestLRUStore:
+    def test_least_recently_used_entry_is_evicted(self):
+        size = int(_frame(100).memory_usage(deep=True).sum())
+        store = LRUStore(max_bytes=2 * size)
+        store.put("first", "data", _frame(100))
+        store.put("second", "data", _frame(100))
+        store.get("first", "data")  # now used more recently than "second"
+
+        store.put("third", "data", _frame(100))
+
+        assert store.get("first", "data")[0]
+        assert not store.get("second", "data")[0]
+        assert store.get("third", "data")[0]
+        assert store.clear()["data"]["evictions"] == 1
+
+    def test_entry_larger_than_the_bound_is_not_stored(self):
+        store = LRUStore(max_bytes=int(_frame(10).memory_usage(deep=True).sum()))
+        store.put("small", "data", _frame(10))
+
+        store.put("large", "data", _frame(100))
+
+        assert not store.get("large", "data")[0]
+        assert store.get("small", "data")[0]
+
+    def test_counters_are_reset_by_clear(self):
+        store = LRUStore(max_bytes=2 ** 20)
+        store.get("key", "data")
+        store.put("key", "data", _frame(10))
+        store.get("key", "data")
+
+        stats = store.clear()
+
+        assert stats["data"]["hits"] == 1
+        assert stats["data"]["misses"] == 1
+        assert stats["data"]["loaded_bytes"] > 0
+        assert store.clear() == {}
+
+
+class TestReadThroughCacheDataSet:
+    def test_repeated_loads_are_served_from_memory(self, wrapped, mocker):
+        load = mocker.spy(wrapped, "load")
+        # A second catalog entry wrapping the same dataset shares the cache
+        first = ReadThroughCacheDataSet(wrapped)
+        second = ReadThroughCacheDataSet(wrapped)
+
+        pd.testing.assert_frame_equal(first.load(), second.load())
+
+        assert load.call_count == 1
+        counts = next(iter(RUN_CACHE.clear().values()))
+        assert (counts["hits"], counts["misses"]) == (1, 1)
+
+    def test_load_returns_an_independent_copy(self, wrapped):
+        data_set = ReadThroughCacheDataSet(wrapped)
+
+        data_set.load()["a"] = 0
+
+        assert data_set.load()["a"].tolist() == [1, 2, 3]
+
+    def test_save_invalidates_the_cached_copy(self, wrapped):
+        data_set = ReadThroughCacheDataSet(wrapped)
+        data_set.load()
+
+        data_set.save(pd.DataFrame({"a": [4]}))
+
+        assert data_set.load()["a"].tolist() == [4]
+        assert wrapped.load()["a"].tolist() == [4]
+
+    def test_versioned_flag_in_wrapped_dataset_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="versioned in the wrapper"):
+            ReadThroughCacheDataSet(
+                {"type": "pickle.PickleDataSet", "filepath": "a.pkl", "versioned": True}
+            )
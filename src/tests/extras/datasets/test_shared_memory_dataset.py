@@ -0,0 +1,82 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from kedro.io import DataSetError
+
+from modular_spaceflights.extras.datasets.shared_memory_dataset import (
+    SharedMemoryDataSet,
+)
+
+pytestmark = pytest.mark.skipif(
+    not Path("/dev/shm").is_dir(), reason="POSIX shared memory is not mounted"
+)
+
+
+@pytest.fixture
+def data_set():
+    data_set = SharedMemoryDataSet()
+    yield data_set
+    data_set.release()
+
+
+def _block_exists(data_set):
+    return (Path("/dev/shm") / data_set._describe()["name"]).exists()
+
+
+class TestSharedMemoryDataSet:
+    def test_data_frame_round_trip(self, data_set):
+        data = pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": [1, 2, 3]})
+
+        data_set.save(data)
+
+        pd.testing.assert_frame_equal(data_set.load(), data)
+
+    @pytest.mark.parametrize("name", ["price", None])
+    def test_series_round_trip(self, data_set, name):
+        data = pd.Series([1.5, 2.5], name=name)
+
+        data_set.save(data)
+
+        pd.testing.assert_series_equal(data_set.load(), data)
+
+    def test_release_unlinks_the_block(self, data_set):
+        data_set.save(pd.DataFrame({"a": [1.0]}))
+        assert data_set.exists()
+        assert _block_exists(data_set)
+
+        data_set.release()
+
+        assert not _block_exists(data_set)
+        assert not data_set.exists()
+
+    def test_attaching_process_leaves_the_block_alone(self, data_set):
+        data_set.save(pd.DataFrame({"a": [1.0, 2.0]}))
+        name = data_set._describe()["name"]
+        script = (
+            "from modular_spaceflights.extras.datasets.shared_memory_dataset "
+            "import SharedMemoryDataSet\n"
+            f"print(SharedMemoryDataSet({name!r}).load()['a'].sum())\n"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "3.0"
+        # The resource tracker of the child would otherwise report the block
+        # as leaked, and remove it, when the child exits
+        assert "resource_tracker" not in result.stderr
+        assert _block_exists(data_set)
+
+    def test_non_numeric_columns_are_rejected(self, data_set):
+        data = pd.DataFrame({"a": [1.0], "b": ["text"]})
+
+        with pytest.raises(DataSetError, match=r"non-numeric columns \['b'\]"):
+            data_set.save(data)
+
+    def test_load_before_save(self, data_set):
+        with pytest.raises(DataSetError, match="does not exist"):
+            data_set.load()
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modular_spaceflights.pipelines.data_ingestion.nodes import (
+    combine_shuttle_level_information,
+    combine_shuttle_level_information_partitioned,
+    optimise_dtypes,
+    plan_dtypes,
+)
+
+
+@pytest.fixture
+def shuttles():
+    rng = np.random.default_rng(0)
+    n_rows = 40
+    price = rng.normal(1000, 100, n_rows)
+    price[::9] = np.nan  # dropped by the join
+    return pd.DataFrame(
+        {
+            "id": np.arange(n_rows),
+            # Companies 10 to 12 have no row in `companies`
+            "company_id": rng.integers(0, 13, n_rows),
+            "price": price,
+        }
+    )
+
+
+@pytest.fixture
+def companies():
+    # Companies 13 to 15 have no shuttles
+    company_id = np.r_[0:10, 13:16]
+    return pd.DataFrame(
+        {"company_id": company_id, "company_rating": np.linspace(0.5, 1, 13)}
+    )
+
+
+@pytest.fixture
+def reviews():
+    rng = np.random.default_rng(1)
+    n_rows = 60
+    # Shuttles 40 to 44 do not exist, and some shuttles have no reviews
+    return pd.DataFrame(
+        {
+            "shuttle_id": rng.integers(0, 45, n_rows),
+            "review_scores_rating": rng.integers(50, 100, n_rows),
+        }
+    )
+
+
+def _sorted(data):
+    return data.sort_values(list(data.columns)).reset_index(drop=True)
+
+
+class TestCombineShuttleLevelInformationPartitioned:
+    @pytest.mark.parametrize("partitions", [1, 3, 7])
+    def test_same_rows_as_a_single_join(self, shuttles, companies, reviews, partitions):
+        expected_table, expected_ids = combine_shuttle_level_information(
+            shuttles, companies, reviews
+        )
+
+        table_partitions, id_partitions = combine_shuttle_level_information_partitioned(
+            shuttles,
+            companies,
+            reviews,
+            {"partitions": partitions, "max_workers": 2},
+        )
+        table = pd.concat(list(table_partitions))
+        ids = pd.concat(list(id_partitions))
+
+        assert 0 < len(expected_table) < len(reviews)
+        pd.testing.assert_frame_equal(_sorted(table), _sorted(expected_table))
+        pd.testing.assert_frame_equal(_sorted(ids), _sorted(expected_ids))
+
+
+class TestPlanDtypes:
+    @pytest.mark.parametrize(
+        "values,dtype",
+        [
+            ([0, 127], "int8"),
+            ([-129, 0], "int16"),
+            ([-40_000, 40_000], "int32"),
+            ([0, 2 ** 40], "int64"),
+        ],
+    )
+    def test_integers_are_downcast_within_range(self, values, dtype):
+        data = pd.DataFrame({"a": np.array(values, dtype="int64")})
+
+        plan = plan_dtypes(data)
+
+        assert plan == {"a": dtype}
+        assert data["a"].astype(plan["a"]).tolist() == values
+
+    def test_floats_are_downcast_only_without_loss(self):
+        data = pd.DataFrame({"exact": [0.5, 1.25], "inexact": [0.1, 0.2]})
+
+        assert plan_dtypes(data) == {"exact": "float32", "inexact": "float64"}
+
+    @pytest.mark.parametrize(
+        "max_category_ratio,dtype", [(0.5, "category"), (0.4, "object")]
+    )
+    def test_category_threshold(self, max_category_ratio, dtype):
+        # 2 distinct values in 4 rows
+        data = pd.DataFrame({"a": ["x", "y", "x", "y"]})
+
+        assert plan_dtypes(data, max_category_ratio) == {"a": dtype}
+
+    def test_nulls_are_kept(self):
+        data = pd.DataFrame(
+            {
+                "integer": pd.array([1, None, 3], dtype="Int64"),
+                "float": [0.5, np.nan, 1.0],
+                "string": ["x", None, "x"],
+            }
+        )
+
+        compact, plan = optimise_dtypes(data, {})
+
+        assert plan == {"integer": "Int8", "float": "float32", "string": "category"}
+        assert compact.isna().equals(data.isna())
+
+    def test_booleans_are_kept(self):
+        data = pd.DataFrame({"a": [True, False]})
+
+        assert plan_dtypes(data) == {"a": "bool"}
+
+
+class TestOptimiseDtypes:
+    def test_plan_matches_the_frame(self):
+        data = pd.DataFrame(
+            {
+                "id": np.arange(6, dtype="int64"),
+                "rating": np.linspace(0, 1.25, 6),
+                "location": ["a", "b", "a", "b", "a", "b"],
+                "approved": [True, False] * 3,
+            }
+        )
+
+        compact, plan = optimise_dtypes(data, {"max_category_ratio": 0.5})
+
+        assert {name: str(dtype) for name, dtype in compact.dtypes.items()} == plan
+        assert plan["id"] == "int8" and plan["location"] == "category"
+        pd.testing.assert_frame_equal(
+            compact.astype(data.dtypes.to_dict()), data, check_exact=True
+        )
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modular_spaceflights.pipelines.feature_engineering.nodes import joiner
+
+
+@pytest.fixture
+def spine_df():
+    return pd.DataFrame({"shuttle_id": [1, 2, 3], "company_id": [10, 20, 30]})
+
+
+class TestJoiner:
+    def test_aligned_tables_are_concatenated(self, spine_df):
+        features = spine_df.assign(engines=[1, 2, 3])
+
+        merged = joiner(spine_df, features)
+
+        assert merged.columns.tolist() == ["shuttle_id", "company_id", "engines"]
+        assert merged["engines"].tolist() == [1, 2, 3]
+
+    def test_unaligned_table_is_matched_on_keys(self, spine_df):
+        features = pd.DataFrame(
+            {"shuttle_id": [3, 1, 2], "company_id": [30, 10, 20], "engines": [3, 1, 2]}
+        )
+
+        merged = joiner(spine_df, features)
+
+        expected = pd.merge(spine_df, features, how="left")
+        pd.testing.assert_frame_equal(merged, expected)
+
+    def test_keys_missing_from_a_table_are_null(self, spine_df):
+        features = pd.DataFrame(
+            {"shuttle_id": [2, 4], "company_id": [20, 40], "engines": [2.0, 4.0]}
+        )
+
+        merged = joiner(spine_df, features)
+
+        assert merged["engines"].tolist()[1] == 2.0
+        assert merged["engines"].isna().tolist() == [True, False, True]
+
+    def test_spine_rows_with_a_missing_key_match_nothing(self):
+        spine_df = pd.DataFrame({"shuttle_id": [1.0, np.nan]})
+        features = pd.DataFrame({"shuttle_id": [2.0, 1.0], "engines": [2.0, 1.0]})
+
+        merged = joiner(spine_df, features)
+
+        assert merged["engines"].tolist()[0] == 1.0
+        assert np.isnan(merged["engines"].tolist()[1])
+
+    def test_duplicated_keys_raise(self, spine_df):
+        features = pd.DataFrame(
+            {"shuttle_id": [1, 1], "company_id": [10, 10], "engines": [1, 2]}
+        )
+
+        with pytest.raises(ValueError, match="not unique"):
+            joiner(spine_df, features)
+
+    def test_overlapping_columns_raise(self, spine_df):
+        features = spine_df.assign(engines=[1, 2, 3])
+
+        with pytest.raises(ValueError, match="more than one table"):
+            joiner(spine_df, features, features)
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modular_spaceflights.pipelines.modelling.nodes import (
+    _hash_split,
+    search_hyperparameters,
+)
+
+
+@pytest.fixture
+def model_input():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "shuttle_id": np.arange(10_000),
+            "company_id": np.arange(10_000) % 97,
+            "engines": rng.integers(1, 5, 10_000),
+            "price": rng.random(10_000),
+        }
+    )
+
+
+@pytest.fixture
+def model_options():
+    return {
+        "module": "sklearn.ensemble",
+        "class": "RandomForestRegressor",
+        "kwargs": {"n_estimators": 100, "random_state": 0},
+    }
+
+
+@pytest.fixture
+def search_options():
+    return {
+        "grid": {"max_depth": [2, 4], "min_samples_leaf": [1, 8]},
+        "halving": {
+            "resource": "n_estimators",
+            "min_resources": 2,
+            "max_resources": 8,
+            "factor": 2,
+            "cv": 2,
+            "random_state": 0,
+        },
+        "n_jobs": 1,
+    }
+
+
+class TestHashSplit:
+    def test_split_ignores_chunking(self, model_input):
+        _, X_test, _, _ = _hash_split(model_input, "price", 0.2, 42)
+        chunked = [
+            _hash_split(chunk, "price", 0.2, 42)[1]
+            for chunk in np.array_split(model_input, 7)
+        ]
+
+        pd.testing.assert_frame_equal(pd.concat(chunked), X_test)
+
+    def test_test_set_holds_about_test_size(self, model_input):
+        _, X_test, _, y_test = _hash_split(model_input, "price", 0.2, 42)
+
+        assert len(X_test) == len(y_test)
+        assert len(X_test) / len(model_input) == pytest.approx(0.2, abs=0.02)
+
+    def test_random_state_changes_the_split(self, model_input):
+        first = _hash_split(model_input, "price", 0.2, 1)[1]
+        second = _hash_split(model_input, "price", 0.2, 2)[1]
+
+        assert not first.index.equals(second.index)
+
+    def test_every_row_is_in_one_set(self, model_input):
+        X_train, X_test, y_train, y_test = _hash_split(model_input, "price", 0.2, 42)
+
+        assert "price" not in X_train.columns
+        assert (
+            X_train.index.append(X_test.index).sort_values().equals(model_input.index)
+        )
+        assert y_train.index.equals(X_train.index)
+        assert y_test.index.equals(X_test.index)
+
+    def test_ids_are_required(self, model_input):
+        with pytest.raises(ValueError, match="'\\*_id' column"):
+            _hash_split(model_input[["engines", "price"]], "price", 0.2, 42)
+
+
+class TestSearchHyperparameters:
+    @pytest.fixture
+    def splits(self, model_input):
+        X = model_input.drop(columns="price").iloc[:300]
+        y = model_input["price"].iloc[:300]
+        return X.iloc[:200], y.iloc[:200], X.iloc[200:], y.iloc[200:]
+
+    def test_outputs(self, splits, model_options, search_options):
+        regressor, flat_params, search_results, metrics = search_hyperparameters(
+            *splits, model_options, search_options
+        )
+
+        assert type(regressor).__name__ == "RandomForestRegressor"
+        assert set(flat_params) == {
+            "model_type",
+            "n_estimators",
+            "random_state",
+            "max_depth",
+            "min_samples_leaf",
+        }
+        assert flat_params["model_type"] == "RandomForestRegressor"
+        assert flat_params["n_estimators"] == regressor.n_estimators
+        assert set(search_results) == {
+            "best_params",
+            "best_mean_r2_score",
+            "candidates",
+        }
+        # The halving resource is part of the best parameters too
+        assert set(search_results["best_params"]) == {
+            "max_depth",
+            "min_samples_leaf",
+            "n_estimators",
+        }
+        assert set(metrics) == {"r2_score"}
+
+    def test_every_candidate_of_every_round_is_reported(
+        self, splits, model_options, search_options
+    ):
+        _, _, search_results, _ = search_hyperparameters(
+            *splits, model_options, search_options
+        )
+
+        candidates = search_results["candidates"]
+        rounds = [c["iteration"] for c in candidates]
+        # 4 candidates with 2 trees each, the best 2 with 4, the best with 8
+        assert [rounds.count(i) for i in sorted(set(rounds))] == [4, 2, 1]
+        assert {c["n_resources"] for c in candidates if c["iteration"] == 1} == {4}
+        assert all(
+            set(c)
+            == {
+                "iteration",
+                "n_resources",
+                "params",
+                "mean_fit_time",
+                "mean_r2_score",
+                "std_r2_score",
+            }
+            for c in candidates
+        )
+
+    def test_draws_candidates_from_distributions(
+        self, splits, model_options, search_options
+    ):
+        search_options["distributions"] = {
+            "min_samples_leaf": {"name": "randint", "args": [1, 16]}
+        }
+        search_options["grid"] = {"max_depth": [2, 4]}
+        search_options["n_candidates"] = 3
+
+        _, flat_params, search_results, _ = search_hyperparameters(
+            *splits, model_options, search_options
+        )
+
+        first_round = [c for c in search_results["candidates"] if c["iteration"] == 0]
+        assert len(first_round) == 3
+        assert isinstance(flat_params["min_samples_leaf"], int)
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from modular_spaceflights.pipelines.feature_engineering.nodes import create_model_input
+from modular_spaceflights.pipelines.scoring.nodes import score_chunks
+
+FEATURE_PARAMS = {
+    "static": ["engines", "price"],
+    "derived": [
+        {
+            "column_a": "reviews",
+            "column_b": "fleet",
+            "numpy_method": "divide",
+            "conjunction": "over",
+        }
+    ],
+}
+SPLIT_OPTIONS = {"target": "price"}
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    n_rows = 50
+    return pd.DataFrame(
+        {
+            "shuttle_id": np.arange(n_rows),
+            "company_id": np.arange(n_rows) % 7,
+            "engines": rng.integers(1, 4, n_rows).astype(float),
+            "reviews": rng.integers(0, 100, n_rows).astype(float),
+            "fleet": rng.integers(1, 10, n_rows).astype(float),
+            "price": rng.normal(100, 10, n_rows),
+        }
+    )
+
+
+@pytest.fixture
+def X(data):
+    # The identifiers are among the features the models are trained with
+    return create_model_input(data, FEATURE_PARAMS).drop(columns="price")
+
+
+@pytest.fixture
+def regressor(data, X):
+    return LinearRegression().fit(X, data["price"])
+
+
+@pytest.fixture
+def model_metadata(X):
+    # As stored with the regressor by train_model
+    return {"feature_names": X.columns.tolist()}
+
+
+def _score(data, regressor, model_metadata, n_jobs, row_group_size=20):
+    row_groups = (
+        data.iloc[start : start + row_group_size]
+        for start in range(0, len(data), row_group_size)
+    )
+    return list(
+        score_chunks(
+            row_groups,
+            regressor,
+            model_metadata,
+            FEATURE_PARAMS,
+            SPLIT_OPTIONS,
+            {"chunk_size": 8, "n_jobs": n_jobs},
+        )
+    )
+
+
+class TestScoreChunks:
+    @pytest.mark.parametrize("n_jobs", [1, 2])
+    def test_chunks_are_scored_in_order(
+        self, data, X, regressor, model_metadata, n_jobs
+    ):
+        chunks = _score(data, regressor, model_metadata, n_jobs)
+
+        # Row groups of 20 rows, each split into chunks of at most 8
+        assert [len(chunk) for chunk in chunks] == [8, 8, 4, 8, 8, 4, 8, 2]
+        predictions = pd.concat(chunks)
+        assert predictions.columns.tolist() == [
+            "shuttle_id",
+            "company_id",
+            "predicted_price",
+        ]
+        assert predictions["shuttle_id"].tolist() == data["shuttle_id"].tolist()
+        np.testing.assert_allclose(predictions["predicted_price"], regressor.predict(X))
+
+    def test_columns_are_ordered_as_in_training(self, data, X):
+        reordered = X[X.columns[::-1]]
+        regressor = LinearRegression().fit(reordered, data["price"])
+        model_metadata = {"feature_names": reordered.columns.tolist()}
+
+        predictions = pd.concat(_score(data, regressor, model_metadata, n_jobs=1))
+
+        np.testing.assert_allclose(
+            predictions["predicted_price"], regressor.predict(reordered)
+        )
+
+    def test_other_columns_than_in_training_are_rejected(self, data, regressor):
+        model_metadata = {"feature_names": ["engines", "crew"]}
+
+        with pytest.raises(ValueError, match=r"missing \['crew'\]"):
+            _score(data, regressor, model_metadata, n_jobs=1)
+
+    def test_other_number_of_columns_is_rejected(self, data, X):
+        regressor = LinearRegression().fit(X.iloc[:, :2], data["price"])
+
+        # A regressor stored without the names of its columns
+        with pytest.raises(ValueError, match="trained on 2 columns"):
+            _score(data, regressor, {}, n_jobs=1)
@@ -0,0 +1,134 @@
+import os
+from pathlib import Path
+
+import pytest
+from kedro.config import TemplatedConfigLoader
+
+from modular_spaceflights.config_loader import CachedTemplatedConfigLoader
+
+CATALOG_PATTERNS = ("catalog*",)
+
+
+@pytest.fixture(autouse=True)
+def empty_memo(monkeypatch):
+    monkeypatch.setattr(CachedTemplatedConfigLoader, "_memo", {})
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """The patterns of every ``get`` which rendered the configuration"""
+    calls = []
+    get = TemplatedConfigLoader.get
+
+    def _get(self, *patterns):
+        calls.append(patterns)
+        return get(self, *patterns)
+
+    monkeypatch.setattr(TemplatedConfigLoader, "get", _get)
+    return calls
+
+
+@pytest.fixture
+def conf_path(tmp_path):
+    base = tmp_path / "conf" / "base"
+    base.mkdir(parents=True)
+    (base / "globals.yml").write_text("base_location: data\n")
+    (base / "catalog.yml").write_text(
+        "cars:\n  type: pandas.CSVDataSet\n  filepath: ${base_location}/cars.csv\n"
+    )
+    (base / "credentials.yml").write_text("db:\n  password: secret\n")
+    return base
+
+
+def _loader(conf_path, tmp_path, **kwargs):
+    return CachedTemplatedConfigLoader(
+        [str(conf_path)],
+        globals_pattern="*globals.yml",
+        project_path=tmp_path,
+        **kwargs,
+    )
+
+
+def _new_process():
+    """Forgets the configuration cached in memory, as a new process would"""
+    CachedTemplatedConfigLoader._memo.clear()
+
+
+class TestCachedTemplatedConfigLoader:
+    def test_unchanged_files_are_rendered_once(self, conf_path, tmp_path, renders):
+        config = _loader(conf_path, tmp_path).get(*CATALOG_PATTERNS)
+        _new_process()
+
+        assert _loader(conf_path, tmp_path).get(*CATALOG_PATTERNS) == config
+        assert config["cars"]["filepath"] == "data/cars.csv"
+        assert len(renders) == 1
+
+    def test_returned_config_is_a_copy(self, conf_path, tmp_path):
+        loader = _loader(conf_path, tmp_path)
+        # As runtime parameters are merged into the loaded parameters
+        loader.get(*CATALOG_PATTERNS)["cars"]["filepath"] = "other.csv"
+
+        assert loader.get(*CATALOG_PATTERNS)["cars"]["filepath"] == "data/cars.csv"
+
+    def test_modification_time_invalidates(self, conf_path, tmp_path, renders):
+        _loader(conf_path, tmp_path).get(*CATALOG_PATTERNS)
+        stat = (conf_path / "catalog.yml").stat()
+        os.utime(conf_path / "catalog.yml", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        _new_process()
+
+        _loader(conf_path, tmp_path).get(*CATALOG_PATTERNS)
+
+        assert len(renders) == 2
+
+    def test_size_invalidates(self, conf_path, tmp_path, renders):
+        _loader(conf_path, tmp_path).get(*CATALOG_PATTERNS)
+        stat = (conf_path / "catalog.yml").stat()
+        with open(conf_path / "catalog.yml", "a") as f:
+            f.write("# comment\n")
+        # Only the size differs
+        os.utime(conf_path / "catalog.yml", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert _loader(conf_path, tmp_path).get(*CATALOG_PATTERNS)
+        assert len(renders) == 2
+
+    def test_added_file_invalidates(self, conf_path, tmp_path, renders):
+        _loader(conf_path, tmp_path).get(*CATALOG_PATTERNS)
+        (conf_path / "catalog_planes.yml").write_text(
+            "planes:\n  type: pandas.CSVDataSet\n  filepath: planes.csv\n"
+        )
+
+        config = _loader(conf_path, tmp_path).get(*CATALOG_PATTERNS)
+
+        assert set(config) == {"cars", "planes"}
+        assert len(renders) == 2
+
+    def test_globals_dict_invalidates(self, conf_path, tmp_path, renders):
+        _loader(conf_path, tmp_path).get(*CATALOG_PATTERNS)
+
+        config = _loader(
+            conf_path, tmp_path, globals_dict={"base_location": "s3://bucket"}
+        ).get(*CATALOG_PATTERNS)
+
+        assert config["cars"]["filepath"] == "s3://bucket/cars.csv"
+        assert len(renders) == 2
+
+    def test_credentials_are_never_cached(self, conf_path, tmp_path, renders):
+        for _ in range(2):
+            assert _loader(conf_path, tmp_path).get("credentials*") == {
+                "db": {"password": "secret"}
+            }
+
+        assert len(renders) == 2
+        assert not (tmp_path / ".kedro_cache").exists()
+
+    def test_cache_is_written_under_the_project_path(self, tmp_path):
+        # A conf path only one level below the project
+        conf_path = tmp_path / "conf"
+        conf_path.mkdir()
+        (conf_path / "globals.yml").write_text("base_location: data\n")
+        (conf_path / "catalog.yml").write_text("cars:\n  type: MemoryDataSet\n")
+
+        _loader(conf_path, tmp_path).get(*CATALOG_PATTERNS)
+
+        cached = list((tmp_path / ".kedro_cache" / "config").iterdir())
+        assert [Path(path).suffix for path in cached] == [".pkl"]
@@ -0,0 +1,135 @@
+import pytest
+from kedro.extras.datasets.pickle import PickleDataSet
+from kedro.framework.hooks import get_hook_manager, hook_impl
+from kedro.io import DataCatalog
+from kedro.pipeline import Pipeline, node
+
+from modular_spaceflights.incremental import (
+    FingerprintStore,
+    IncrementalRunner,
+    fingerprint_nodes,
+)
+
+PERSISTED = ("raw", "prepared", "rf_model", "lr_model")
+
+
+def prepare(raw):
+    return raw * 2
+
+
+def split(prepared):
+    return prepared + 1
+
+
+def train(data, params):
+    return data * params["scale"]
+
+
+@pytest.fixture
+def pipeline():
+    # `split_data` is kept in memory, and shared by both model branches
+    return Pipeline(
+        [
+            node(prepare, "raw", "prepared", name="prepare"),
+            node(split, "prepared", "split_data", name="split"),
+            node(train, ["split_data", "params:rf"], "rf_model", name="train_rf"),
+            node(train, ["split_data", "params:lr"], "lr_model", name="train_lr"),
+        ]
+    )
+
+
+@pytest.fixture
+def catalog_config(tmp_path):
+    return {
+        name: {"type": "pickle.PickleDataSet", "filepath": str(tmp_path / name)}
+        for name in PERSISTED
+    }
+
+
+@pytest.fixture
+def make_catalog(catalog_config):
+    PickleDataSet(catalog_config["raw"]["filepath"]).save(10)
+
+    def _make_catalog(rf_scale=2, lr_scale=3):
+        catalog = DataCatalog.from_config(catalog_config)
+        catalog.add_feed_dict(
+            {"params:rf": {"scale": rf_scale}, "params:lr": {"scale": lr_scale}}
+        )
+        return catalog
+
+    return _make_catalog
+
+
+class _NodeRecorder:
+    def __init__(self):
+        self.names = set()
+
+    @hook_impl
+    def before_node_run(self, node):
+        self.names.add(node.name)
+
+
+@pytest.fixture
+def run(pipeline, catalog_config):
+    """Runs the pipeline incrementally, returning the names of the nodes run"""
+
+    def _run(catalog):
+        recorder = _NodeRecorder()
+        hook_manager = get_hook_manager()
+        hook_manager.register(recorder)
+        try:
+            IncrementalRunner(catalog_config=catalog_config).run(pipeline, catalog)
+        finally:
+            hook_manager.unregister(recorder)
+        return recorder.names
+
+    return _run
+
+
+class TestFingerprintNodes:
+    def test_fingerprints_are_stable(self, pipeline, make_catalog, catalog_config):
+        store = FingerprintStore(catalog_config)
+
+        assert fingerprint_nodes(pipeline, make_catalog(), store) == (
+            fingerprint_nodes(pipeline, make_catalog(), store)
+        )
+
+    def test_parameters_change_only_their_nodes(
+        self, pipeline, make_catalog, catalog_config
+    ):
+        store = FingerprintStore(catalog_config)
+        before = fingerprint_nodes(pipeline, make_catalog(), store)
+        after = fingerprint_nodes(pipeline, make_catalog(rf_scale=5), store)
+
+        assert {name for name in before if before[name] != after[name]} == {"train_rf"}
+
+
+class TestIncrementalRunner:
+    def test_first_run_runs_every_node(self, run, make_catalog):
+        assert run(make_catalog()) == {"prepare", "split", "train_rf", "train_lr"}
+
+    def test_second_run_skips_every_node(self, run, make_catalog):
+        run(make_catalog())
+
+        assert run(make_catalog()) == set()
+
+    def test_parameter_change_reruns_only_its_branch(
+        self, run, make_catalog, catalog_config
+    ):
+        run(make_catalog())
+
+        assert run(make_catalog(rf_scale=5)) == {"split", "train_rf"}
+        rf_model = PickleDataSet(catalog_config["rf_model"]["filepath"])
+        assert rf_model.load() == (10 * 2 + 1) * 5
+
+    def test_in_memory_input_of_a_stale_node_is_recreated(
+        self, run, make_catalog, catalog_config
+    ):
+        run(make_catalog())
+        # Overwritten outside of an incremental run, so its fingerprint is stale
+        PickleDataSet(catalog_config["lr_model"]["filepath"]).save(0)
+
+        # `split` is unchanged, but only ever held `split_data` in memory
+        assert run(make_catalog()) == {"split", "train_lr"}
+        lr_model = PickleDataSet(catalog_config["lr_model"]["filepath"])
+        assert lr_model.load() == (10 * 2 + 1) * 3
@@ -0,0 +1,174 @@
+import shutil
+import socket
+import subprocess
+import time
+import urllib.request
+
+import pandas as pd
+import pytest
+from kedro.extras.datasets.pandas import CSVDataSet
+from kedro.io import DataCatalog, DataSetError
+from kedro.pipeline import Pipeline, node
+
+from modular_spaceflights.remote_io import (
+    PrefetchRunner,
+    get_filesystem,
+    read_bytes,
+    share_filesystems,
+    with_retries,
+    write_bytes,
+)
+
+BUCKET = "test-bucket"
+# The smallest part S3 accepts, other than the last one of an upload
+PART_SIZE = 5 * 2 ** 20
+
+
+@pytest.fixture(scope="module")
+def endpoint_url():
+    """A ``moto_server`` standing in for S3, on a free port"""
+    pytest.importorskip("s3fs")
+    moto_server = shutil.which("moto_server")
+    if moto_server is None:
+        pytest.skip("moto_server is not installed")
+
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        port = sock.getsockname()[1]
+    url = f"http://localhost:{port}"
+    process = subprocess.Popen(
+        [moto_server, "-p", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(url)
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            pytest.fail("moto_server did not start")
+        yield url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+@pytest.fixture
+def credentials(endpoint_url):
+    return {
+        "key": "testing",
+        "secret": "testing",
+        "client_kwargs": {"endpoint_url": endpoint_url, "region_name": "us-east-1"},
+    }
+
+
+@pytest.fixture
+def s3(credentials):
+    fs = get_filesystem("s3", credentials=credentials)
+    if not fs.exists(BUCKET):
+        fs.call_s3("create_bucket", Bucket=BUCKET)
+        fs.invalidate_cache()
+    return fs
+
+
+class _FailingOpen:
+    """Makes the first ``failures`` calls to ``open`` of a file system fail with
+    ``error``, counting every call"""
+
+    def __init__(self, fs, error, failures=1):
+        self._open = fs.open
+        self._error = error
+        self._failures = failures
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        if self.calls <= self._failures:
+            raise self._error
+        return self._open(*args, **kwargs)
+
+
+class TestGetFilesystem:
+    def test_same_options_share_a_client(self, credentials):
+        assert get_filesystem("s3", credentials=credentials) is get_filesystem(
+            "s3", credentials=dict(credentials)
+        )
+
+    def test_other_options_get_their_own_client(self, credentials):
+        other = dict(credentials, key="other")
+        assert get_filesystem("s3", credentials=credentials) is not get_filesystem(
+            "s3", credentials=other
+        )
+
+    def test_datasets_share_the_pooled_client(self, s3, credentials):
+        catalog = DataCatalog(
+            {
+                name: CSVDataSet(f"s3://{BUCKET}/{name}.csv", credentials=credentials)
+                for name in ("a", "b")
+            }
+        )
+        assert share_filesystems(catalog) == 2
+        assert catalog._data_sets["a"]._fs is s3
+        assert catalog._data_sets["b"]._fs is s3
+
+
+class TestReadWriteBytes:
+    def test_multipart_round_trip(self, s3):
+        path = f"{BUCKET}/multipart.bin"
+        data = bytes(range(256)) * (2 * PART_SIZE // 256 + 1000)
+
+        write_bytes(s3, path, data, part_size=PART_SIZE)
+
+        # The ETag of a multipart upload ends with its number of parts
+        assert s3.info(path)["ETag"].strip('"').endswith("-3")
+        assert read_bytes(s3, path, part_size=PART_SIZE) == data
+
+    def test_small_write_is_a_single_put(self, s3):
+        path = f"{BUCKET}/small.bin"
+
+        write_bytes(s3, path, b"spaceflights", part_size=PART_SIZE)
+
+        assert "-" not in s3.info(path)["ETag"]
+        assert read_bytes(s3, path) == b"spaceflights"
+
+
+class TestRetries:
+    @pytest.fixture
+    def data_set(self, s3, credentials):
+        data_set = CSVDataSet(f"s3://{BUCKET}/retried.csv", credentials=credentials)
+        data_set.save(pd.DataFrame({"a": [1, 2]}))
+        return data_set
+
+    def test_load_is_retried_after_a_transient_error(self, data_set, monkeypatch):
+        failing_open = _FailingOpen(data_set._fs, ConnectionResetError("reset"))
+        monkeypatch.setattr(data_set._fs, "open", failing_open)
+
+        data = with_retries(data_set.load, backoff=0)()
+
+        assert data["a"].tolist() == [1, 2]
+        assert failing_open.calls == 2
+
+    def test_missing_files_are_not_retried(self, data_set, monkeypatch):
+        failing_open = _FailingOpen(data_set._fs, FileNotFoundError("gone"))
+        monkeypatch.setattr(data_set._fs, "open", failing_open)
+
+        with pytest.raises(DataSetError):
+            with_retries(data_set.load, backoff=0)()
+        assert failing_open.calls == 1
+
+    def test_prefetch_retries_rather_than_loading_on_demand(
+        self, data_set, monkeypatch, caplog
+    ):
+        failing_open = _FailingOpen(data_set._fs, ConnectionResetError("reset"))
+        monkeypatch.setattr(data_set._fs, "open", failing_open)
+        catalog = DataCatalog({"retried": data_set})
+        pipeline = Pipeline([node(lambda df: df["a"].sum(), "retried", "total")])
+
+        outputs = PrefetchRunner().run(pipeline, catalog)
+
+        assert outputs["total"] == 3
+        assert failing_open.calls == 2
+        assert "loading it on demand" not in caplog.text